@@ -0,0 +1,145 @@
+# ─────────────────────────────────────────────────────────────
+#  Benchmark: per-row attendance loop vs. batched upsert
+#  ------------------------------------------------------------
+#  Run from the repository root against a scratch database:
+#      python -m benchmarks.bench_attendance_upsert --sizes 50 500 5000
+#  Each size is timed twice per strategy: a fresh day (all
+#  inserts) and a re-save of the same day (all updates).
+# ─────────────────────────────────────────────────────────────
+
+import argparse
+import time
+from datetime import date, timedelta
+
+import mysql.connector
+
+from portal.attendance_store import upsert_attendance, DEFAULT_CHUNK_SIZE
+
+PER_ROW_SQL = """
+    INSERT INTO attendance (student_id, date, status, marked_by)
+    VALUES (%s,%s,%s,%s)
+    ON DUPLICATE KEY UPDATE status=VALUES(status), marked_by=VALUES(marked_by)
+"""
+
+
+def setup(conn, n_students: int):
+    cur = conn.cursor()
+    for table in ("attendance_monthly", "attendance_daily", "attendance", "users"):
+        cur.execute(f"DROP TABLE IF EXISTS {table}")
+    cur.execute(
+        """
+        CREATE TABLE users (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            role ENUM('admin','teacher','student') NOT NULL
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE attendance (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            student_id INT NOT NULL,
+            date DATE NOT NULL,
+            status ENUM('present','absent') NOT NULL,
+            marked_by INT,
+            UNIQUE KEY uniq_student_date (student_id, date)
+        )
+        """
+    )
+    # rollups that upsert_attendance() keeps in step (as in migrations.py)
+    cur.execute(
+        """
+        CREATE TABLE attendance_monthly (
+            student_id INT NOT NULL,
+            month DATE NOT NULL,
+            present INT NOT NULL DEFAULT 0,
+            absent INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (student_id, month),
+            FOREIGN KEY (student_id) REFERENCES users(id) ON DELETE CASCADE
+        )
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE attendance_daily (
+            date DATE PRIMARY KEY,
+            present INT NOT NULL DEFAULT 0,
+            absent INT NOT NULL DEFAULT 0
+        )
+        """
+    )
+    cur.execute("INSERT INTO users (name, role) VALUES ('Bench Teacher', 'teacher')")
+    teacher_id = cur.lastrowid
+    cur.executemany(
+        "INSERT INTO users (name, role) VALUES (%s, 'student')",
+        [(f"Student {i:05d}",) for i in range(n_students)],
+    )
+    conn.commit()
+    cur.execute("SELECT id FROM users WHERE role='student' ORDER BY id")
+    ids = [r[0] for r in cur.fetchall()]
+    cur.close()
+    return teacher_id, ids
+
+
+def per_row(conn, rows):
+    cur = conn.cursor()
+    for row in rows:
+        cur.execute(PER_ROW_SQL, row)
+    conn.commit()
+    cur.close()
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def run(conn, n: int, chunk_size: int):
+    teacher_id, ids = setup(conn, n)
+    day_a, day_b = date.today(), date.today() - timedelta(days=1)
+
+    def rows(day, flip):
+        return [(sid, day, "absent" if (sid % 7 == 0) ^ flip else "present", teacher_id)
+                for sid in ids]
+
+    bulk = lambda r: upsert_attendance(conn, r, chunk_size)
+    return {
+        "per_row_insert": timed(per_row, conn, rows(day_a, False)),
+        "per_row_update": timed(per_row, conn, rows(day_a, True)),
+        "bulk_insert": timed(bulk, rows(day_b, False)),
+        "bulk_update": timed(bulk, rows(day_b, True)),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Per-row vs. batched attendance upsert")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--user", default="root")
+    ap.add_argument("--password", default="root")
+    ap.add_argument("--database", default="student_portal_bench")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5000])
+    ap.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = ap.parse_args()
+
+    server = mysql.connector.connect(host=args.host, user=args.user, password=args.password)
+    server.cursor().execute(f"CREATE DATABASE IF NOT EXISTS {args.database}")
+    server.close()
+    conn = mysql.connector.connect(
+        host=args.host, user=args.user, password=args.password, database=args.database
+    )
+
+    print(f"{'students':>8} {'row ins':>10} {'row upd':>10} {'bulk ins':>10} {'bulk upd':>10} {'speedup':>8}")
+    for n in args.sizes:
+        r = run(conn, n, args.chunk_size)
+        speedup = (r["per_row_insert"] + r["per_row_update"]) / (r["bulk_insert"] + r["bulk_update"])
+        print(
+            f"{n:>8} {r['per_row_insert']:>8.1f}ms {r['per_row_update']:>8.1f}ms "
+            f"{r['bulk_insert']:>8.1f}ms {r['bulk_update']:>8.1f}ms {speedup:>7.1f}x"
+        )
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
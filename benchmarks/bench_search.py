@@ -0,0 +1,93 @@
+# ─────────────────────────────────────────────────────────────
+#  Benchmark: search latency over a large search_docs table
+#  ------------------------------------------------------------
+#  Run from the repository root against a scratch database:
+#      python -m benchmarks.bench_search --docs 100000
+#  Seeds synthetic documents, then times search() for common,
+#  rare and multi-word queries and prints p50 / p95 / max.
+# ─────────────────────────────────────────────────────────────
+
+import argparse
+import random
+import statistics
+import time
+
+import mysql.connector
+
+from portal.search import index_document, search
+
+SUBJECTS = ["physics", "chemistry", "biology", "mathematics", "history", "geography",
+            "economics", "english", "hindi", "gujarati", "computer", "environmental"]
+WORDS = ("question bank paper unit chapter notes revision solution exercise practical "
+         "semester external internal syllabus model test worksheet lab manual assignment "
+         "theory numericals formula derivation diagram summary important board exam").split()
+QUERIES = ["physics notes", "question bank", "semester external paper", "derivation",
+           "gujarati worksheet", "computer lab manual", "environmental summary", "zygote"]
+
+
+def seed(conn, n: int, batch: int = 2000):
+    cur = conn.cursor()
+    cur.execute("DROP TABLE IF EXISTS search_docs")
+    cur.execute(
+        """
+        CREATE TABLE search_docs (
+            doc_type VARCHAR(20) NOT NULL,
+            doc_id INT NOT NULL,
+            title VARCHAR(300) NOT NULL DEFAULT '',
+            body MEDIUMTEXT,
+            PRIMARY KEY (doc_type, doc_id),
+            FULLTEXT KEY ft_title (title),
+            FULLTEXT KEY ft_title_body (title, body)
+        ) ENGINE=InnoDB
+        """
+    )
+    rnd = random.Random(42)
+    for i in range(1, n + 1):
+        title = f"{rnd.choice(SUBJECTS)} {' '.join(rnd.sample(WORDS, 3))} {i}"
+        body = " ".join(rnd.choice(WORDS + SUBJECTS) for _ in range(rnd.randint(50, 400)))
+        index_document(cur, rnd.choice(["material", "assignment"]), i, title, body)
+        if i % batch == 0:
+            conn.commit()
+    conn.commit()
+    cur.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="search_docs query latency")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--user", default="root")
+    ap.add_argument("--password", default="root")
+    ap.add_argument("--database", default="student_portal_bench")
+    ap.add_argument("--docs", type=int, default=100_000)
+    ap.add_argument("--repeat", type=int, default=50)
+    ap.add_argument("--skip-seed", action="store_true")
+    args = ap.parse_args()
+
+    server = mysql.connector.connect(host=args.host, user=args.user, password=args.password)
+    server.cursor().execute(f"CREATE DATABASE IF NOT EXISTS {args.database}")
+    server.close()
+    conn = mysql.connector.connect(
+        host=args.host, user=args.user, password=args.password, database=args.database
+    )
+    if not args.skip_seed:
+        start = time.perf_counter()
+        seed(conn, args.docs)
+        print(f"seeded {args.docs} docs in {time.perf_counter() - start:.1f}s")
+
+    print(f"{'query':<26} {'p50':>8} {'p95':>8} {'max':>8} {'hits':>5}")
+    cur = conn.cursor()
+    for q in QUERIES:
+        timings = []
+        for i in range(args.repeat):
+            start = time.perf_counter()
+            hits, _more = search(cur, q, page=1 + i % 3)
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        print(f"{q:<26} {statistics.median(timings):>6.1f}ms {p95:>6.1f}ms {timings[-1]:>6.1f}ms {len(hits):>5}")
+    cur.close()
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+# ─────────────────────────────────────────────────────────────
+#  Load test: seed a scratch portal, drive the real routes
+#  ------------------------------------------------------------
+#  Run from the repository root, either on a scratch copy of the
+#  bundled SQLite file (no server needed) or a MySQL scratch DB,
+#  e.g. `docker run -e MYSQL_ROOT_PASSWORD=root -p 3306:3306 mysql:8`:
+#      python -m benchmarks.loadtest --backend sqlite --students 1000 10000
+#      DB_NAME=portal_load python -m benchmarks.loadtest --backend mysql
+#      … --driver wsgi --concurrency 8 --json results.json
+#  For each scale: reseed, then run every scenario through the
+#  Flask test client or a real threaded WSGI server and report
+#  p50 / p95 / p99 latency and throughput.
+# ─────────────────────────────────────────────────────────────
+
+import argparse
+import http.client
+import importlib
+import json
+import logging
+import os
+import shutil
+import statistics
+import sys
+import threading
+import time
+from datetime import date, timedelta
+from urllib.parse import urlencode
+
+from portal import migrations
+from portal.attendance_store import upsert_attendance, rebuild_rollups
+
+portal = None                    # portal.core, imported with the app once DB_* env is set
+BUNDLED_DB = os.path.join(os.path.dirname(migrations.__file__), "student_portal.db")
+PASSWORD = "loadtest"
+MATERIAL_BYTES = 256 * 1024
+
+
+# ───────── Seeding ─────────
+
+def seed(students: int, days: int, materials: int) -> dict:
+    """Wipe and refill the target DB; returns ids the scenarios need."""
+    pw_hash = portal.passwords.hash(PASSWORD)           # hash once, not per user
+    with portal.app.app_context():
+        db = portal.db.connection()
+        cur = db.cursor()
+        for table in ("attendance", "attendance_monthly", "attendance_daily", "search_docs",
+                      "material_meta", "jobs", "materials", "blobs", "sessions", "users"):
+            cur.execute(f"DELETE FROM {table}")
+        cur.execute(
+            "INSERT INTO users (name, username, email, password, role) VALUES (%s,%s,%s,%s,'teacher')",
+            ("Load Teacher", "teacher", "teacher@load.test", pw_hash),
+        )
+        teacher_id = cur.lastrowid
+        cur.execute(
+            "INSERT INTO users (name, username, email, password, role) VALUES (%s,%s,%s,%s,'admin')",
+            ("Load Admin", "admin", "admin@load.test", pw_hash),
+        )
+        for start in range(0, students, 5000):
+            cur.executemany(
+                "INSERT INTO users (name, username, email, password, student_identifier, standard, role) "
+                "VALUES (%s,%s,%s,%s,%s,%s,'student')",
+                [(f"Student {i:06d}", f"s{i}", f"s{i}@load.test", pw_hash, f"S{i:06d}", i % 12 + 1)
+                 for i in range(start, min(start + 5000, students))],
+            )
+        db.commit()
+        cur.execute("SELECT id FROM users WHERE role='student' ORDER BY id")
+        student_ids = [r[0] for r in cur.fetchall()]
+
+        today = date.today()
+        rows = ((sid, today - timedelta(days=d), "absent" if (sid + d) % 9 == 0 else "present", teacher_id)
+                for d in range(1, days + 1) for sid in student_ids)
+        upsert_attendance(db, rows, chunk_size=2000)
+
+        upload_folder = portal.app.config["UPLOAD_FOLDER"]
+        material_ids = []
+        for i in range(materials):
+            payload = os.urandom(MATERIAL_BYTES // 2) * 2
+            path = os.path.join(portal.app.config["UPLOAD_STAGING"], f"load{i}.pdf")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as fh:
+                fh.write(payload)
+            rel = portal.material_blobs.adopt(cur, os.path.relpath(path, upload_folder))
+            cur.execute(
+                "INSERT INTO materials (title, description, filename, original_name, standard, uploaded_by) "
+                "VALUES (%s,%s,%s,%s,%s,%s)",
+                (f"Load material {i}", "synthetic", rel, f"load{i}.pdf", i % 12 + 1, teacher_id),
+            )
+            material_ids.append(cur.lastrowid)
+        db.commit()
+        cur.close()
+        rebuild_rollups(db)
+    portal.cache.clear()
+    roster = [s["id"] for s in _roster()]
+    return {"material_ids": material_ids, "roster": roster}
+
+
+def _roster():
+    from portal.blueprints.attendance import get_all_students
+    with portal.app.app_context():
+        return get_all_students()
+
+
+# ───────── Scenarios ─────────
+
+def scenarios(ids: dict):
+    """(name, role, method, path, form) tuples; role picks the logged-in user."""
+    mark_form = {f"attendance_{sid}": "present" if sid % 5 else "absent" for sid in ids["roster"]}
+    first_mat = ids["material_ids"][0] if ids["material_ids"] else None
+    out = [
+        ("login", None, "POST", "/login", {"login": "teacher@load.test", "password": PASSWORD}),
+        ("mark-attendance POST", "teacher", "POST", "/mark-attendance", mark_form),
+        ("attendance-history", "teacher", "GET", "/attendance-history", None),
+        ("materials", "teacher", "GET", "/materials", None),
+    ]
+    if first_mat:
+        out.append(("download", "teacher", "GET", f"/materials/{first_mat}/download", None))
+    return out
+
+
+# ───────── Drivers ─────────
+
+class ClientDriver:
+    """In-process Flask test client (no network, no server)."""
+
+    def __init__(self):
+        self.client = portal.app.test_client()
+
+    def login(self, email):
+        self.client.post("/login", data={"login": email, "password": PASSWORD})
+
+    def request(self, method, path, form):
+        resp = self.client.open(path, method=method, data=form)
+        body = resp.get_data()
+        return resp.status_code, len(body)
+
+
+class WSGIDriver:
+    """HTTP/1.1 against a real threaded WSGI server on localhost."""
+
+    def __init__(self, port):
+        self.conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        self.cookie = None
+
+    def login(self, email):
+        self.request("POST", "/login", {"login": email, "password": PASSWORD})
+
+    def request(self, method, path, form):
+        headers = {"Cookie": self.cookie} if self.cookie else {}
+        body = None
+        if form is not None:
+            body = urlencode(form)
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        self.conn.request(method, path, body=body, headers=headers)
+        resp = self.conn.getresponse()
+        data = resp.read()
+        cookie = resp.getheader("Set-Cookie")
+        if cookie:
+            self.cookie = cookie.split(";", 1)[0]
+        return resp.status, len(data)
+
+
+def start_wsgi_server():
+    from werkzeug.serving import make_server
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)   # no per-request access log
+    server = make_server("127.0.0.1", 0, portal.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# ───────── Runner ─────────
+
+def percentile(sorted_ms, p):
+    if not sorted_ms:
+        return 0.0
+    k = max(0, min(len(sorted_ms) - 1, round(p / 100 * len(sorted_ms)) - 1))
+    return sorted_ms[k]
+
+
+def run_scenario(make_driver, scenario, concurrency, requests_per_client):
+    name, role, method, path, form = scenario
+    timings, errors = [], 0
+    lock = threading.Lock()
+
+    def client():
+        nonlocal errors
+        drv = make_driver()
+        if role:
+            drv.login(f"{role}@load.test")
+        local, bad = [], 0
+        for _ in range(requests_per_client):
+            start = time.perf_counter()
+            status, _size = drv.request(method, path, form)
+            local.append((time.perf_counter() - start) * 1000)
+            bad += status >= 400
+        with lock:
+            timings.extend(local)
+            errors += bad
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    wall = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - wall
+    timings.sort()
+    return {
+        "scenario": name,
+        "requests": len(timings),
+        "errors": errors,
+        "p50_ms": percentile(timings, 50),
+        "p95_ms": percentile(timings, 95),
+        "p99_ms": percentile(timings, 99),
+        "mean_ms": statistics.fmean(timings) if timings else 0.0,
+        "rps": len(timings) / wall if wall else 0.0,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Seed + load-test the student portal")
+    ap.add_argument("--backend", choices=["sqlite", "mysql"], default="sqlite")
+    ap.add_argument("--sqlite-path", default="loadtest.db",
+                    help="scratch copy of student_portal.db to seed (sqlite backend)")
+    ap.add_argument("--students", type=int, nargs="+", default=[1000, 10000, 100000])
+    ap.add_argument("--days", type=int, default=20, help="attendance history per student")
+    ap.add_argument("--materials", type=int, default=20)
+    ap.add_argument("--driver", choices=["client", "wsgi", "both"], default="both")
+    ap.add_argument("--concurrency", type=int, default=4)
+    ap.add_argument("--requests", type=int, default=50, help="per client per scenario")
+    ap.add_argument("--json", help="also write results to this file")
+    args = ap.parse_args()
+
+    if args.backend == "sqlite":
+        if os.path.abspath(args.sqlite_path) == BUNDLED_DB:
+            sys.exit("refusing to reseed the bundled database; pick another --sqlite-path")
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(args.sqlite_path + suffix):
+                os.remove(args.sqlite_path + suffix)
+        shutil.copyfile(BUNDLED_DB, args.sqlite_path)
+        os.environ.update(DB_BACKEND="sqlite", SQLITE_PATH=args.sqlite_path)
+    elif os.environ.get("DB_NAME", "student_portal") == "student_portal":
+        sys.exit("refusing to reseed the default database; set DB_NAME to a scratch DB")
+    else:
+        os.environ["DB_BACKEND"] = "mysql"
+
+    global portal
+    importlib.import_module("portal.app")      # registers the routes
+    portal = importlib.import_module("portal.core")
+    migrations.migrate(portal.backend)
+
+    drivers = ["client", "wsgi"] if args.driver == "both" else [args.driver]
+    server = start_wsgi_server() if "wsgi" in drivers else None
+    results = []
+    for n in args.students:
+        start = time.perf_counter()
+        ids = seed(n, args.days, args.materials)
+        print(f"\n== {args.backend}: {n} students × {args.days} days, {args.materials} materials "
+              f"(seeded in {time.perf_counter() - start:.1f}s)")
+        print(f"{'driver':<7} {'scenario':<22} {'req':>5} {'err':>4} {'p50':>8} {'p95':>8} {'p99':>8} {'req/s':>8}")
+        for drv in drivers:
+            make = ClientDriver if drv == "client" else (lambda: WSGIDriver(server.server_port))
+            for sc in scenarios(ids):
+                r = run_scenario(make, sc, args.concurrency, args.requests)
+                r.update(driver=drv, students=n, backend=args.backend)
+                results.append(r)
+                print(f"{drv:<7} {r['scenario']:<22} {r['requests']:>5} {r['errors']:>4} "
+                      f"{r['p50_ms']:>6.1f}ms {r['p95_ms']:>6.1f}ms {r['p99_ms']:>6.1f}ms {r['rps']:>8.1f}")
+    if server:
+        server.shutdown()
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
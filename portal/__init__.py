@@ -0,0 +1,7 @@
+# ─────────────────────────────────────────────────────────────
+#  Student portal package
+#  ------------------------------------------------------------
+#  `portal.app:app` is the WSGI app (serve.py, flask --app
+#  portal.app); portal.core holds the shared services and
+#  portal.blueprints the routes.
+# ─────────────────────────────────────────────────────────────
@@ -0,0 +1,127 @@
+# ─────────────────────────────────────────────────────────────
+#  JSON API helpers (/api/v1)
+#  ------------------------------------------------------------
+#  • api_response() – compact JSON with a weak ETag; a matching
+#    If-None-Match gets a bodiless 304, so re-polling an unchanged
+#    list downloads nothing
+#  • wanted_fields() / pick() – ?fields=a,b,c trims every item
+#  • make_cursor() / read_cursor() / page() – opaque keyset
+#    tokens: a page costs the same however deep the client has paged
+#  • compress() – after_request: brotli (if the `brotli` package
+#    is installed) or gzip, for bodies big enough to be worth it
+#  Errors are JSON too: api_error() aborts with {"error": …}.
+# ─────────────────────────────────────────────────────────────
+
+import base64
+import gzip
+import hashlib
+import json
+
+from flask import abort, current_app, jsonify, request
+
+try:
+    import brotli
+except ImportError:                      # optional: gzip only
+    brotli = None
+
+MIN_COMPRESS = 1024                      # bytes; smaller bodies aren't worth the CPU
+
+
+def api_error(status: int, message: str):
+    resp = jsonify(error=message)
+    resp.status_code = status
+    abort(resp)
+
+
+def api_response(payload, status: int = 200):
+    body = json.dumps(payload, separators=(",", ":"), default=str)   # dates → ISO text
+    resp = current_app.response_class(body, status=status, mimetype="application/json")
+    if request.method == "GET" and status == 200:
+        # weak: the same validator still matches once compress() re-encodes the body
+        resp.set_etag(hashlib.sha1(body.encode()).hexdigest(), weak=True)
+        resp.cache_control.private = True
+        resp.cache_control.no_cache = True
+        resp = resp.make_conditional(request)
+    return resp
+
+
+# ───────── Request parameters ─────────
+
+def wanted_fields(allowed, default=None) -> list:
+    """?fields=a,b → ["a", "b"] (400 on unknown names); `default` or all if absent."""
+    raw = request.args.get("fields")
+    if not raw:
+        return list(default or allowed)
+    fields = [f for f in raw.split(",") if f]
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        api_error(400, f"unknown field(s): {', '.join(unknown)}; have {', '.join(allowed)}")
+    return fields
+
+
+def pick(rows, fields) -> list:
+    return [{f: row[f] for f in fields} for row in rows]
+
+
+def page_limit(default: int, maximum: int) -> int:
+    try:
+        limit = int(request.args.get("limit", default))
+    except ValueError:
+        api_error(400, "limit must be a number")
+    return max(1, min(limit, maximum))
+
+
+def id_list(name: str, maximum: int) -> list:
+    """?name=1,2,3 → [1, 2, 3]; [] if absent."""
+    raw = request.args.get(name, "")
+    try:
+        ids = [int(v) for v in raw.split(",") if v]
+    except ValueError:
+        api_error(400, f"{name} must be comma-separated ids")
+    if len(ids) > maximum:
+        api_error(400, f"at most {maximum} {name} per request")
+    return ids
+
+
+def make_cursor(*values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values, default=str).encode()).decode()
+
+
+def read_cursor(token: str, n: int) -> list:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token.encode()))
+        if isinstance(values, list) and len(values) == n:
+            return values
+    except Exception:
+        pass
+    api_error(400, "bad cursor")
+
+
+def page(rows, limit: int, fields, key):
+    """{"data", "next"} for `rows` fetched with LIMIT limit + 1; `key(row)` → cursor values."""
+    more = len(rows) > limit
+    rows = rows[:limit]
+    return api_response({"data": pick(rows, fields),
+                         "next": make_cursor(*key(rows[-1])) if more else None})
+
+
+# ───────── Compression ─────────
+
+def compress(response):
+    if (response.direct_passthrough or response.status_code != 200
+            or "Content-Encoding" in response.headers):
+        return response
+    response.vary.add("Accept-Encoding")
+    data = response.get_data()
+    if len(data) < MIN_COMPRESS:
+        return response
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        data, encoding = brotli.compress(data, quality=5), "br"
+    elif accepted["gzip"]:
+        data, encoding = gzip.compress(data, compresslevel=6), "gzip"
+    else:
+        return response
+    response.set_data(data)
+    response.headers["Content-Encoding"] = encoding
+    return response
@@ -0,0 +1,112 @@
+# ─────────────────────────────────────────────────────────────
+#  Student Portal Web App (Flask + MySQL / SQLite)
+#  ------------------------------------------------------------
+#  Features
+#  • Accounts: admin, teacher, student; login by username or e-mail
+#  • Study materials and assignments per standard (upload / view /
+#    download / delete, admin/teacher), full-text search
+#  • Attendance: mark today, edit any date, history, summary,
+#    sheet, CSV/XLSX import and export, live updates
+#  • Announcements, FAQs, gallery, counsellor chat, JSON API
+#  The app object and shared services live in core.py, the routes
+#  in one blueprint per subsystem (blueprints/). This module wires
+#  them together and owns the process-level commands:
+#      flask --app portal.app migrate | run-worker | …
+#      python -m portal.app            (dev server)
+# ─────────────────────────────────────────────────────────────
+
+import os
+import threading
+
+import click
+from flask import jsonify, request
+
+from . import migrations
+from .blueprints import BLUEPRINTS
+from .blueprints.assignments import assignment_summary
+from .blueprints.attendance import get_all_students, student_ids
+from .blueprints.materials import material_list, material_summary
+from .core import JOB_HANDLERS, app, backend, db
+from .jobs import run_worker
+from .page_cache import warm_templates
+from .uploads import discard_unsaved
+
+for blueprint in BLUEPRINTS:
+    app.register_blueprint(blueprint)
+
+
+@app.teardown_request
+def drop_staged_uploads(exc):
+    discard_unsaved(request)
+
+
+# ───────── Schema ─────────
+@app.cli.command("migrate")
+@click.option("--status", "show_status", is_flag=True, help="List applied and pending steps only.")
+def migrate_command(show_status):
+    """Create / upgrade the database schema (run once per deploy)."""
+    if show_status:
+        done, pending = migrations.status(backend)
+        click.echo(f"applied: {', '.join(map(str, done)) or 'none'}")
+        for version, name in pending:
+            click.echo(f"pending: {version:04d} {name}")
+        return
+    ran = migrations.migrate(backend, log=click.echo)
+    click.echo(f"{len(ran)} migration(s) applied." if ran else "Schema is up to date.")
+
+
+# ───────── Background jobs ─────────
+@app.cli.command("run-worker")
+@click.option("--processes", default=2, show_default=True, help="Processing processes.")
+@click.option("--once", is_flag=True, help="Exit when the queue is empty.")
+def run_worker_command(processes, once):
+    """Process queued background jobs (see JOB_HANDLERS)."""
+    run_worker(app, db.connection, JOB_HANDLERS, processes=processes, once=once)
+
+
+# compile every template now, so the first requests after a deploy don't pay for it
+if app.config["TEMPLATE_WARMUP"]:
+    warm_templates(app, app.config["TEMPLATE_BYTECODE_DIR"])
+
+# ───────── Warm-up / Health ─────────
+# serve.py runs warm_up() in every worker before its first request; /healthz
+# stays 503 until it has succeeded (and retries it), so a load balancer only
+# sends traffic to workers that are ready.
+ready = threading.Event()
+_warming = threading.Lock()
+
+
+def warm_up() -> None:
+    """Fill the DB pool, compile every template and prime the hot caches."""
+    with _warming:
+        if ready.is_set():
+            return
+        db.warm()
+        warm_templates(app)
+        with app.app_context():
+            material_list()
+            material_summary()
+            assignment_summary()
+            get_all_students()
+            student_ids()
+        ready.set()
+
+
+@app.route("/healthz")
+def healthz():
+    """Readiness probe: 200 once this worker is warm and the DB answers."""
+    try:
+        warm_up()
+        db.query("SELECT 1")
+    except Exception as exc:           # DB down, pool exhausted, …
+        app.logger.warning("not ready: %s", exc)
+        return jsonify(status="unavailable"), 503
+    return jsonify(status="ok", pid=os.getpid())
+
+
+# ───────── Main ─────────
+# Development server; production runs `python serve.py` (gunicorn).
+if __name__ == "__main__":
+    migrations.migrate(backend)        # dev convenience; deployments run `flask migrate`
+    warm_up()
+    app.run(debug=True, host="0.0.0.0", port=5000)
@@ -0,0 +1,210 @@
+# ─────────────────────────────────────────────────────────────
+#  Attendance spreadsheets: bulk import and streaming export
+#  ------------------------------------------------------------
+#  • read_sheet() streams (line, cells) out of a CSV, or out of
+#    the first worksheet of an XLSX via iterparse (stdlib only,
+#    like processing.py: no openpyxl, no whole sheet in memory)
+#  • import_attendance() validates (student_identifier, date,
+#    status) rows against an identifier → id map and writes each
+#    batch through upsert_attendance (one transaction per batch);
+#    dry_run reports what would change and writes nothing
+#  • export_csv() yields CSV text chunk by chunk from an open
+#    cursor, for a streamed response
+# ─────────────────────────────────────────────────────────────
+
+import csv
+import io
+import posixpath
+import re
+import zipfile
+from datetime import date, datetime, timedelta
+from xml.etree.ElementTree import iterparse
+
+from .attendance_store import upsert_attendance, existing_status
+
+COLUMNS = ("student_identifier", "date", "status")
+MAX_ERRORS = 50                          # listed in the report; the rest only counted
+
+_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+_EXCEL_EPOCH = date(1899, 12, 30)
+
+
+# ───────── Reading ─────────
+
+def _csv_rows(path):
+    with open(path, newline="", encoding="utf-8-sig", errors="replace") as fh:
+        for line, cells in enumerate(csv.reader(fh), 1):
+            yield line, cells
+
+
+def _col_index(ref: str) -> int:
+    """'C12' → 2."""
+    n = 0
+    for ch in re.match(r"[A-Z]+", ref).group():
+        n = n * 26 + ord(ch) - 64
+    return n - 1
+
+
+def _first_sheet(zf) -> str:
+    with zf.open("xl/workbook.xml") as fh:
+        for _ev, el in iterparse(fh):
+            if el.tag == _NS + "sheet":
+                rid = el.get(_REL)
+                break
+        else:
+            raise ValueError("workbook has no sheets")
+    with zf.open("xl/_rels/workbook.xml.rels") as fh:
+        for _ev, el in iterparse(fh):
+            if el.get("Id") == rid:
+                target = el.get("Target")
+                return target.lstrip("/") if target.startswith("/") else posixpath.join("xl", target)
+    raise ValueError("first sheet not found")
+
+
+def _xlsx_rows(path):
+    with zipfile.ZipFile(path) as zf:
+        shared = []
+        if "xl/sharedStrings.xml" in zf.namelist():
+            with zf.open("xl/sharedStrings.xml") as fh:
+                for _ev, el in iterparse(fh):
+                    if el.tag == _NS + "si":
+                        shared.append("".join(t.text or "" for t in el.iter(_NS + "t")))
+                        el.clear()
+        with zf.open(_first_sheet(zf)) as fh:
+            for _ev, row in iterparse(fh):
+                if row.tag != _NS + "row":
+                    continue
+                cells = []
+                for c in row.iter(_NS + "c"):
+                    kind, v = c.get("t"), c.find(_NS + "v")
+                    if kind == "s" and v is not None:
+                        value = shared[int(v.text)]
+                    elif kind == "inlineStr":
+                        value = "".join(t.text or "" for t in c.iter(_NS + "t"))
+                    else:
+                        value = v.text if v is not None else ""
+                    idx = _col_index(c.get("r")) if c.get("r") else len(cells)
+                    cells.extend([""] * (idx - len(cells)))
+                    cells.append(value)
+                yield int(row.get("r") or 0), cells
+                row.clear()                  # keep memory flat on long sheets
+
+
+def read_sheet(path: str, ext: str):
+    """(line number, [cell text]) for every row of a .csv or .xlsx file."""
+    return _xlsx_rows(path) if ext == ".xlsx" else _csv_rows(path)
+
+
+# ───────── Validation ─────────
+
+def _parse_date(value: str) -> date:
+    value = value.strip()
+    if re.fullmatch(r"\d+(\.\d+)?", value):           # XLSX date cell: days since 1899-12-30
+        return _EXCEL_EPOCH + timedelta(days=int(float(value)))
+    for fmt in ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y"):
+        try:
+            return datetime.strptime(value[:10], fmt).date()
+        except ValueError:
+            pass
+    raise ValueError(f"bad date {value!r}")
+
+
+def _layout(cells):
+    """Column positions from a header row, or None if `cells` is data."""
+    names = [c.strip().lower() for c in cells]
+    if all(col in names for col in COLUMNS):
+        return [names.index(col) for col in COLUMNS]
+    return None
+
+
+def parse_rows(sheet, student_ids: dict, marked_by, report: dict):
+    """Valid (student_id, date, status, marked_by) rows; problems go to `report`."""
+    layout = None
+    for line, cells in sheet:
+        if not any(c.strip() for c in cells):
+            continue
+        if layout is None:
+            layout = _layout(cells)
+            if layout is not None:
+                continue                     # header row
+            layout = [0, 1, 2]
+        report["rows"] += 1
+        try:
+            ident, day, status = (cells[i].strip() if i < len(cells) else "" for i in layout)
+            sid = student_ids.get(ident)
+            if sid is None:
+                raise ValueError(f"unknown student_identifier {ident!r}")
+            status = status.lower()
+            if status not in ("present", "absent"):
+                raise ValueError(f"status must be present/absent, got {status!r}")
+            yield sid, _parse_date(day), status, marked_by
+        except ValueError as exc:
+            report["invalid"] += 1
+            if len(report["errors"]) < MAX_ERRORS:
+                report["errors"].append((line, str(exc)))
+
+
+def _batches(rows, size, report):
+    """Chunks of `size`, last row winning when a chunk repeats a (student, date)."""
+    batch = {}
+    for row in rows:
+        if row[:2] in batch:
+            report["duplicates"] += 1
+        batch[row[:2]] = row
+        if len(batch) == size:
+            yield list(batch.values())
+            batch = {}
+    if batch:
+        yield list(batch.values())
+
+
+def import_attendance(conn, sheet, student_ids: dict, marked_by, *,
+                      dry_run: bool = False, batch_size: int = 500) -> dict:
+    """Validate and upsert a parsed sheet; returns the report.
+
+    Each batch commits on its own, so a large file holds locks briefly
+    and a failure keeps the batches before it.
+    """
+    report = dict(rows=0, invalid=0, duplicates=0, inserted=0, updated=0, errors=[], dry_run=dry_run)
+    for batch in _batches(parse_rows(sheet, student_ids, marked_by, report), batch_size, report):
+        if dry_run:
+            cur = conn.cursor()
+            try:
+                existing = existing_status(cur, batch, lock=False)
+            finally:
+                cur.close()
+            counts = {"inserted": len(batch) - len(existing), "updated": len(existing)}
+        else:
+            counts = upsert_attendance(conn, batch, chunk_size=batch_size)
+        report["inserted"] += counts["inserted"]
+        report["updated"] += counts["updated"]
+    return report
+
+
+# ───────── Export ─────────
+
+EXPORT_SQL = """
+    SELECT u.student_identifier, u.name, a.date, a.status
+    FROM attendance a
+    JOIN users u ON u.id = a.student_id
+    WHERE a.date BETWEEN %s AND %s
+    ORDER BY a.date, u.name
+"""
+
+
+def export_csv(cur, fetch_size: int = 1000):
+    """CSV text for an executed EXPORT_SQL cursor, one chunk per fetch."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(COLUMNS[:1] + ("name",) + COLUMNS[1:])
+    while True:
+        rows = cur.fetchmany(fetch_size)
+        if not rows:
+            break
+        writer.writerows(rows)
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue()
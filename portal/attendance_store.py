@@ -0,0 +1,389 @@
+# ─────────────────────────────────────────────────────────────
+#  Attendance data access
+#  ------------------------------------------------------------
+#  • write path: one multi-row upsert (db_backend) per chunk
+#    instead of one round trip per student. Shared by
+#    mark_attendance, edit_attendance and attendance_io imports.
+#  • rollups: per-student/month and per-date present/absent
+#    counts, adjusted in the same transaction as each upsert.
+#  • history: keyset pages over (date DESC, name, id) so a page
+#    costs the same however much history has built up.
+#  • sheet: a students × days range as one flat bytearray matrix.
+# ─────────────────────────────────────────────────────────────
+
+import base64
+import json
+from collections import defaultdict
+from datetime import date
+
+from .db_backend import current
+
+DEFAULT_CHUNK_SIZE = 500
+
+ATTENDANCE_COLUMNS = ("student_id", "date", "status", "marked_by")
+
+
+def _chunks(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _as_date(value) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(str(value))
+
+
+def _last_per_key(batch) -> list:
+    """One row per (student_id, date), the last one winning (as the upsert would)."""
+    return list({(row[0], _as_date(row[1])): row for row in batch}.values())
+
+
+def existing_status(cur, batch, lock: bool = True) -> dict:
+    """{(student_id, date): status} for rows of `batch` already stored."""
+    params = [v for sid, day, _status, _by in batch for v in (sid, day)]
+    cur.execute(
+        # FOR UPDATE: concurrent saves of the same day must not both count as new
+        f"SELECT student_id, date, status FROM attendance "
+        f"WHERE {current().row_in(('student_id', 'date'), len(batch))}" + (" FOR UPDATE" if lock else ""),
+        params,
+    )
+    return {(sid, _as_date(day)): status for sid, day, status in cur.fetchall()}
+
+
+def upsert_attendance(conn, rows, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                      commit: bool = True, changes: list = None) -> dict:
+    """Write (student_id, date, status, marked_by) rows in one transaction.
+
+    Rollup tables are adjusted in the same transaction. Returns
+    {"inserted": n, "updated": m}; if `changes` is given, the rows whose
+    status actually changed are appended to it as (student_id, date,
+    status). A (student_id, date) repeated within a chunk counts once,
+    with its last status. On any error the whole batch is rolled back
+    and the exception re-raised.
+    """
+    counts = {"inserted": 0, "updated": 0}
+    cur = conn.cursor()
+    try:
+        for batch in _chunks(rows, max(1, chunk_size)):
+            batch = _last_per_key(batch)
+            existing = existing_status(cur, batch)
+            cur.execute(
+                current().upsert("attendance", ATTENDANCE_COLUMNS, ("student_id", "date"),
+                                 ("status", "marked_by"), rows=len(batch)),
+                [v for row in batch for v in row],
+            )
+            apply_rollup_deltas(cur, _rollup_deltas(batch, existing))
+            if changes is not None:
+                changes.extend((sid, _as_date(day), status) for sid, day, status, _by in batch
+                               if existing.get((sid, _as_date(day))) != status)
+            counts["updated"] += len(existing)
+            counts["inserted"] += len(batch) - len(existing)
+        if commit:
+            conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+    return counts
+
+
+def rows_from_form(form, student_ids, day, marked_by):
+    """Pick `attendance_<id>` radio values out of a submitted form.
+
+    Anything but present/absent is ignored, as if the radio were unset.
+    """
+    for sid in student_ids:
+        status = form.get(f"attendance_{sid}")
+        if status in ("present", "absent"):
+            yield (sid, day, status, marked_by)
+
+
+# ───────── Rollups ─────────
+#  attendance_monthly (student_id, month) and attendance_daily (date)
+#  hold present/absent counts. They only ever move by deltas from
+#  upsert_attendance; `flask rebuild-rollups` recomputes them from
+#  scratch (e.g. after students were deleted and their rows cascaded).
+
+def _rollup_deltas(batch, existing):
+    monthly = defaultdict(lambda: [0, 0])   # (student_id, month) → [present, absent]
+    daily = defaultdict(lambda: [0, 0])     # date → [present, absent]
+    status_now = dict(existing)             # a repeated (student, date) moves from its previous mark
+    for sid, day, status, _by in batch:
+        day = _as_date(day)
+        old = status_now.get((sid, day))
+        if old == status:
+            continue
+        status_now[(sid, day)] = status
+        for target in (monthly[(sid, day.replace(day=1))], daily[day]):
+            if old:
+                target[0 if old == "present" else 1] -= 1
+            target[0 if status == "present" else 1] += 1
+    return monthly, daily
+
+
+def apply_rollup_deltas(cur, deltas) -> None:
+    monthly, daily = deltas
+    add = {"present": "present+{new}", "absent": "absent+{new}"}
+    if monthly:
+        cur.execute(
+            current().upsert("attendance_monthly", ("student_id", "month", "present", "absent"),
+                             ("student_id", "month"), add, rows=len(monthly)),
+            [v for (sid, month), (p, a) in monthly.items() for v in (sid, month, p, a)],
+        )
+    if daily:
+        cur.execute(
+            current().upsert("attendance_daily", ("date", "present", "absent"), ("date",),
+                             add, rows=len(daily)),
+            [v for day, (p, a) in daily.items() for v in (day, p, a)],
+        )
+
+
+def rebuild_rollups(conn) -> None:
+    """Recompute both rollup tables from the raw attendance table."""
+    cur = conn.cursor()
+    try:
+        cur.execute("DELETE FROM attendance_monthly")
+        cur.execute("DELETE FROM attendance_daily")
+        month = current().month_start("date")
+        cur.execute(
+            f"""
+            INSERT INTO attendance_monthly (student_id, month, present, absent)
+            SELECT student_id, {month}, SUM(status='present'), SUM(status='absent')
+            FROM attendance
+            GROUP BY student_id, {month}
+            """
+        )
+        cur.execute(
+            """
+            INSERT INTO attendance_daily (date, present, absent)
+            SELECT date, SUM(status='present'), SUM(status='absent')
+            FROM attendance
+            GROUP BY date
+            """
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+def student_summary(conn, student_id=None, month_from=None, month_to=None):
+    """Per-student totals and percentage, read from attendance_monthly only."""
+    where, params = [], []
+    if student_id is not None:
+        where.append("m.student_id = %s")
+        params.append(student_id)
+    if month_from:
+        where.append("m.month >= %s")
+        params.append(_as_date(month_from).replace(day=1))
+    if month_to:
+        where.append("m.month <= %s")
+        params.append(_as_date(month_to).replace(day=1))
+    cur = conn.cursor(dictionary=True)
+    cur.execute(
+        f"""
+        SELECT u.id, u.name, SUM(m.present) AS present, SUM(m.absent) AS absent
+        FROM attendance_monthly m
+        JOIN users u ON u.id = m.student_id
+        {"WHERE " + " AND ".join(where) if where else ""}
+        GROUP BY u.id, u.name
+        ORDER BY u.name
+        """,
+        params,
+    )
+    rows = cur.fetchall()
+    cur.close()
+    for r in rows:
+        r["present"], r["absent"] = int(r["present"]), int(r["absent"])
+        total = r["present"] + r["absent"]
+        r["percent"] = round(100.0 * r["present"] / total, 1) if total else None
+    return rows
+
+
+def daily_totals(conn, date_from=None, date_to=None, limit: int = 31):
+    """Per-date class totals from attendance_daily, newest first."""
+    where, params = [], []
+    if date_from:
+        where.append("date >= %s")
+        params.append(date_from)
+    if date_to:
+        where.append("date <= %s")
+        params.append(date_to)
+    cur = conn.cursor(dictionary=True)
+    cur.execute(
+        f"""
+        SELECT date, present, absent FROM attendance_daily
+        {"WHERE " + " AND ".join(where) if where else ""}
+        ORDER BY date DESC
+        LIMIT %s
+        """,
+        params + [limit],
+    )
+    rows = cur.fetchall()
+    cur.close()
+    return rows
+
+
+# ───────── Sheet (students × days matrix) ─────────
+
+ABSENT, PRESENT = 2, 1                       # cell codes; 0 = not marked
+
+
+class AttendanceMatrix:
+    """Codes for len(students) × len(days) cells in one flat bytearray.
+
+    Row i is students[i], column j is days[j]. Totals are counted with
+    bytes.count over row slices / strided column slices, in C.
+    """
+
+    __slots__ = ("students", "days", "cells")
+
+    def __init__(self, students, days):
+        self.students = students
+        self.days = days
+        self.cells = bytearray(len(students) * len(days))
+
+    def row(self, i: int) -> bytes:
+        width = len(self.days)
+        return bytes(self.cells[i * width:(i + 1) * width])
+
+    def student_totals(self):
+        """[(present, absent)] per student."""
+        rows = (self.row(i) for i in range(len(self.students)))
+        return [(r.count(PRESENT), r.count(ABSENT)) for r in rows]
+
+    def day_totals(self):
+        """[(present, absent)] per day."""
+        width = len(self.days)
+        cols = (self.cells[j::width] for j in range(width))
+        return [(c.count(PRESENT), c.count(ABSENT)) for c in cols]
+
+
+def attendance_matrix(conn, students, date_from: date, date_to: date) -> AttendanceMatrix:
+    """Fill a matrix for `students` (rows with "id") from one range query."""
+    days = [date.fromordinal(n) for n in range(date_from.toordinal(), date_to.toordinal() + 1)]
+    matrix = AttendanceMatrix(students, days)
+    width = len(days)
+    offset = {stu["id"]: i * width for i, stu in enumerate(students)}
+    cur = conn.cursor()
+    # range scan on idx_att_date_student; the DB hands back the column number
+    # and cell code, so the loop below is one dict lookup + one store per row
+    cur.execute(
+        f"SELECT student_id, {current().days_since('date')}, 2 - (status = 'present') "
+        f"FROM attendance WHERE date BETWEEN %s AND %s",
+        (date_from, date_from, date_to),
+    )
+    cells = matrix.cells
+    for sid, day, code in cur.fetchall():
+        base = offset.get(sid)
+        if base is not None:
+            cells[base + day] = code
+    cur.close()
+    return matrix
+
+
+# ───────── History (keyset pagination) ─────────
+
+def encode_cursor(row) -> str:
+    key = [str(row["date"]), row.get("name") or "", row["id"]]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def decode_cursor(token: str):
+    """(date, name, id) from a cursor token; ValueError if it is mangled."""
+    try:
+        day, name, rid = json.loads(base64.urlsafe_b64decode(token.encode()))
+        return day, name, int(rid)
+    except Exception as exc:
+        raise ValueError("bad cursor") from exc
+
+
+def _filters(student_id, date_from, date_to):
+    where, params = [], []
+    if student_id is not None:
+        where.append("a.student_id = %s")
+        params.append(student_id)
+    if date_from:
+        where.append("a.date >= %s")
+        params.append(date_from)
+    if date_to:
+        where.append("a.date <= %s")
+        params.append(date_to)
+    return where, params
+
+
+def history_page(conn, *, staff: bool, student_id=None, date_from=None,
+                 date_to=None, after=None, limit: int = 50):
+    """One page of attendance history, newest first.
+
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    where, params = _filters(student_id, date_from, date_to)
+    cur = conn.cursor(dictionary=True)
+
+    if not staff:
+        # (student_id, date) is unique → date alone is a total order
+        if after:
+            where.append("a.date < %s")
+            params.append(after[0])
+        cur.execute(
+            f"""
+            SELECT a.id, a.date, a.status
+            FROM attendance a
+            WHERE {" AND ".join(where)}
+            ORDER BY a.date DESC
+            LIMIT %s
+            """,
+            params + [limit + 1],
+        )
+    else:
+        # Bound the join to a date window that is known to hold ≥ limit+1
+        # rows: the date of the (limit+1)-th row older than the cursor day,
+        # found on idx_att_date_student without touching users.
+        floor_where, floor_params = list(where), list(params)
+        if after:
+            floor_where.append("a.date < %s")
+            floor_params.append(after[0])
+        cur.execute(
+            f"""
+            SELECT a.date FROM attendance a
+            {"WHERE " + " AND ".join(floor_where) if floor_where else ""}
+            ORDER BY a.date DESC
+            LIMIT 1 OFFSET %s
+            """,
+            floor_params + [limit],
+        )
+        floor = cur.fetchone()
+        if floor:
+            where.append("a.date >= %s")
+            params.append(floor["date"])
+        if after:
+            day, name, rid = after
+            where.append("(a.date < %s OR (a.date = %s AND (u.name > %s OR (u.name = %s AND a.id > %s))))")
+            params += [day, day, name, name, rid]
+        cur.execute(
+            f"""
+            SELECT a.id, a.date, u.name, a.status
+            FROM attendance a
+            JOIN users u ON u.id = a.student_id
+            {"WHERE " + " AND ".join(where) if where else ""}
+            ORDER BY a.date DESC, u.name, a.id
+            LIMIT %s
+            """,
+            params + [limit + 1],
+        )
+
+    rows = cur.fetchall()
+    cur.close()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(rows[-1])
+    return rows, None
@@ -0,0 +1,112 @@
+# ─────────────────────────────────────────────────────────────
+#  Content-addressed file storage
+#  ------------------------------------------------------------
+#  Files live at <root>/blobs/<sha[:2]>/<sha256><ext>; identical
+#  uploads share one blob. The `blobs` table keeps a reference
+#  count per (store, path) and is updated in the caller's
+#  transaction, so the file is unlinked only when the last row
+#  pointing at it goes.
+#  Inside db.transaction() the file follows the outcome: a blob
+#  placed by a transaction that rolls back is removed again, and
+#  a released one is unlinked only after the commit.
+# ─────────────────────────────────────────────────────────────
+
+import os
+from functools import partial
+
+from .db_backend import current
+from .uploads import file_sha256
+
+
+def _place(source, dest: str) -> bool:
+    """Move a staged upload (StagedFile or path) to `dest`, or drop it if
+    an identical blob is already there. True if `dest` is new."""
+    if os.path.exists(dest):
+        if isinstance(source, str):
+            os.remove(source)
+        else:
+            source.discard()
+        return False
+    os.makedirs(os.path.dirname(dest), exist_ok=True)
+    if isinstance(source, str):
+        with open(source, "rb+") as fh:
+            os.fsync(fh.fileno())
+        os.replace(source, dest)
+    else:
+        source.commit(dest)
+    return True
+
+
+class BlobStore:
+    def __init__(self, root: str, store: str, db=None):
+        self.root = root          # directory the stored paths are relative to
+        self.store = store        # namespace in the blobs table ("materials", …)
+        self.db = db              # Database: ties file changes to db.transaction()
+
+    @staticmethod
+    def rel_path(digest: str, ext: str) -> str:
+        return f"blobs/{digest[:2]}/{digest}{ext.lower()}"
+
+    def put(self, cur, source, digest: str, size: int, ext: str) -> str:
+        """Take one reference on the blob for `digest`; returns its path."""
+        rel = self.rel_path(digest, ext)
+        # row lock first: a concurrent release() of the same blob waits for us
+        cur.execute(
+            current().upsert("blobs", ("store", "path", "sha256", "size", "refcount"),
+                             ("store", "path"), {"refcount": "refcount+1"}),
+            (self.store, rel, digest, size, 1),
+        )
+        if _place(source, os.path.join(self.root, rel)) and self.db is not None:
+            self.db.after_rollback(partial(self.discard, rel))
+        return rel
+
+    def release(self, cur, rel: str):
+        """Drop one reference on `rel`.
+
+        Returns True if that was the last one, False if still referenced and
+        None if `rel` is not a tracked blob (a pre-dedup upload). The file
+        goes once the transaction commits (at once outside db.transaction()).
+        """
+        cur.execute(
+            "SELECT refcount FROM blobs WHERE store=%s AND path=%s FOR UPDATE",
+            (self.store, rel),
+        )
+        row = cur.fetchone()
+        if row is None:
+            return None
+        if row[0] > 1:
+            cur.execute(
+                "UPDATE blobs SET refcount=refcount-1 WHERE store=%s AND path=%s",
+                (self.store, rel),
+            )
+            return False
+        cur.execute("DELETE FROM blobs WHERE store=%s AND path=%s", (self.store, rel))
+        if self.db is None or not self.db.after_commit(partial(self.discard, rel)):
+            self._unlink(rel)             # under the row lock: a concurrent put() re-creates it
+        return True
+
+    def discard(self, rel: str) -> None:
+        """Unlink `rel` unless a blobs row references it (again).
+
+        Runs in a transaction of its own, after the one that released or
+        failed to add the blob. The locking read holds back a concurrent
+        put() of the same blob (the row lock, or the gap lock on MySQL's
+        default REPEATABLE READ) until the file is gone, so that put()
+        places a fresh copy instead of keeping the one being removed.
+        """
+        with self.db.transaction() as cur:
+            cur.execute("SELECT 1 FROM blobs WHERE store=%s AND path=%s FOR UPDATE", (self.store, rel))
+            if cur.fetchone() is None:
+                self._unlink(rel)
+
+    def _unlink(self, rel: str) -> None:
+        try:
+            os.remove(os.path.join(self.root, rel))
+        except FileNotFoundError:
+            pass
+
+    def adopt(self, cur, legacy_name: str) -> str:
+        """Move a pre-dedup file (`<root>/<legacy_name>`) into the store."""
+        path = os.path.join(self.root, legacy_name)
+        ext = os.path.splitext(legacy_name)[1]
+        return self.put(cur, path, file_sha256(path), os.path.getsize(path), ext)
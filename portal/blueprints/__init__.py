@@ -0,0 +1,19 @@
+# ─────────────────────────────────────────────────────────────
+#  One blueprint per subsystem, all over core.py's services
+#  ------------------------------------------------------------
+#  auth         register / login / logout, sessions CLI
+#  pages        dashboard, about, FAQs, gallery
+#  materials    study materials, uploads, processing jobs
+#  assignments  per-standard assignment files
+#  attendance   mark / edit / sheet / import / history
+#  announcements, chat, search, live (SSE), api (/api/v1), admin
+# ─────────────────────────────────────────────────────────────
+
+from . import (
+    admin, announcements, api, assignments, attendance, auth, chat, live, materials, pages, search,
+)
+
+BLUEPRINTS = (
+    auth.bp, pages.bp, materials.bp, assignments.bp, attendance.bp, announcements.bp,
+    chat.bp, search.bp, live.bp, api.bp, admin.bp,
+)
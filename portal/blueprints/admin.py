@@ -0,0 +1,28 @@
+# ─────────────────────────────────────────────────────────────
+#  Admin-only metrics (pool and cache counters as JSON)
+#  ------------------------------------------------------------
+#  The full set, with latency histograms, is on /metrics
+#  (instrumentation.py).
+# ─────────────────────────────────────────────────────────────
+
+from flask import Blueprint, abort, jsonify, session
+
+from ..core import cache, db
+
+bp = Blueprint("admin", __name__, url_prefix="/admin")
+
+
+@bp.before_request
+def admins_only():
+    if session.get("role") != "admin":
+        abort(403)
+
+
+@bp.route("/pool-stats")
+def pool_stats():
+    return jsonify(db.pool.stats())
+
+
+@bp.route("/cache-stats")
+def cache_stats():
+    return jsonify(cache.stats())
@@ -0,0 +1,56 @@
+# ─────────────────────────────────────────────────────────────
+#  Announcements, pushed live
+#  ------------------------------------------------------------
+#  New and deleted announcements go out on the "announcements"
+#  channel (see live.py); open announcement pages patch their
+#  list instead of being refreshed.
+# ─────────────────────────────────────────────────────────────
+
+from flask import Blueprint, current_app, flash, redirect, render_template, request, session, url_for
+
+from ..core import broker, db, login_required
+
+bp = Blueprint("announcements", __name__)
+
+
+def latest_announcements():
+    return db.query(
+        "SELECT id, title, content, date_posted FROM announcements ORDER BY date_posted DESC, id DESC LIMIT %s",
+        (current_app.config["ANNOUNCEMENTS_SHOWN"],),
+    )
+
+
+@bp.route("/announcements")
+@login_required
+def announcements():
+    return render_template("announcements.html", announcements=latest_announcements())
+
+
+@bp.route("/manage_announcements", methods=["GET", "POST"])
+@login_required
+def manage_announcements():
+    if session.get("role") != "admin":
+        return redirect(url_for("pages.dashboard"))
+    if request.method == "POST":
+        title = request.form["title"].strip()[:255]
+        content = request.form["content"]
+        with db.transaction() as cur:
+            cur.execute("INSERT INTO announcements (title, content) VALUES (%s,%s)", (title, content))
+            ann_id = cur.lastrowid
+            cur.execute("SELECT date_posted FROM announcements WHERE id=%s", (ann_id,))
+            posted = cur.fetchone()[0]
+        broker.publish("announcements", dict(id=ann_id, title=title, content=content, date=str(posted)))
+        flash("Announcement posted", "success")
+        return redirect(url_for("announcements.manage_announcements"))
+    return render_template("manage_announcements.html", announcements=latest_announcements())
+
+
+@bp.route("/delete_announcement/<int:id>", methods=["POST"])
+@login_required
+def delete_announcement(id):
+    if session.get("role") != "admin":
+        return redirect(url_for("pages.dashboard"))
+    db.execute("DELETE FROM announcements WHERE id=%s", (id,))
+    broker.publish("announcements", dict(deleted=id))
+    flash("Announcement deleted", "info")
+    return redirect(url_for("announcements.manage_announcements"))
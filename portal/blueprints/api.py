@@ -0,0 +1,216 @@
+# ─────────────────────────────────────────────────────────────
+#  JSON API (/api/v1)
+#  ------------------------------------------------------------
+#  For the mobile client: log in with POST /api/v1/session
+#  (session cookie), then keyset pages {"data": [...], "next":
+#  cursor}, ?fields= to trim items, ETag / 304 on every GET and
+#  gzip/br bodies. Attendance is read and written in batches:
+#  one call per date range, not one page per day.
+# ─────────────────────────────────────────────────────────────
+
+from datetime import date
+
+from flask import Blueprint, current_app, request, session, url_for
+
+from ..apiutil import (
+    api_error, api_response, compress, id_list, page, page_limit, pick, read_cursor, wanted_fields
+)
+from ..attendance_store import upsert_attendance
+from ..core import db, load_profile
+from ..listing import newest_first
+from .auth import authenticate
+from .live import publish_attendance
+
+bp = Blueprint("api", __name__, url_prefix="/api/v1")
+
+API_MAX_LIMIT = 500
+API_MAX_IDS = 1000
+API_MAX_MARKS = 5000
+
+USER_FIELDS = ("id", "name", "username", "email", "role", "standard", "student_identifier")
+MATERIAL_FIELDS = ("id", "title", "description", "original_name", "standard", "uploader",
+                   "uploaded_at", "page_count", "download_url")
+ASSIGNMENT_FIELDS = ("id", "title", "standard", "uploaded_by", "uploaded_on", "url")
+ATTENDANCE_FIELDS = ("student_id", "date", "status", "marked_by")
+
+
+@bp.after_request
+def compress_api(response):
+    return compress(response)
+
+
+def api_user(*roles) -> str:
+    """The caller's role; 401 if not logged in, 403 if not one of `roles`."""
+    if "id" not in session:
+        api_error(401, "login required")
+    if roles and session.get("role") not in roles:
+        api_error(403, "not allowed for this role")
+    return session["role"]
+
+
+def _api_date(name: str) -> date:
+    try:
+        return date.fromisoformat(request.args[name])
+    except (KeyError, ValueError):
+        api_error(400, f"{name} must be a YYYY-MM-DD date")
+
+
+# ───────── Session / users ─────────
+@bp.route("/session", methods=["POST"])
+def api_login():
+    """{"login" (username or e-mail) | "username" | "email", "password"}."""
+    body = request.get_json(silent=True) or {}
+    login = body.get("login") or body.get("username") or body.get("email") or ""
+    uid = authenticate(str(login), str(body.get("password", "")))
+    if uid is None:
+        api_error(401, "invalid credentials")
+    session.regenerate()
+    session["id"] = uid
+    return api_response(dict(load_profile(uid), id=uid))
+
+
+@bp.route("/session", methods=["DELETE"])
+def api_logout():
+    session.clear()
+    return "", 204
+
+
+@bp.route("/users/me")
+def api_me():
+    api_user()
+    return api_response(dict(load_profile(session["id"]), id=session["id"]))
+
+
+@bp.route("/users")
+def api_users():
+    api_user("teacher", "admin")
+    fields = wanted_fields(USER_FIELDS)
+    limit = page_limit(100, API_MAX_LIMIT)
+    where, params = ["1=1"], []
+    if request.args.get("role"):
+        where.append("role=%s")
+        params.append(request.args["role"])
+    if request.args.get("standard"):
+        where.append("standard=%s")
+        params.append(request.args.get("standard", type=int))
+    if request.args.get("cursor"):
+        where.append("id > %s")
+        params.extend(read_cursor(request.args["cursor"], 1))
+    rows = db.query(
+        f"""SELECT {', '.join(USER_FIELDS)} FROM users
+            WHERE {" AND ".join(where)} ORDER BY id LIMIT %s""",
+        tuple(params) + (limit + 1,),
+    )
+    return page(rows, limit, fields, lambda r: (r["id"],))
+
+
+# ───────── Materials / assignments ─────────
+@bp.route("/materials")
+def api_materials():
+    """Newest id first; ?standard= narrows to one class."""
+    api_user()
+    fields = wanted_fields(MATERIAL_FIELDS)
+    limit = page_limit(50, API_MAX_LIMIT)
+    where, params = ["1=1"], []
+    if request.args.get("standard"):
+        where.append("m.standard=%s")
+        params.append(request.args.get("standard", type=int))
+    if request.args.get("cursor"):
+        where.append("m.id < %s")
+        params.extend(read_cursor(request.args["cursor"], 1))
+    rows = db.query(
+        f"""SELECT m.id, m.title, m.description, m.original_name, m.standard, u.name AS uploader,
+                   m.uploaded_at, mm.page_count
+            FROM materials m
+            LEFT JOIN users u ON m.uploaded_by = u.id
+            LEFT JOIN material_meta mm ON mm.material_id = m.id
+            WHERE {" AND ".join(where)} ORDER BY m.id DESC LIMIT %s""",
+        tuple(params) + (limit + 1,),
+    )
+    for row in rows:
+        row["download_url"] = url_for("materials.download_material", mid=row["id"])
+    return page(rows, limit, fields, lambda r: (r["id"],))
+
+
+@bp.route("/assignments")
+def api_assignments():
+    """Newest-first page for ?standard= (required: it keeps the scan on the index)."""
+    api_user()
+    standard = request.args.get("standard", type=int)
+    if standard is None:
+        api_error(400, "standard is required")
+    fields = wanted_fields(ASSIGNMENT_FIELDS)
+    limit = page_limit(current_app.config["LIST_PAGE_SIZE"], API_MAX_LIMIT)
+    # on idx_assignments_standard_uploaded (standard, uploaded_on)
+    rows, next_cursor = newest_first(
+        db, "SELECT id, title, filename, standard, uploaded_by, uploaded_on FROM assignments WHERE standard=%s",
+        (standard,), "uploaded_on", limit, arg="cursor")
+    for row in rows:
+        row["url"] = url_for("static", filename=f"uploads/assignments/{row.pop('filename')}")
+    return api_response({"data": pick(rows, fields), "next": next_cursor})
+
+
+# ───────── Attendance ─────────
+@bp.route("/attendance")
+def api_attendance():
+    """?from=&to= (required), ?students=1,2,3; students only ever get their own rows."""
+    role = api_user()
+    date_from, date_to = _api_date("from"), _api_date("to")
+    max_days = current_app.config["SHEET_MAX_DAYS"]
+    if not 0 <= (date_to - date_from).days < max_days:
+        api_error(400, f"from..to must be a range of at most {max_days} days")
+    students = [session["id"]] if role == "student" else id_list("students", API_MAX_IDS)
+    fields = wanted_fields(ATTENDANCE_FIELDS)
+    limit = page_limit(API_MAX_LIMIT, API_MAX_MARKS)
+
+    where, params = ["a.date BETWEEN %s AND %s"], [date_from, date_to]
+    if students:
+        where.append(f"a.student_id IN ({', '.join(['%s'] * len(students))})")
+        params.extend(students)
+    if request.args.get("cursor"):
+        day, sid = read_cursor(request.args["cursor"], 2)
+        where.append("(a.date > %s OR (a.date = %s AND a.student_id > %s))")
+        params.extend((day, day, sid))
+    rows = db.query(
+        f"""SELECT a.student_id, a.date, a.status, a.marked_by FROM attendance a
+            WHERE {" AND ".join(where)} ORDER BY a.date, a.student_id LIMIT %s""",
+        tuple(params) + (limit + 1,),
+    )
+    return page(rows, limit, fields, lambda r: (str(r["date"]), r["student_id"]))
+
+
+@bp.route("/attendance", methods=["PUT"])
+def api_put_attendance():
+    """{"marks": [{"student_id", "date", "status"}, …]} → one upsert for all of them."""
+    api_user("teacher", "admin")
+    marks = (request.get_json(silent=True) or {}).get("marks")
+    if not isinstance(marks, list) or not marks:
+        api_error(400, 'body must be {"marks": [{"student_id", "date", "status"}, ...]}')
+    if len(marks) > API_MAX_MARKS:
+        api_error(400, f"at most {API_MAX_MARKS} marks per request")
+
+    batch, bad = {}, []
+    for i, mark in enumerate(marks):
+        try:
+            sid, day, status = int(mark["student_id"]), date.fromisoformat(mark["date"]), mark["status"]
+            if status not in ("present", "absent"):
+                raise ValueError(status)
+        except (KeyError, TypeError, ValueError):
+            bad.append(i)
+            continue
+        batch[(sid, day)] = (sid, day, status, session["id"])     # last one wins
+    if bad:
+        api_error(400, f"invalid marks at index {', '.join(map(str, bad[:20]))}")
+
+    sids = sorted({sid for sid, _day in batch})
+    known = {r.id for r in db.query(
+        f"SELECT id FROM users WHERE role='student' AND id IN ({', '.join(['%s'] * len(sids))})", tuple(sids)
+    )}
+    if len(known) != len(sids):
+        api_error(400, f"unknown student_id(s): {', '.join(str(s) for s in sids if s not in known)}")
+
+    changes = []
+    counts = upsert_attendance(db.connection(), batch.values(), current_app.config["ATTENDANCE_BATCH_SIZE"],
+                               changes=changes)
+    publish_attendance(changes)
+    return api_response(dict(counts, changed=len(changes)))
@@ -0,0 +1,90 @@
+# ─────────────────────────────────────────────────────────────
+#  Assignments, one folder per standard (class)
+#  ------------------------------------------------------------
+#  • /assignments: a card per standard with its count and latest
+#    upload (one cached GROUP BY), /assignments/<standard> pages
+#    newest first on (standard, uploaded_on)
+#  • files are plain static files in the shared blob layout under
+#    static/uploads/assignments; duplicates share one blob
+# ─────────────────────────────────────────────────────────────
+
+import os
+from functools import partial
+
+from flask import Blueprint, current_app, flash, redirect, render_template, request, session, url_for
+from werkzeug.utils import secure_filename
+
+from ..core import STANDARDS, allowed, assignment_blobs, cache, db, login_required, remove_file, staff
+from ..listing import newest_first, standard_summary
+from ..search import index_document, remove_document
+from ..uploads import stage_upload
+
+bp = Blueprint("assignments", __name__)
+
+
+def assignment_summary() -> dict:
+    return standard_summary(db, cache, "assignments", "uploaded_on")
+
+
+@bp.route("/assignments")
+@login_required
+def assignments_home():
+    return render_template("assignments_home.html", standards=STANDARDS, summary=assignment_summary())
+
+
+@bp.route("/assignments/<int:standard>")
+@login_required
+def by_standard(standard):
+    # on idx_assignments_standard_uploaded (standard, uploaded_on)
+    assignments, next_before = newest_first(
+        db, "SELECT id, title, filename, uploaded_on FROM assignments WHERE standard=%s",
+        (standard,), "uploaded_on", current_app.config["LIST_PAGE_SIZE"])
+    return render_template("assignments_list.html", assignments=assignments, standard=standard,
+                           next_before=next_before)
+
+
+@bp.route("/assignments/<int:standard>/upload", methods=["POST"])
+@login_required
+def upload_assignment(standard):
+    if not staff() or standard not in STANDARDS:
+        return redirect(url_for("assignments.assignments_home"))
+
+    title = request.form["title"].strip()
+    file = request.files.get("file")
+    if not title or not file or not allowed(file.filename):
+        flash("Invalid file", "warning")
+        return redirect(url_for("assignments.by_standard", standard=standard))
+
+    staged = stage_upload(file)
+    ext = os.path.splitext(secure_filename(file.filename))[1]
+    with db.transaction() as cur:
+        filename = assignment_blobs.put(cur, staged, staged.sha256.hexdigest(), staged.size, ext)
+        cur.execute(
+            "INSERT INTO assignments (title, filename, uploaded_by, standard) VALUES (%s,%s,%s,%s)",
+            (title, filename, session.get("username") or session["name"][:50], standard),
+        )
+        index_document(cur, "assignment", cur.lastrowid, title)
+    cache.invalidate("assignments")
+    flash("Assignment uploaded successfully!", "success")
+    return redirect(url_for("assignments.by_standard", standard=standard))
+
+
+@bp.route("/assignments/<int:aid>/delete", methods=["POST"])
+@login_required
+def delete_assignment(aid):
+    if not staff():
+        return redirect(url_for("assignments.assignments_home"))
+
+    with db.transaction() as cur:
+        cur.execute("SELECT filename, standard FROM assignments WHERE id=%s FOR UPDATE", (aid,))
+        row = cur.fetchone()
+        if row:
+            if assignment_blobs.release(cur, row[0]) is None:     # file goes after the commit
+                db.after_commit(partial(remove_file, current_app.config["ASSIGNMENT_FOLDER"], row[0]))
+            cur.execute("DELETE FROM assignments WHERE id=%s", (aid,))
+            remove_document(cur, "assignment", aid)
+    if not row:
+        return redirect(url_for("assignments.assignments_home"))
+    cache.invalidate("assignments")
+    flash("Assignment deleted.", "info")
+    return redirect(url_for("assignments.by_standard", standard=row[1]))
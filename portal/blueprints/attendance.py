@@ -0,0 +1,311 @@
+# ─────────────────────────────────────────────────────────────
+#  Attendance
+#  ------------------------------------------------------------
+#  • mark today / edit any date: one batched upsert per save,
+#    changed marks pushed to open pages (live.py)
+#  • history (keyset pages), summary (rollups only), students ×
+#    days sheet (one range query), CSV / XLSX import and a
+#    streamed CSV export
+# ─────────────────────────────────────────────────────────────
+
+import os
+import zipfile
+from datetime import date, timedelta
+from xml.etree.ElementTree import ParseError
+
+import click
+from flask import (
+    Blueprint, Response, abort, current_app, flash, jsonify, redirect, render_template, request, session,
+    stream_with_context, url_for
+)
+from markupsafe import Markup
+
+from ..attendance_io import EXPORT_SQL, export_csv, import_attendance, read_sheet
+from ..attendance_store import (
+    attendance_matrix, daily_totals, decode_cursor, history_page, rebuild_rollups, rows_from_form,
+    student_summary, upsert_attendance
+)
+from ..core import cached_query, db, staff
+from ..uploads import stage_upload
+from .live import publish_attendance, wants_json
+
+bp = Blueprint("attendance", __name__, cli_group=None)
+
+
+def get_all_students(limit: int = 30):
+    return cached_query(
+        "students",
+        "SELECT id, name FROM users WHERE role='student' ORDER BY name LIMIT %s",
+        (limit,)
+    )
+
+
+def student_ids() -> dict:
+    """student_identifier → user id, from the "students" cache tag."""
+    rows = cached_query(
+        "students",
+        "SELECT student_identifier, id FROM users WHERE role='student' AND student_identifier IS NOT NULL",
+    )
+    return {r.student_identifier: r.id for r in rows}
+
+
+def _date_arg(name: str):
+    """?name=YYYY-MM-DD as a date, None if absent; 400 if malformed."""
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        abort(400)
+
+
+# ───────── Mark / edit ─────────
+@bp.route("/mark-attendance", methods=["GET", "POST"])
+def mark_attendance():
+    if not staff():
+        return redirect(url_for("pages.dashboard"))
+
+    students = get_all_students()
+    today = date.today()
+
+    if request.method == "POST":
+        rows = rows_from_form(request.form, [stu.id for stu in students], today, session["id"])
+        changes = []
+        counts = upsert_attendance(db.connection(), rows, current_app.config["ATTENDANCE_BATCH_SIZE"],
+                                   changes=changes)
+        publish_attendance(changes)
+        if wants_json():
+            return jsonify(dict(counts, changed=len(changes)))
+        flash(f"Attendance saved! ({counts['inserted']} new, {counts['updated']} updated)", "success")
+        return redirect(url_for("attendance.mark_attendance"))
+
+    # GET → existing marks to pre-select
+    existing = {
+        row.student_id: row.status
+        for row in db.query("SELECT student_id, status FROM attendance WHERE date=%s", (today,))
+    }
+    return render_template("attendance.html", students=students, existing=existing, selected_date=today)
+
+
+@bp.route("/edit-attendance", methods=["GET", "POST"])
+def edit_attendance():
+    if not staff():
+        return redirect(url_for("pages.dashboard"))
+
+    selected_date = _date_arg("date") or date.today()
+    # Student list with status for selected_date
+    students = db.query(
+        """
+        SELECT u.id, u.name, a.status
+        FROM users u
+        LEFT JOIN attendance a ON u.id = a.student_id AND a.date = %s
+        WHERE u.role='student'
+        ORDER BY u.name
+        """,
+        (selected_date,),
+    )
+
+    if request.method == "POST":
+        rows = rows_from_form(request.form, [stu.id for stu in students], selected_date, session["id"])
+        changes = []
+        counts = upsert_attendance(db.connection(), rows, current_app.config["ATTENDANCE_BATCH_SIZE"],
+                                   changes=changes)
+        publish_attendance(changes)
+        if wants_json():
+            return jsonify(dict(counts, changed=len(changes)))
+        flash(f"Attendance updated! ({counts['inserted']} new, {counts['updated']} updated)", "success")
+        return redirect(url_for("attendance.edit_attendance", date=selected_date))
+
+    return render_template("edit_attendance.html", students=students, selected_date=selected_date)
+
+
+# ───────── Sheet (students × days) ─────────
+SHEET_CELLS = ("<td></td>", '<td class="text-success">P</td>', '<td class="text-danger">A</td>')
+
+
+@bp.app_template_filter("sheet_cells")
+def sheet_cells(codes: bytes) -> Markup:
+    """One matrix row → its <td> cells (joined here: a Jinja loop per cell is slow)."""
+    return Markup("".join([SHEET_CELLS[c] for c in codes]))
+
+
+def _date_range():
+    try:
+        date_to = date.fromisoformat(request.args.get("to") or date.today().isoformat())
+        date_from = date.fromisoformat(request.args.get("from") or date_to.replace(day=1).isoformat())
+    except ValueError:
+        abort(400)
+    return date_from, date_to
+
+
+@bp.route("/attendance/sheet")
+def attendance_sheet():
+    if not staff():
+        return redirect(url_for("pages.dashboard"))
+    date_from, date_to = _date_range()
+    if date_from > date_to:
+        date_from, date_to = date_to, date_from
+    date_from = max(date_from, date_to - timedelta(days=current_app.config["SHEET_MAX_DAYS"] - 1))
+
+    students = cached_query(
+        "students", "SELECT id, name, student_identifier FROM users WHERE role='student' ORDER BY name"
+    )
+    matrix = attendance_matrix(db.connection(), students, date_from, date_to)
+    return render_template(
+        "attendance_sheet.html", matrix=matrix, date_from=date_from, date_to=date_to,
+        student_totals=matrix.student_totals(), day_totals=matrix.day_totals(),
+    )
+
+
+# ───────── Import / export ─────────
+@bp.route("/attendance/import", methods=["GET", "POST"])
+def attendance_import():
+    if not staff():
+        return redirect(url_for("pages.dashboard"))
+
+    report = None
+    if request.method == "POST":
+        file = request.files.get("file")
+        ext = os.path.splitext(file.filename)[1].lower() if file and file.filename else ""
+        if ext not in (".csv", ".xlsx"):
+            flash("Upload a .csv or .xlsx file", "warning")
+            return redirect(request.url)
+        staged = stage_upload(file)
+        try:
+            staged.flush()
+            report = import_attendance(
+                db.connection(), read_sheet(staged.path, ext), student_ids(), session["id"],
+                dry_run=bool(request.form.get("dry_run")),
+                batch_size=current_app.config["ATTENDANCE_BATCH_SIZE"],
+            )
+        except (ValueError, KeyError, zipfile.BadZipFile, ParseError) as exc:
+            flash(f"Could not read {file.filename}: {exc}", "danger")
+            return redirect(request.url)
+        finally:
+            staged.discard()
+        report["filename"] = file.filename
+
+    today = date.today()
+    return render_template("attendance_import.html", report=report,
+                           date_from=today.replace(day=1).isoformat(), date_to=today.isoformat())
+
+
+@bp.route("/attendance/export.csv")
+def attendance_export():
+    if not staff():
+        return redirect(url_for("pages.dashboard"))
+    date_from, date_to = _date_range()
+
+    # unbuffered cursor: rows go out as they arrive, never all in memory
+    cur = db.connection().cursor()
+    cur.execute(EXPORT_SQL, (date_from, date_to))
+
+    def stream():
+        done = False
+        try:
+            yield from export_csv(cur)
+            done = True
+        finally:
+            cur.close()
+            if not done:
+                db.mark_failed()    # client left mid-stream: unread rows, recycle the connection
+
+    return Response(
+        stream_with_context(stream()),
+        mimetype="text/csv",
+        headers={"Content-Disposition": f"attachment; filename=attendance_{date_from}_{date_to}.csv"},
+    )
+
+
+# ───────── History / summary ─────────
+@bp.route("/attendance-history")
+def attendance_history():
+    role = session.get("role")
+    uid = session.get("id")
+    if not role:
+        return redirect(url_for("auth.login"))
+
+    args = request.args
+    filters = {
+        "date_from": _date_arg("from"),
+        "date_to": _date_arg("to"),
+        "student": (args.get("student") or "").strip(),
+    }
+    try:
+        after = decode_cursor(args["after"]) if args.get("after") else None
+    except ValueError:
+        abort(400)
+
+    if role == "student":
+        student_id = uid
+    elif filters["student"]:
+        stu = db.one(
+            "SELECT id FROM users WHERE student_identifier=%s AND role='student'", (filters["student"],)
+        )
+        student_id = stu.id if stu else -1   # unknown ID → empty page
+    else:
+        student_id = None
+
+    records, next_cursor = history_page(
+        db.connection(),
+        staff=role != "student",
+        student_id=student_id,
+        date_from=filters["date_from"],
+        date_to=filters["date_to"],
+        after=after,
+        limit=current_app.config["HISTORY_PAGE_SIZE"],
+    )
+    return render_template(
+        "attendance_history.html", records=records, role=role,
+        filters=filters, next_cursor=next_cursor, paged=after is not None,
+    )
+
+
+def _summary_data():
+    """Rollup-only numbers behind the summary page and its JSON twin."""
+    role = session.get("role")
+    date_from, date_to = _date_arg("from"), _date_arg("to")
+    conn = db.connection()
+    return {
+        "students": student_summary(
+            conn,
+            student_id=session["id"] if role == "student" else None,
+            month_from=date_from,
+            month_to=date_to,
+        ),
+        "days": [] if role == "student" else daily_totals(conn, date_from=date_from, date_to=date_to),
+    }
+
+
+@bp.route("/attendance-summary")
+def attendance_summary():
+    if not session.get("role"):
+        return redirect(url_for("auth.login"))
+    data = _summary_data()
+    return render_template("attendance_summary.html", role=session["role"],
+                           frm=request.args.get("from", ""), to=request.args.get("to", ""), **data)
+
+
+@bp.route("/attendance-summary.json")
+def attendance_summary_json():
+    if not session.get("role"):
+        abort(401)
+    data = _summary_data()
+    for d in data["days"]:
+        d["date"] = d["date"].isoformat()
+    return jsonify(data)
+
+
+@bp.cli.command("rebuild-rollups")
+def rebuild_rollups_command():
+    """Recompute attendance_monthly / attendance_daily from attendance."""
+    rebuild_rollups(db.connection())
+    click.echo("Attendance rollups rebuilt.")
+
+
+# Convenience redirects so old links still work
+@bp.route("/attendance")
+@bp.route("/my_attendance")
+def my_attendance():
+    return redirect(url_for("attendance.attendance_history"))
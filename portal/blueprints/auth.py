@@ -0,0 +1,105 @@
+# ─────────────────────────────────────────────────────────────
+#  Accounts: register / login / logout
+#  ------------------------------------------------------------
+#  Users sign in with their username or their e-mail address.
+#  Sessions hold only the user id (core.load_profile supplies
+#  name / role / standard); authenticate() is shared with the
+#  JSON API and upgrades outdated password hashes on the way.
+# ─────────────────────────────────────────────────────────────
+
+import click
+from flask import Blueprint, flash, redirect, render_template, request, session, url_for
+
+from ..core import STANDARDS, cache, db, passwords, session_store
+
+bp = Blueprint("auth", __name__, cli_group=None)
+
+
+@bp.route("/")
+def home():
+    return redirect(url_for("pages.dashboard"))
+
+
+@bp.route("/register", methods=["GET", "POST"])
+def register():
+    if "id" in session:
+        return redirect(url_for("pages.dashboard"))
+
+    if request.method == "POST":
+        form = request.form
+        name = form["name"].strip()
+        username = form["username"].strip()
+        email = form["email"].strip().lower()
+        role = form["role"]
+        student = role == "student"
+        sid = (form.get("student_identifier") or "").strip() if student else None
+        standard = form.get("standard", type=int) if student else None
+
+        if role not in ("admin", "teacher", "student"):
+            flash("Pick a role", "warning")
+            return redirect(url_for("auth.register"))
+        if student and (not sid or standard not in STANDARDS):
+            flash("Student ID and class are required for students", "warning")
+            return redirect(url_for("auth.register"))
+        if db.one("SELECT 1 FROM users WHERE email=%s", (email,)):
+            flash("Email already registered", "warning")
+            return redirect(url_for("auth.register"))
+        if db.one("SELECT 1 FROM users WHERE username=%s", (username,)):
+            flash("Username already taken", "warning")
+            return redirect(url_for("auth.register"))
+
+        db.insert(
+            "INSERT INTO users (name, username, email, password, student_identifier, standard, role) "
+            "VALUES (%s,%s,%s,%s,%s,%s,%s)",
+            (name, username, email, passwords.hash(form["password"]), sid, standard, role),
+        )
+        cache.invalidate("students")
+        flash("Registration successful. Please log in.", "success")
+        return redirect(url_for("auth.login"))
+    return render_template("register.html", standards=STANDARDS)
+
+
+@bp.route("/login", methods=["GET", "POST"])
+def login():
+    if "id" in session:
+        return redirect(url_for("pages.dashboard"))
+
+    if request.method == "POST":
+        uid = authenticate(request.form["login"], request.form["password"])
+        if uid is not None:
+            session.regenerate()
+            session["id"] = uid             # profile fields load via load_profile()
+            return redirect(url_for("pages.dashboard"))
+        flash("Invalid credentials", "danger")
+    return render_template("login.html")
+
+
+def authenticate(login: str, pw: str):
+    """The user id if `pw` is right (upgrading an outdated hash on the way), else None.
+
+    `login` is an e-mail address or a username; each has its own unique index.
+    """
+    login = login.strip()
+    if "@" in login:
+        user = db.one("SELECT id, password FROM users WHERE email=%s", (login.lower(),))
+    else:
+        user = db.one("SELECT id, password FROM users WHERE username=%s", (login,))
+    ok, rehash = passwords.verify(user["password"], pw) if user else (False, False)
+    if not ok:
+        return None
+    if rehash:          # plaintext row or an older PASSWORD_HASH_METHOD
+        db.execute("UPDATE users SET password=%s WHERE id=%s", (passwords.hash(pw), user["id"]))
+    return user["id"]
+
+
+@bp.route("/logout")
+def logout():
+    session.clear()
+    flash("Logged out successfully", "info")
+    return redirect(url_for("auth.login"))
+
+
+@bp.cli.command("purge-sessions")
+def purge_sessions_command():
+    """Delete expired sessions (db store; run from cron)."""
+    click.echo(f"purged {session_store.purge()} expired sessions")
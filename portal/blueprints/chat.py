@@ -0,0 +1,72 @@
+# ─────────────────────────────────────────────────────────────
+#  Counsellor chat (public form, admin inbox)
+#  ------------------------------------------------------------
+#  POSTs are rate limited per client IP (behind a proxy, set
+#  PROXY_FIX_HOPS so that is the visitor's address, not the
+#  proxy's), then queued and written in batches: a spam burst
+#  costs neither a DB write nor a session write per message. The flush thread borrows its own
+#  pooled connection (no request context there).
+# ─────────────────────────────────────────────────────────────
+
+from datetime import datetime
+
+from flask import Blueprint, current_app, redirect, render_template, request, session, url_for
+
+from ..core import app, db, instrument, login_required
+from ..listing import newest_first
+from ..ratelimit import TokenBucketLimiter
+from ..write_buffer import WriteBuffer
+
+bp = Blueprint("chat", __name__)
+
+chat_limiter = TokenBucketLimiter(app.config["CHAT_RATE_PER_MIN"] / 60, app.config["CHAT_BURST"])
+
+
+def _insert_chat_messages(rows) -> None:
+    conn = db.pool.acquire()
+    broken = True
+    try:
+        cur = conn.cursor()
+        cur.executemany("INSERT INTO counselor_messages (name, message, submitted_on) VALUES (%s,%s,%s)", rows)
+        conn.commit()
+        cur.close()
+        broken = False
+    finally:
+        db.pool.release(conn, broken=broken)
+
+
+chat_buffer = WriteBuffer(_insert_chat_messages, max_rows=app.config["CHAT_FLUSH_ROWS"],
+                          interval=app.config["CHAT_FLUSH_INTERVAL"], name="chat")
+instrument.add_gauges("chat_limiter", chat_limiter.stats)
+instrument.add_gauges("chat_buffer", chat_buffer.stats)
+
+
+@bp.route("/chat", methods=["GET", "POST"])
+def chat():
+    if request.method == "POST":
+        # anonymous sessions are never saved, so the address is the only stable key
+        wait = chat_limiter.hit(f"ip:{request.remote_addr}")
+        if wait:
+            resp = current_app.make_response((render_template("chat.html", retry_after=int(wait) + 1), 429))
+            resp.headers["Retry-After"] = str(int(wait) + 1)
+            return resp
+        # trimmed to the column sizes here: one oversized row would fail its whole batch
+        name = request.form["name"].strip()[:100]
+        message = request.form["message"][:current_app.config["CHAT_MAX_LENGTH"]]
+        # whole seconds, like the column's CURRENT_TIMESTAMP default
+        chat_buffer.add((name, message, datetime.now().replace(microsecond=0)))
+        return redirect(url_for("chat.chat", sent=1))
+    return render_template("chat.html", sent=request.args.get("sent"))
+
+
+@bp.route("/admin/chat")
+@login_required
+def admin_chat():
+    if session.get("role") != "admin":
+        return redirect(url_for("pages.dashboard"))
+    # on idx_counselor_submitted (submitted_on, id)
+    messages, next_before = newest_first(
+        db, "SELECT id, name, message, submitted_on FROM counselor_messages",
+        (), "submitted_on", current_app.config["CHAT_PAGE_SIZE"])
+    return render_template("admin_chat.html", messages=messages, next_before=next_before,
+                           pending=chat_buffer.pending())
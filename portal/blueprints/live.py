@@ -0,0 +1,74 @@
+# ─────────────────────────────────────────────────────────────
+#  Live updates (SSE)
+#  ------------------------------------------------------------
+#  • attendance saves publish only the marks that changed; open
+#    attendance pages patch their radios from the stream
+#  • announcements go to everyone who is logged in
+#  /events holds a worker thread per open page: production routes
+#  it to `flask push-server` (one asyncio loop, PUSH_BACKEND=redis).
+# ─────────────────────────────────────────────────────────────
+
+import time
+
+import click
+from flask import Blueprint, Response, abort, current_app, request, session
+
+from .. import push_server
+from ..core import app, broker, load_profile, session_store
+from ..pubsub import sse_stream
+
+bp = Blueprint("live", __name__, cli_group=None)
+
+PUSH_CHANNELS = {
+    "admin": ("attendance", "announcements"),
+    "teacher": ("attendance", "announcements"),
+    "student": ("announcements",),
+}
+
+
+def wants_json() -> bool:
+    """fetch() saves from the live pages ask for JSON instead of a redirect."""
+    return request.accept_mimetypes.best == "application/json"
+
+
+def publish_attendance(changes) -> None:
+    by_date = {}
+    for sid, day, status in changes:
+        by_date.setdefault(day.isoformat(), {})[sid] = status
+    for day, marks in by_date.items():
+        broker.publish("attendance", {"date": day, "marks": marks})
+
+
+def push_channels(cookies: dict):
+    """Channels the session behind `cookies` may subscribe to (push server)."""
+    sid = cookies.get(app.session_interface.get_cookie_name(app))
+    record = session_store.load(sid) if sid else None
+    if record is None or record[1] <= time.time() or "id" not in record[0]:
+        return None
+    with app.app_context():
+        profile = load_profile(record[0]["id"])
+    return PUSH_CHANNELS.get(profile["role"]) if profile else None
+
+
+@bp.route("/events")
+def events():
+    allowed = PUSH_CHANNELS.get(session.get("role"), ())
+    wanted = set(request.args.get("channels", "").split(",")) - {""}
+    channels = [c for c in allowed if not wanted or c in wanted]
+    if not channels:
+        abort(403)
+    sub = broker.subscribe(channels, last_id=request.headers.get("Last-Event-ID"))
+    resp = Response(sse_stream(sub, current_app.config["PUSH_HEARTBEAT"]), mimetype="text/event-stream")
+    resp.headers["Cache-Control"] = "no-cache"
+    resp.headers["X-Accel-Buffering"] = "no"
+    return resp
+
+
+@bp.cli.command("push-server")
+@click.option("--host", default="0.0.0.0")
+@click.option("--port", default=5001, type=int)
+def push_server_command(host, port):
+    """Serve /events from one asyncio loop (needs PUSH_BACKEND=redis)."""
+    if app.config["PUSH_BACKEND"] != "redis":
+        raise click.UsageError("the push server only sees app events with PUSH_BACKEND=redis")
+    push_server.run(broker, push_channels, host, port, app.config["PUSH_HEARTBEAT"])
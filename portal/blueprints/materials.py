@@ -0,0 +1,357 @@
+# ─────────────────────────────────────────────────────────────
+#  Study materials
+#  ------------------------------------------------------------
+#  • /materials lists everything (cached), /materials/<standard>
+#    one class in newest-first keyset pages
+#  • uploads (form or resumable chunks) land in the shared blob
+#    store; the row, its search entry and its processing job are
+#    committed together
+#  • files are served by delivery.py (X-Sendfile / X-Accel when
+#    configured); `flask run-worker` makes thumbnails, page
+#    counts and search text in the background
+# ─────────────────────────────────────────────────────────────
+
+import os
+from functools import partial
+
+import click
+from flask import (
+    Blueprint, abort, current_app, flash, jsonify, redirect, render_template, request, session, url_for
+)
+from werkzeug.utils import secure_filename
+
+from ..core import (
+    JOB_HANDLERS, STANDARDS, allowed, assignment_blobs, backend, cache, cached_query, chunked_uploads,
+    db, login_required, material_blobs, remove_file, staff,
+)
+from ..delivery import send_stored_file
+from ..jobs import enqueue
+from ..listing import newest_first, standard_summary
+from ..processing import extract
+from ..search import clear_index, index_document, remove_document
+from ..uploads import stage_upload
+
+bp = Blueprint("materials", __name__, cli_group=None)
+
+
+def upload_folder() -> str:
+    return current_app.config["UPLOAD_FOLDER"]
+
+
+# ───────── Listings ─────────
+def material_list():
+    return cached_query(
+        "materials",
+        """SELECT m.*, u.name AS uploader, mm.page_count, mm.thumbnail
+           FROM materials m
+           LEFT JOIN users u ON m.uploaded_by = u.id
+           LEFT JOIN material_meta mm ON mm.material_id = m.id
+           ORDER BY m.uploaded_at DESC"""
+    )
+
+
+def material_summary() -> dict:
+    return standard_summary(db, cache, "materials", "uploaded_at")
+
+
+@bp.route("/materials")
+@login_required
+def materials():
+    return render_template("materials.html", mats=material_list(), role=session.get("role"),
+                           standards=STANDARDS, summary=material_summary())
+
+
+@bp.route("/materials/<int:standard>")
+@login_required
+def by_standard(standard):
+    # on idx_materials_standard_uploaded (standard, uploaded_at)
+    mats, next_before = newest_first(
+        db, "SELECT id, title, description, original_name, uploaded_at FROM materials WHERE standard=%s",
+        (standard,), "uploaded_at", current_app.config["LIST_PAGE_SIZE"])
+    return render_template("materials_standard.html", materials=mats, standard=standard,
+                           next_before=next_before)
+
+
+# ───────── Upload ─────────
+def _back_to(standard):
+    return redirect(url_for("materials.by_standard", standard=standard) if standard
+                    else url_for("materials.materials"))
+
+
+@bp.route("/materials/upload", methods=["GET", "POST"])
+@login_required
+def upload_material():
+    if not staff():
+        flash("Unauthorized", "danger")
+        return redirect(url_for("materials.materials"))
+
+    if request.method == "POST":
+        standard = request.form.get("standard", type=int)
+        title = request.form["title"].strip()
+        desc = request.form.get("description", "").strip()
+        file = request.files.get("file")
+        if not file or not allowed(file.filename) or (standard and standard not in STANDARDS):
+            flash("Invalid file", "warning")
+            return _back_to(standard) if standard else redirect(request.url)
+
+        staged = stage_upload(file)
+        create_material(title, desc, file.filename, staged, staged.sha256.hexdigest(), staged.size, standard)
+        flash("Material uploaded", "success")
+        return _back_to(standard)
+
+    return render_template("upload_material.html", standards=STANDARDS)
+
+
+def create_material(title: str, desc: str, original: str, source, digest: str, size: int,
+                    standard: int = None) -> None:
+    """Store the upload as a shared blob and add its materials row (one txn)."""
+    original = secure_filename(original)
+    with db.transaction() as cur:
+        fname = material_blobs.put(cur, source, digest, size, os.path.splitext(original)[1])
+        cur.execute(
+            "INSERT INTO materials (title, description, filename, original_name, standard, uploaded_by) "
+            "VALUES (%s,%s,%s,%s,%s,%s)",
+            (title, desc, fname, original, standard, session["id"]),
+        )
+        mid = cur.lastrowid
+        index_document(cur, "material", mid, title, desc)
+        # committed together with the row; `flask run-worker` picks it up
+        enqueue(cur, "material.process", {"material_id": mid})
+    cache.invalidate("materials")
+
+
+# ───────── Resumable (chunked) uploads ─────────
+#  POST   /materials/upload/chunks              {filename, size} → {upload_id}
+#  GET    /materials/upload/chunks/<id>         → {offset}   (resume point)
+#  PUT    /materials/upload/chunks/<id>?offset= raw bytes → {offset}
+#  POST   /materials/upload/chunks/<id>/complete  form title/description/standard
+#  DELETE /materials/upload/chunks/<id>         cancel
+
+def _own_chunked_upload(upload_id: str) -> dict:
+    if not staff():
+        abort(403)
+    try:
+        info = chunked_uploads.info(upload_id)
+    except KeyError:
+        abort(404)
+    if info["owner"] != session["id"]:
+        abort(403)
+    return info
+
+
+@bp.route("/materials/upload/chunks", methods=["POST"])
+def start_chunked_upload():
+    if not staff():
+        abort(403)
+    body = request.get_json(silent=True) or {}
+    filename = str(body.get("filename", ""))
+    try:
+        size = int(body.get("size", -1))
+    except (TypeError, ValueError):
+        size = -1
+    if not allowed(filename) or size < 0:
+        return jsonify(error="invalid file"), 400
+    upload_id = chunked_uploads.start(filename, size, session["id"])
+    return jsonify(upload_id=upload_id, offset=0), 201
+
+
+@bp.route("/materials/upload/chunks/<upload_id>", methods=["GET"])
+def chunked_upload_status(upload_id):
+    info = _own_chunked_upload(upload_id)
+    return jsonify(offset=info["offset"], size=info["size"])
+
+
+@bp.route("/materials/upload/chunks/<upload_id>", methods=["PUT"])
+def put_chunk(upload_id):
+    _own_chunked_upload(upload_id)
+    try:
+        offset = chunked_uploads.append(upload_id, request.args.get("offset", type=int), request.stream)
+    except ValueError as exc:
+        return jsonify(error="offset mismatch", offset=exc.args[0]), 409
+    return jsonify(offset=offset)
+
+
+@bp.route("/materials/upload/chunks/<upload_id>", methods=["DELETE"])
+def cancel_chunked_upload(upload_id):
+    _own_chunked_upload(upload_id)
+    chunked_uploads.abort(upload_id)
+    return "", 204
+
+
+@bp.route("/materials/upload/chunks/<upload_id>/complete", methods=["POST"])
+def complete_chunked_upload(upload_id):
+    info = _own_chunked_upload(upload_id)
+    standard = request.form.get("standard", type=int)
+    if standard and standard not in STANDARDS:
+        return jsonify(error="invalid standard"), 400
+    try:
+        part, digest, size = chunked_uploads.complete(upload_id)
+    except ValueError as exc:
+        return jsonify(error="upload incomplete", offset=exc.args[0]), 409
+    create_material(
+        request.form.get("title", "").strip(), request.form.get("description", "").strip(),
+        info["filename"], part, digest, size, standard,
+    )
+    return jsonify(sha256=digest), 201
+
+
+# ───────── View / download / delete ─────────
+@bp.route("/materials/<int:mid>/view")
+def view_material(mid):
+    return _send_material(mid, as_attachment=False)
+
+
+@bp.route("/materials/<int:mid>/download")
+def download_material(mid):
+    return _send_material(mid, as_attachment=True)
+
+
+def _send_material(mid: int, as_attachment: bool):
+    # a primary-key read: not cached, so downloads of many distinct files
+    # cannot push the hot list and summary entries out of the LRU
+    mat = db.one("SELECT filename, original_name FROM materials WHERE id=%s", (mid,))
+    if not mat:
+        abort(404)
+    return send_stored_file(
+        upload_folder(), mat.filename, as_attachment=as_attachment,
+        download_name=mat.original_name or os.path.basename(mat.filename),
+    )
+
+
+@bp.route("/materials/<int:mid>/delete", methods=["POST"])
+def delete_material(mid):
+    if not staff():
+        abort(403)
+    with db.transaction() as cur:
+        cur.execute(
+            "SELECT m.filename, mm.thumbnail FROM materials m "
+            "LEFT JOIN material_meta mm ON mm.material_id = m.id WHERE m.id=%s FOR UPDATE",
+            (mid,),
+        )
+        mat = cur.fetchone()
+        if mat:
+            # shared blob → unlinked only with its last reference, after the commit
+            if material_blobs.release(cur, mat[0]) is None:
+                db.after_commit(partial(remove_file, upload_folder(), mat[0]))     # pre-dedup upload
+            if mat[1]:
+                db.after_commit(partial(remove_file, upload_folder(), mat[1]))     # per-material thumbnail
+            cur.execute("DELETE FROM materials WHERE id=%s", (mid,))
+            remove_document(cur, "material", mid)
+    if mat:
+        cache.invalidate("materials")
+        flash("Deleted", "success")
+    return _back_to(request.form.get("standard", type=int))
+
+
+@bp.route("/materials/<int:mid>/thumb")
+def material_thumb(mid):
+    meta = db.one("SELECT thumbnail FROM material_meta WHERE material_id=%s", (mid,))     # uncached, as above
+    if not meta or not meta.thumbnail:
+        abort(404)
+    return send_stored_file(upload_folder(), meta.thumbnail, as_attachment=False,
+                            download_name=os.path.basename(meta.thumbnail))
+
+
+# ───────── Material processing (background) ─────────
+#  prepare / store run in the worker with a DB connection,
+#  processing.extract runs in its process pool.
+
+def _prepare_material(conn, payload):
+    cur = conn.cursor()
+    cur.execute("SELECT filename FROM materials WHERE id=%s", (payload["material_id"],))
+    row = cur.fetchone()
+    cur.close()
+    conn.rollback()
+    if row is None:
+        raise LookupError(f"material {payload['material_id']} is gone")
+    return (os.path.abspath(os.path.join(upload_folder(), row[0])),)
+
+
+def _store_material_meta(conn, payload, result):
+    mid = payload["material_id"]
+    thumb = None
+    if result["thumbnail"]:
+        thumb = f"thumbs/{mid}{result['thumb_ext']}"
+        os.makedirs(os.path.join(upload_folder(), "thumbs"), exist_ok=True)
+        tmp = os.path.join(upload_folder(), thumb + ".tmp")
+        with open(tmp, "wb") as fh:
+            fh.write(result["thumbnail"])
+        os.replace(tmp, os.path.join(upload_folder(), thumb))
+    cur = conn.cursor()
+    cur.execute(
+        backend.upsert(
+            "material_meta", ("material_id", "page_count", "thumbnail", "text"), ("material_id",),
+            {"page_count": "{new}", "thumbnail": "{new}", "text": "{new}",
+             "processed_at": "CURRENT_TIMESTAMP"},
+        ),
+        (mid, result["page_count"], thumb, result["text"]),
+    )
+    cur.execute("SELECT title, description FROM materials WHERE id=%s", (mid,))
+    row = cur.fetchone()
+    if row:
+        index_document(cur, "material", mid, row[0], f"{row[1] or ''}\n{result['text']}")
+    conn.commit()
+    cur.close()
+    cache.invalidate("materials")      # reaches web workers with the redis backend; TTL otherwise
+
+
+JOB_HANDLERS["material.process"] = (_prepare_material, extract, _store_material_meta)
+
+
+@bp.cli.command("process-materials")
+def process_materials_command():
+    """Queue processing for materials that have no metadata yet."""
+    with db.transaction() as cur:
+        cur.execute(
+            "SELECT m.id FROM materials m LEFT JOIN material_meta mm ON mm.material_id = m.id "
+            "WHERE mm.material_id IS NULL"
+        )
+        ids = [r[0] for r in cur.fetchall()]
+        for mid in ids:
+            enqueue(cur, "material.process", {"material_id": mid})
+    click.echo(f"{len(ids)} material(s) queued.")
+
+
+@bp.cli.command("reindex-search")
+def reindex_search_command():
+    """Rebuild search_docs from materials (+ extracted text) and assignments."""
+    with db.transaction() as cur:
+        clear_index(cur)
+        cur.execute(
+            "SELECT m.id, m.title, m.description, mm.text FROM materials m "
+            "LEFT JOIN material_meta mm ON mm.material_id = m.id"
+        )
+        mats = cur.fetchall()
+        for mid, title, desc, text in mats:
+            index_document(cur, "material", mid, title, "\n".join(filter(None, (desc, text))))
+        cur.execute("SELECT id, title FROM assignments")
+        tasks = cur.fetchall()
+        for aid, title in tasks:
+            index_document(cur, "assignment", aid, title)
+    click.echo(f"{len(mats)} material(s) and {len(tasks)} assignment(s) indexed.")
+
+
+@bp.cli.command("dedupe-uploads")
+def dedupe_uploads_command():
+    """Move pre-dedup material / assignment files into the blob stores."""
+    conn = db.connection()
+    cur = conn.cursor()
+    moved = 0
+    for table, blobs in (("materials", material_blobs), ("assignments", assignment_blobs)):
+        cur.execute(f"SELECT id, filename FROM {table} WHERE filename NOT LIKE 'blobs/%'")
+        for row_id, fname in cur.fetchall():
+            if not os.path.exists(os.path.join(blobs.root, fname)):
+                continue
+            rel = blobs.adopt(cur, fname)
+            if table == "materials":
+                cur.execute(
+                    "UPDATE materials SET filename=%s, original_name=COALESCE(original_name, %s) WHERE id=%s",
+                    (rel, fname.split("_", 1)[-1], row_id),
+                )
+            else:
+                cur.execute("UPDATE assignments SET filename=%s WHERE id=%s", (rel, row_id))
+            conn.commit()
+            moved += 1
+    cur.close()
+    cache.invalidate("materials")
+    click.echo(f"{moved} file(s) moved into the blob stores.")
@@ -0,0 +1,212 @@
+# ─────────────────────────────────────────────────────────────
+#  Site pages: dashboard, about, FAQs, gallery
+#  ------------------------------------------------------------
+#  All of them depend only on the viewer's role, so they go
+#  through the page cache; editing FAQs or the gallery drops
+#  the cached copies.
+#  Gallery images get resized WebP / JPEG variants from
+#  `flask run-worker` (images.py); pages offer them through
+#  srcset and every fingerprinted file is cached for a year.
+# ─────────────────────────────────────────────────────────────
+
+import os
+
+import click
+from flask import (
+    Blueprint, abort, current_app, flash, redirect, render_template, request, send_from_directory, session,
+    url_for
+)
+from werkzeug.utils import secure_filename
+
+from ..core import IMAGE_EXT, JOB_HANDLERS, allowed, db, gallery_blobs, login_required, page_cache, staff
+from ..db import Row
+from ..images import variants
+from ..jobs import enqueue
+from ..uploads import stage_upload
+
+bp = Blueprint("pages", __name__, cli_group=None)
+
+
+@bp.route("/dashboard")
+@login_required
+@page_cache.cached
+def dashboard():
+    return render_template("dashboard.html", role=session["role"])
+
+
+@bp.route("/about")
+@page_cache.cached
+def about():
+    return render_template("about.html")
+
+
+# ───────── FAQs ─────────
+def all_faqs():
+    return db.query("SELECT id, question, answer FROM faqs ORDER BY id")
+
+
+@bp.route("/faq")
+@page_cache.cached
+def faq():
+    return render_template("faq.html", faqs=all_faqs())
+
+
+@bp.route("/manage_faqs", methods=["GET", "POST"])
+@login_required
+def manage_faqs():
+    if session.get("role") != "admin":
+        return redirect(url_for("pages.dashboard"))
+    if request.method == "POST":
+        question, answer = request.form["question"].strip(), request.form["answer"].strip()
+        if question and answer:
+            db.insert("INSERT INTO faqs (question, answer) VALUES (%s,%s)", (question, answer))
+            page_cache.invalidate()
+            flash("FAQ added", "success")
+        return redirect(url_for("pages.manage_faqs"))
+    return render_template("manage_faqs.html", faqs=all_faqs())
+
+
+@bp.route("/delete_faq/<int:id>", methods=["POST"])
+@login_required
+def delete_faq(id):
+    if session.get("role") != "admin":
+        return redirect(url_for("pages.dashboard"))
+    db.execute("DELETE FROM faqs WHERE id=%s", (id,))
+    page_cache.invalidate()
+    flash("FAQ deleted", "info")
+    return redirect(url_for("pages.manage_faqs"))
+
+
+# ───────── Gallery ─────────
+def gallery_folder() -> str:
+    return current_app.config["GALLERY_FOLDER"]
+
+
+def _gallery_url(rel: str) -> str:
+    # blob and variant names are content hashes: safe to cache for good
+    if rel.startswith(("blobs/", "variants/")):
+        return url_for("pages.gallery_file", rel=rel)
+    return url_for("static", filename=f"uploads/gallery/{rel}")     # pre-dedup upload
+
+
+def gallery_images() -> list:
+    """Newest first, each with `webp` / `jpeg` srcset strings once its variants exist."""
+    rows = db.query(
+        """SELECT g.id, g.image_path, g.caption, v.format, v.path, v.width, v.height
+           FROM gallery g LEFT JOIN gallery_variants v ON v.gallery_id = g.id
+           ORDER BY g.uploaded_on DESC, g.id DESC, v.width"""
+    )
+    images, by_id = [], {}
+    for row in rows:
+        img = by_id.get(row.id)
+        if img is None:
+            img = by_id[row.id] = Row(id=row.id, caption=row.caption, src=_gallery_url(row.image_path),
+                                      webp=[], jpeg=[], width=None, height=None)
+            images.append(img)
+        if row.path:
+            img[row.format].append(f"{_gallery_url(row.path)} {row.width}w")
+            if row.format == "jpeg":            # largest JPEG: fallback src and aspect ratio
+                img.update(src=_gallery_url(row.path), width=row.width, height=row.height)
+    for img in images:
+        img.update(webp=", ".join(img.webp), jpeg=", ".join(img.jpeg))
+    return images
+
+
+@bp.route("/gallery")
+@page_cache.cached
+def gallery():
+    return render_template("gallery.html", images=gallery_images())
+
+
+@bp.route("/gallery/files/<path:rel>")
+def gallery_file(rel):
+    """Originals and variants under fingerprinted names: cached for a year, never revalidated."""
+    if not rel.startswith(("blobs/", "variants/")):
+        abort(404)
+    resp = send_from_directory(gallery_folder(), rel, max_age=current_app.config["GALLERY_MAX_AGE"])
+    resp.cache_control.public = True
+    resp.cache_control.immutable = True
+    return resp
+
+
+@bp.route("/manage_gallery", methods=["GET", "POST"])
+@login_required
+def manage_gallery():
+    if not staff():
+        return redirect(url_for("pages.dashboard"))
+    if request.method == "POST":
+        file = request.files.get("image")
+        if not file or not allowed(file.filename, IMAGE_EXT):
+            flash("Pick a jpg, png, gif or webp image", "warning")
+            return redirect(url_for("pages.manage_gallery"))
+        staged = stage_upload(file)
+        ext = os.path.splitext(secure_filename(file.filename))[1]
+        with db.transaction() as cur:
+            path = gallery_blobs.put(cur, staged, staged.sha256.hexdigest(), staged.size, ext)
+            cur.execute("INSERT INTO gallery (image_path, caption) VALUES (%s,%s)",
+                        (path, request.form.get("caption", "").strip()[:255]))
+            # committed together with the row; `flask run-worker` makes the variants
+            enqueue(cur, "gallery.variants", {"gallery_id": cur.lastrowid})
+        page_cache.invalidate()
+        flash("Image uploaded", "success")
+        return redirect(url_for("pages.gallery"))
+    return render_template("manage_gallery.html")
+
+
+# ───────── Gallery variants (background) ─────────
+#  prepare / store run in the worker with a DB connection,
+#  images.variants runs in its process pool.
+
+def _prepare_variants(conn, payload):
+    cur = conn.cursor()
+    cur.execute("SELECT image_path FROM gallery WHERE id=%s", (payload["gallery_id"],))
+    row = cur.fetchone()
+    cur.close()
+    conn.rollback()
+    if row is None:
+        raise LookupError(f"gallery image {payload['gallery_id']} is gone")
+    return (os.path.abspath(os.path.join(gallery_folder(), row[0])),)
+
+
+def _store_variants(conn, payload, result):
+    gid = payload["gallery_id"]
+    for item in result:
+        dest = os.path.join(gallery_folder(), item["path"])
+        if os.path.exists(dest):
+            continue                          # same bytes, same name: already on disk
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        with open(dest + ".tmp", "wb") as fh:
+            fh.write(item["data"])
+        os.replace(dest + ".tmp", dest)
+    cur = conn.cursor()
+    cur.execute("DELETE FROM gallery_variants WHERE gallery_id=%s", (gid,))
+    if result:
+        cur.executemany(
+            "INSERT INTO gallery_variants (gallery_id, variant, format, path, width, height) "
+            "VALUES (%s,%s,%s,%s,%s,%s)",
+            [(gid, v["variant"], v["format"], v["path"], v["width"], v["height"]) for v in result],
+        )
+    conn.commit()
+    cur.close()
+    page_cache.invalidate()      # reaches web workers with the redis backend; TTL otherwise
+
+
+JOB_HANDLERS["gallery.variants"] = (_prepare_variants, variants, _store_variants)
+
+
+@bp.cli.command("process-gallery")
+@click.option("--all", "everything", is_flag=True, help="Redo images that already have variants.")
+def process_gallery_command(everything):
+    """Queue variant generation for gallery images (backfill)."""
+    with db.transaction() as cur:
+        if everything:
+            cur.execute("SELECT id FROM gallery")
+        else:
+            cur.execute(
+                "SELECT g.id FROM gallery g WHERE NOT EXISTS "
+                "(SELECT 1 FROM gallery_variants v WHERE v.gallery_id = g.id)"
+            )
+        ids = [r[0] for r in cur.fetchall()]
+        for gid in ids:
+            enqueue(cur, "gallery.variants", {"gallery_id": gid})
+    click.echo(f"{len(ids)} gallery image(s) queued.")
@@ -0,0 +1,37 @@
+# ─────────────────────────────────────────────────────────────
+#  Search over materials and assignments
+#  ------------------------------------------------------------
+#  One ranked query on search_docs (FULLTEXT / FTS5, search.py),
+#  then the assignment files and standards for the links, one
+#  IN (…) query for the whole page.
+# ─────────────────────────────────────────────────────────────
+
+from flask import Blueprint, current_app, render_template, request
+
+from ..core import db, login_required
+from ..search import search
+
+bp = Blueprint("search", __name__)
+
+
+@bp.route("/search")
+@login_required
+def search_documents():
+    q = request.args.get("q", "").strip()
+    page = request.args.get("page", 1, type=int)
+    cur = db.connection().cursor()
+    try:
+        hits, has_more = search(cur, q, doc_types=["material", "assignment"], page=page,
+                                per_page=current_app.config["SEARCH_PAGE_SIZE"])
+    finally:
+        cur.close()
+    ids = [h["doc_id"] for h in hits if h["doc_type"] == "assignment"]
+    if ids:
+        found = {r.id: r for r in db.query(
+            f"SELECT id, filename, standard FROM assignments WHERE id IN ({', '.join(['%s'] * len(ids))})",
+            tuple(ids),
+        )}
+        for h in hits:
+            if h["doc_type"] == "assignment" and h["doc_id"] in found:
+                h["filename"], h["standard"] = found[h["doc_id"]].filename, found[h["doc_id"]].standard
+    return render_template("search.html", q=q, hits=hits, page=page, has_more=has_more)
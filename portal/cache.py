@@ -0,0 +1,144 @@
+# ─────────────────────────────────────────────────────────────
+#  Read cache for hot, rarely-changing queries
+#  ------------------------------------------------------------
+#  Entries live under a *tag* ("materials", "students", …) and
+#  are keyed by (sql, params). Write routes drop a whole tag with
+#  `invalidate(tag)`; TTL bounds staleness for anything missed.
+#
+#  • LocalCache  – in-process, TTL + LRU eviction (one worker)
+#  • RedisCache  – shared by all workers; needs the `redis` package
+#                  and any Redis-compatible server (Redis, Valkey…)
+# ─────────────────────────────────────────────────────────────
+
+import hashlib
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+MISS = object()
+
+
+def _digest(key) -> str:
+    return hashlib.sha1(repr(key).encode()).hexdigest()
+
+
+class _Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = dict(hits=0, misses=0, sets=0, evictions=0, invalidations=0)
+
+    def bump(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counts[name] += n
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            data = dict(self.counts)
+        lookups = data["hits"] + data["misses"]
+        data["hit_ratio"] = data["hits"] / lookups if lookups else 0.0
+        return data
+
+
+class LocalCache:
+    def __init__(self, maxsize: int = 256, ttl: float = 60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()       # (tag, digest) → (expires_at, value)
+        self._lock = threading.Lock()
+        self._stats = _Stats()
+
+    def get(self, tag: str, key):
+        k = (tag, _digest(key))
+        with self._lock:
+            entry = self._data.get(k)
+            if entry is not None and entry[0] > time.monotonic():
+                self._data.move_to_end(k)
+                self._stats.bump("hits")
+                return entry[1]
+            if entry is not None:
+                del self._data[k]
+        self._stats.bump("misses")
+        return MISS
+
+    def set(self, tag: str, key, value, ttl: float = None) -> None:
+        k = (tag, _digest(key))
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        evicted = 0
+        with self._lock:
+            self._data[k] = (expires, value)
+            self._data.move_to_end(k)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                evicted += 1
+        self._stats.bump("sets")
+        if evicted:
+            self._stats.bump("evictions", evicted)
+
+    def invalidate(self, tag: str) -> None:
+        with self._lock:
+            for k in [k for k in self._data if k[0] == tag]:
+                del self._data[k]
+        self._stats.bump("invalidations")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        data = self._stats.snapshot()
+        with self._lock:
+            data.update(backend="local", size=len(self._data), maxsize=self.maxsize, ttl=self.ttl)
+        return data
+
+
+class RedisCache:
+    """Tag invalidation bumps a per-tag generation number, so old entries
+    simply stop being addressed and expire by TTL (LRU is left to the
+    server's `maxmemory-policy allkeys-lru`)."""
+
+    def __init__(self, url: str, ttl: float = 60, prefix: str = "portal"):
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("CACHE_BACKEND=redis needs the 'redis' package") from exc
+        self._r = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+        self._stats = _Stats()
+
+    def _key(self, tag: str, key) -> str:
+        gen = int(self._r.get(f"{self.prefix}:gen:{tag}") or 0)
+        return f"{self.prefix}:{tag}:{gen}:{_digest(key)}"
+
+    def get(self, tag: str, key):
+        raw = self._r.get(self._key(tag, key))
+        if raw is None:
+            self._stats.bump("misses")
+            return MISS
+        self._stats.bump("hits")
+        return pickle.loads(raw)
+
+    def set(self, tag: str, key, value, ttl: float = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        self._r.set(self._key(tag, key), pickle.dumps(value), ex=max(1, int(ttl)))
+        self._stats.bump("sets")
+
+    def invalidate(self, tag: str) -> None:
+        self._r.incr(f"{self.prefix}:gen:{tag}")
+        self._stats.bump("invalidations")
+
+    def clear(self) -> None:
+        for k in self._r.scan_iter(f"{self.prefix}:*"):
+            self._r.delete(k)
+
+    def stats(self) -> dict:
+        data = self._stats.snapshot()     # this worker's counters
+        data.update(backend="redis", ttl=self.ttl)
+        return data
+
+
+def make_cache(backend: str = "local", url: str = None, ttl: float = 60, maxsize: int = 256):
+    if backend == "redis":
+        return RedisCache(url or "redis://127.0.0.1:6379/0", ttl=ttl)
+    return LocalCache(maxsize=maxsize, ttl=ttl)
@@ -0,0 +1,258 @@
+# ─────────────────────────────────────────────────────────────
+#  The app object and the services every blueprint shares
+#  ------------------------------------------------------------
+#  Built once per process, on import: settings from the
+#  environment, the data-access layer (one pool for requests,
+#  sessions and workers), read / profile / page caches, sessions,
+#  password hashing, the push broker and instrumentation.
+#  Blueprints import what they need from here; app.py registers
+#  them. Nothing here touches the schema (`flask migrate` does).
+# ─────────────────────────────────────────────────────────────
+
+import os
+from functools import wraps
+
+from flask import Flask, flash, redirect, session, url_for
+from werkzeug.middleware.proxy_fix import ProxyFix
+
+from .blobstore import BlobStore
+from .cache import make_cache, MISS
+from .db import Database
+from .db_backend import make_backend
+from .instrumentation import Instrumentation
+from .page_cache import PageCache
+from .passwords import PasswordHasher
+from .pubsub import make_broker
+from .sessions import ServerSessionInterface, RedisSessionStore, DBSessionStore
+from .uploads import StreamingRequest, ChunkedUploads
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# ───────── Flask App Config ─────────
+app = Flask("portal")
+app.secret_key = os.environ.get("SECRET_KEY", "secret123")  # TODO: set SECRET_KEY in production
+app.request_class = StreamingRequest   # uploads stream straight to UPLOAD_STAGING
+
+ALLOWED_EXT = {"pdf", "docx", "pptx", "xlsx", "csv"}
+IMAGE_EXT = {"jpg", "jpeg", "png", "gif", "webp"}
+STANDARDS = range(1, 13)
+
+# Every upload folder must share a filesystem with UPLOAD_STAGING (atomic rename).
+# Materials are served by the app (delivery.py); assignments and gallery images
+# are plain static files.
+app.config.update(
+    UPLOAD_FOLDER=os.environ.get("UPLOAD_FOLDER", os.path.join(HERE, "uploads")),
+    ASSIGNMENT_FOLDER=os.path.join(app.static_folder, "uploads", "assignments"),
+    GALLERY_FOLDER=os.path.join(app.static_folder, "uploads", "gallery"),
+    MAX_UPLOAD_BYTES=int(os.environ.get("MAX_UPLOAD_BYTES", 200 * 1024 * 1024)),
+    # resumable uploads untouched this long (seconds) are deleted
+    CHUNKED_UPLOAD_TTL=int(os.environ.get("CHUNKED_UPLOAD_TTL", 24 * 3600)),
+    # python | sendfile (X-Sendfile) | accel (nginx X-Accel-Redirect to an internal location)
+    FILE_DELIVERY=os.environ.get("FILE_DELIVERY", "python"),
+    ACCEL_REDIRECT_PREFIX=os.environ.get("ACCEL_REDIRECT_PREFIX", "/_protected/uploads"),
+    FILE_MAX_AGE=int(os.environ.get("FILE_MAX_AGE", 3600)),
+    # gallery originals and variants have fingerprinted names, so browsers keep them
+    GALLERY_MAX_AGE=int(os.environ.get("GALLERY_MAX_AGE", 365 * 24 * 3600)),
+)
+app.config["UPLOAD_STAGING"] = os.path.join(app.config["UPLOAD_FOLDER"], ".incoming")
+app.config["USE_X_SENDFILE"] = app.config["FILE_DELIVERY"] == "sendfile"
+for folder in ("UPLOAD_FOLDER", "ASSIGNMENT_FOLDER", "GALLERY_FOLDER"):
+    os.makedirs(app.config[folder], exist_ok=True)
+
+# ───────── Settings ─────────
+app.config.update(
+    # mysql (server, DB_* below) | sqlite (one local file, no server process)
+    DB_BACKEND=os.environ.get("DB_BACKEND", "mysql"),
+    DB_HOST=os.environ.get("DB_HOST", "127.0.0.1"),
+    DB_USER=os.environ.get("DB_USER", "root"),
+    DB_PASSWORD=os.environ.get("DB_PASSWORD", "root"),
+    DB_NAME=os.environ.get("DB_NAME", "student_portal"),
+    SQLITE_PATH=os.environ.get("SQLITE_PATH", os.path.join(HERE, "student_portal.db")),
+    SQLITE_BUSY_TIMEOUT=float(os.environ.get("SQLITE_BUSY_TIMEOUT", 10)),
+    SQLITE_STATEMENT_CACHE=int(os.environ.get("SQLITE_STATEMENT_CACHE", 256)),
+    DB_PREPARED_STATEMENTS=int(os.environ.get("DB_PREPARED_STATEMENTS", 256)),   # per connection; 0: off
+    DB_POOL_SIZE=int(os.environ.get("DB_POOL_SIZE", 5)),
+    DB_POOL_OVERFLOW=int(os.environ.get("DB_POOL_OVERFLOW", 10)),
+    DB_POOL_TIMEOUT=float(os.environ.get("DB_POOL_TIMEOUT", 30)),
+    DB_POOL_RECYCLE=int(os.environ.get("DB_POOL_RECYCLE", 3600)),
+    ATTENDANCE_BATCH_SIZE=int(os.environ.get("ATTENDANCE_BATCH_SIZE", 500)),
+    HISTORY_PAGE_SIZE=int(os.environ.get("HISTORY_PAGE_SIZE", 50)),
+    SHEET_MAX_DAYS=int(os.environ.get("SHEET_MAX_DAYS", 366)),
+    SEARCH_PAGE_SIZE=int(os.environ.get("SEARCH_PAGE_SIZE", 20)),
+    LIST_PAGE_SIZE=int(os.environ.get("LIST_PAGE_SIZE", 24)),
+    ANNOUNCEMENTS_SHOWN=int(os.environ.get("ANNOUNCEMENTS_SHOWN", 50)),
+    SLOW_QUERY_MS=float(os.environ.get("SLOW_QUERY_MS", 200)),
+    METRICS_TOKEN=os.environ.get("METRICS_TOKEN"),   # /metrics needs "Bearer <token>"; unset → 403
+    CACHE_BACKEND=os.environ.get("CACHE_BACKEND", "local"),   # local | redis
+    CACHE_URL=os.environ.get("CACHE_URL"),
+    CACHE_TTL=float(os.environ.get("CACHE_TTL", 60)),
+    CACHE_MAXSIZE=int(os.environ.get("CACHE_MAXSIZE", 256)),
+    PAGE_MAX_AGE=int(os.environ.get("PAGE_MAX_AGE", 300)),   # browser cache, anonymous pages
+    TEMPLATE_WARMUP=os.environ.get("TEMPLATE_WARMUP", "1") == "1",
+    TEMPLATE_BYTECODE_DIR=os.environ.get("TEMPLATE_BYTECODE_DIR"),   # compiled templates survive restarts
+    SESSION_BACKEND=os.environ.get("SESSION_BACKEND", "db"),   # db | redis
+    SESSION_REDIS_URL=os.environ.get("SESSION_REDIS_URL", "redis://127.0.0.1:6379/0"),
+    SESSION_LIFETIME=int(os.environ.get("SESSION_LIFETIME", 8 * 3600)),   # idle seconds
+    SESSION_REFRESH=int(os.environ.get("SESSION_REFRESH", 60)),
+    PROFILE_CACHE_TTL=float(os.environ.get("PROFILE_CACHE_TTL", 300)),
+    PROFILE_CACHE_SIZE=int(os.environ.get("PROFILE_CACHE_SIZE", 4096)),
+    PASSWORD_HASH_METHOD=os.environ.get("PASSWORD_HASH_METHOD", "scrypt:32768:8:1"),
+    PASSWORD_HASH_CONCURRENCY=int(os.environ.get("PASSWORD_HASH_CONCURRENCY", 0)),   # 0 → CPU count
+    # accounts carried over from the project app may still hold plaintext passwords
+    PASSWORD_ALLOW_PLAINTEXT=os.environ.get("PASSWORD_ALLOW_PLAINTEXT", "0") == "1",
+    PUSH_BACKEND=os.environ.get("PUSH_BACKEND", "local"),   # local | redis (several workers)
+    PUSH_URL=os.environ.get("PUSH_URL"),
+    PUSH_HEARTBEAT=float(os.environ.get("PUSH_HEARTBEAT", 15)),
+    # counsellor chat: per-IP rate limit and batched writes
+    CHAT_RATE_PER_MIN=float(os.environ.get("CHAT_RATE_PER_MIN", 6)),
+    CHAT_BURST=int(os.environ.get("CHAT_BURST", 3)),
+    CHAT_FLUSH_ROWS=int(os.environ.get("CHAT_FLUSH_ROWS", 100)),
+    CHAT_FLUSH_INTERVAL=float(os.environ.get("CHAT_FLUSH_INTERVAL", 2)),
+    CHAT_PAGE_SIZE=int(os.environ.get("CHAT_PAGE_SIZE", 50)),
+    CHAT_MAX_LENGTH=int(os.environ.get("CHAT_MAX_LENGTH", 5000)),
+    # proxies in front of the app (nginx: 1) whose X-Forwarded-For / -Proto are trusted;
+    # 0 when clients connect directly, or they could pick their own address
+    PROXY_FIX_HOPS=int(os.environ.get("PROXY_FIX_HOPS", 0)),
+)
+
+# ───────── Proxy ─────────
+# request.remote_addr / scheme as the client sent them, not as the proxy did
+if app.config["PROXY_FIX_HOPS"]:
+    hops = app.config["PROXY_FIX_HOPS"]
+    app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops)
+
+# ───────── Instrumentation ─────────
+# per-request DB/template timing, /metrics, slow-query log
+instrument = Instrumentation(app)
+
+# ───────── Database ─────────
+if app.config["DB_BACKEND"] == "sqlite":
+    backend = make_backend(
+        "sqlite",
+        path=app.config["SQLITE_PATH"],
+        busy_timeout=app.config["SQLITE_BUSY_TIMEOUT"],
+        statement_cache=app.config["SQLITE_STATEMENT_CACHE"],
+    )
+else:
+    backend = make_backend(
+        "mysql", host=app.config["DB_HOST"], user=app.config["DB_USER"],
+        password=app.config["DB_PASSWORD"], database=app.config["DB_NAME"],
+    )
+
+db = Database(
+    backend,
+    wrap=instrument.wrap_connection,
+    size=app.config["DB_POOL_SIZE"],
+    overflow=app.config["DB_POOL_OVERFLOW"],
+    timeout=app.config["DB_POOL_TIMEOUT"],
+    recycle=app.config["DB_POOL_RECYCLE"],
+    prepared=app.config["DB_PREPARED_STATEMENTS"],
+)
+db.init_app(app)
+instrument.add_gauges("pool", db.pool.stats)
+
+# ───────── Read cache ─────────
+cache = make_cache(
+    app.config["CACHE_BACKEND"],
+    url=app.config["CACHE_URL"],
+    ttl=app.config["CACHE_TTL"],
+    maxsize=app.config["CACHE_MAXSIZE"],
+)
+instrument.add_gauges("cache", cache.stats)
+
+
+def cached_query(tag: str, sql: str, params: tuple = ()):
+    """db.query() through the read cache; drop the tag on writes via cache.invalidate()."""
+    rows = cache.get(tag, (sql, params))
+    if rows is MISS:
+        rows = db.query(sql, params)
+        cache.set(tag, (sql, params), rows)
+    return rows
+
+
+# Pages that depend only on the viewer's role are rendered once per role; the
+# navbar is a cached fragment, the user's name is filled in per response.
+page_cache = PageCache(cache, app, max_age=app.config["PAGE_MAX_AGE"])
+
+# ───────── Sessions & Passwords ─────────
+# Server-side sessions keyed by user id; the rest comes from the profile cache,
+# so login and role checks never query `users`.
+PROFILE_KEYS = ("name", "username", "email", "role", "standard", "student_identifier")
+
+profile_cache = make_cache(
+    app.config["CACHE_BACKEND"],
+    url=app.config["CACHE_URL"],
+    ttl=app.config["PROFILE_CACHE_TTL"],
+    maxsize=app.config["PROFILE_CACHE_SIZE"],
+)
+instrument.add_gauges("profile_cache", profile_cache.stats)
+
+
+def load_profile(uid: int):
+    """The user's PROFILE_KEYS (None if the account is gone), cached per user."""
+    profile = profile_cache.get("profiles", uid)
+    if profile is MISS:
+        profile = db.one(f"SELECT {', '.join(PROFILE_KEYS)} FROM users WHERE id=%s", (uid,))
+        profile_cache.set("profiles", uid, profile)
+    return profile
+
+
+if app.config["SESSION_BACKEND"] == "redis":
+    session_store = RedisSessionStore(app.config["SESSION_REDIS_URL"])
+else:
+    session_store = DBSessionStore(db.pool.acquire, db.pool.release)
+app.session_interface = ServerSessionInterface(
+    session_store,
+    lifetime=app.config["SESSION_LIFETIME"],
+    refresh=app.config["SESSION_REFRESH"],
+    user_key="id",
+    profile_loader=load_profile,
+    profile_keys=PROFILE_KEYS,
+)
+
+passwords = PasswordHasher(
+    app.config["PASSWORD_HASH_METHOD"], app.config["PASSWORD_HASH_CONCURRENCY"],
+    allow_plaintext=app.config["PASSWORD_ALLOW_PLAINTEXT"],
+)
+
+# ───────── Live updates ─────────
+broker = make_broker(app.config["PUSH_BACKEND"], app.config["PUSH_URL"])
+instrument.add_gauges("push", broker.stats)
+
+# ───────── File storage ─────────
+# Content-addressed: stored filenames are blobs/<sha[:2]>/<sha256>.<ext>
+material_blobs = BlobStore(app.config["UPLOAD_FOLDER"], "materials", db)
+assignment_blobs = BlobStore(app.config["ASSIGNMENT_FOLDER"], "assignments", db)
+gallery_blobs = BlobStore(app.config["GALLERY_FOLDER"], "gallery", db)
+chunked_uploads = ChunkedUploads(app.config["UPLOAD_STAGING"], app.config["MAX_UPLOAD_BYTES"],
+                                 ttl=app.config["CHUNKED_UPLOAD_TTL"])
+
+# kind → (prepare, work, store); blueprints add theirs, `flask run-worker` runs them
+JOB_HANDLERS = {}
+
+
+# ───────── Access checks ─────────
+def login_required(view):
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if "id" not in session:
+            flash("Please login to access this page", "warning")
+            return redirect(url_for("auth.login"))
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def staff() -> bool:
+    """Teachers and admins: the roles that upload, delete and mark attendance."""
+    return session.get("role") in ("admin", "teacher")
+
+
+def allowed(filename: str, extensions=ALLOWED_EXT) -> bool:
+    return "." in filename and filename.rsplit(".", 1)[1].lower() in extensions
+
+
+def remove_file(folder: str, rel: str) -> None:
+    try:
+        os.remove(os.path.join(folder, rel))
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,182 @@
+# ─────────────────────────────────────────────────────────────
+#  Data access: one pool, one row shape, prepared statements
+#  ------------------------------------------------------------
+#  Every blueprint reads and writes through the `db` built in
+#  core.py; nothing else opens connections for request work.
+#  • query() / one() → Row objects: row["title"] and row.title
+#    both work, on MySQL and SQLite alike, in code and templates
+#  • execute() / insert() for single writes; transaction() for
+#    statements that must commit together (yields a cursor for the
+#    helpers that take one: blobstore, search, jobs).
+#    after_commit() / after_rollback() defer work that can't be
+#    rolled back, such as unlinking files, until the outcome is known
+#  • MySQL: query() and friends reuse a per-connection LRU of
+#    server-side prepared statements, so hot statements are parsed
+#    once per connection. SQLite does the same in the driver
+#    (SQLITE_STATEMENT_CACHE).
+#  • the request's connection is checked out once, kept on `g`,
+#    and recycled instead of reused after an error
+# ─────────────────────────────────────────────────────────────
+
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from flask import current_app, g, has_app_context
+
+from .db_pool import ConnectionPool
+
+
+class Row(dict):
+    """One result row; columns by key or attribute."""
+
+    __slots__ = ()
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+def rows_from(cur) -> list:
+    names = [col[0] for col in cur.description]
+    return [Row(zip(names, values)) for values in cur.fetchall()]
+
+
+class Database:
+    def __init__(self, backend, wrap=None, size: int = 5, overflow: int = 10,
+                 timeout: float = 30.0, recycle: int = 3600, prepared: int = 256):
+        self.backend = backend
+        self.Error = backend.Error
+        self._wrap = wrap                     # e.g. Instrumentation.wrap_connection
+        # only the MySQL driver needs help; sqlite3 caches statements itself
+        self.prepared = prepared if backend.name == "mysql" else 0
+        self.pool = ConnectionPool(self._connect, size=size, overflow=overflow,
+                                   timeout=timeout, recycle=recycle)
+
+    def _connect(self):
+        conn = self.backend.connect()
+        return self._wrap(conn) if self._wrap else conn
+
+    def init_app(self, app) -> None:
+        app.teardown_appcontext(self._release)
+
+    # ---- the request's connection ----
+    def connection(self):
+        """Pooled connection, checked out once per app context and kept on `g`."""
+        if "db" not in g:
+            g.db = self.pool.acquire()
+        return g.db
+
+    def _release(self, exc) -> None:
+        conn = g.pop("db", None)
+        if conn is not None:
+            # unhandled errors / failed statements → recycle instead of reuse
+            self.pool.release(conn, broken=exc is not None or g.pop("db_failed", False))
+
+    def mark_failed(self) -> None:
+        """Don't return this request's connection to the pool (unread rows, …)."""
+        g.db_failed = True
+
+    # ---- statements ----
+    def _statement(self, conn, sql: str):
+        """(cursor, close after use?) – a cached prepared cursor on MySQL."""
+        if not self.prepared:
+            # buffered: a fetchone() must not leave unread rows on a reused connection
+            return conn.cursor(buffered=True), True
+        cache = getattr(conn, "_statements", None)
+        if cache is None:
+            cache = conn._statements = OrderedDict()
+        cur = cache.pop(sql, None)
+        if cur is None:
+            cur = conn.cursor(prepared=True)
+            if len(cache) >= self.prepared:
+                cache.popitem(last=False)[1].close()     # deallocates the server-side statement
+        cache[sql] = cur
+        return cur, False
+
+    def _run(self, sql: str, params, commit: bool):
+        conn = self.connection()
+        cur, close = self._statement(conn, sql)
+        try:
+            cur.execute(sql, tuple(params))
+            rows = rows_from(cur) if cur.description else None
+            result = (rows, cur.lastrowid, cur.rowcount)
+            if commit:
+                conn.commit()
+        except self.Error:
+            self.mark_failed()
+            raise
+        finally:
+            if close:
+                cur.close()
+        return result
+
+    def query(self, sql: str, params=()) -> list:
+        return self._run(sql, params, commit=False)[0]
+
+    def one(self, sql: str, params=()):
+        rows = self._run(sql, params, commit=False)[0]
+        return rows[0] if rows else None
+
+    def execute(self, sql: str, params=(), commit: bool = True) -> int:
+        """Run one write; returns the affected row count."""
+        return self._run(sql, params, commit)[2]
+
+    def insert(self, sql: str, params=(), commit: bool = True) -> int:
+        """Run one INSERT; returns the new row's id."""
+        return self._run(sql, params, commit)[1]
+
+    @contextmanager
+    def transaction(self):
+        """Plain cursor on the request connection; commit on success, roll back on error."""
+        conn = self.connection()
+        cur = conn.cursor()
+        hooks = {"commit": [], "rollback": []}
+        g.setdefault("db_hooks", []).append(hooks)
+        try:
+            try:
+                yield cur
+                conn.commit()
+            finally:
+                cur.close()
+                g.db_hooks.pop()
+        except Exception:
+            conn.rollback()
+            self._run_hooks(hooks["rollback"])
+            raise
+        self._run_hooks(hooks["commit"])
+
+    def after_commit(self, fn) -> bool:
+        """Call fn() once the enclosing transaction() has committed.
+
+        Returns False (and keeps nothing) outside a transaction().
+        """
+        return self._add_hook("commit", fn)
+
+    def after_rollback(self, fn) -> bool:
+        """Call fn() if the enclosing transaction() rolls back; False outside one."""
+        return self._add_hook("rollback", fn)
+
+    @staticmethod
+    def _add_hook(outcome: str, fn) -> bool:
+        frames = g.get("db_hooks") if has_app_context() else None
+        if not frames:
+            return False
+        frames[-1][outcome].append(fn)
+        return True
+
+    @staticmethod
+    def _run_hooks(hooks) -> None:
+        # the transaction's outcome is final: a failing hook is logged, not raised
+        for fn in hooks:
+            try:
+                fn()
+            except Exception:
+                current_app.logger.exception("transaction hook %r failed", fn)
+
+    def warm(self) -> None:
+        """Open the pool's core connections now instead of on the first requests."""
+        conns = [self.pool.acquire() for _ in range(self.pool.size)]
+        for conn in conns:
+            self.pool.release(conn)
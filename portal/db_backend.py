@@ -0,0 +1,293 @@
+# ─────────────────────────────────────────────────────────────
+#  Database backends: MySQL server or a local SQLite file
+#  ------------------------------------------------------------
+#  Picked by DB_BACKEND (mysql | sqlite). Everything that differs
+#  between the two lives here:
+#  • connect()        – mysql.connector, or sqlite3 in WAL mode
+#                       with tuned pragmas and a statement cache
+#  • SQL builders     – upsert(), row_in(), month_start(),
+#                       days_since(), seconds_from_now()
+#  • schema probes    – has_table(), has_column(), has_index()
+#  • advisory_lock()  – one migration runner at a time
+#  SQLite connections speak the slice of mysql.connector the app
+#  uses: %s placeholders, cursor(dictionary=True), is_connected()
+#  and SELECT … FOR UPDATE (→ BEGIN IMMEDIATE, SQLite has one
+#  writer at a time). Modules that build SQL call current().
+# ─────────────────────────────────────────────────────────────
+
+import os
+import re
+import sqlite3
+from datetime import date, datetime
+from functools import lru_cache
+
+_active = None
+
+
+def current():
+    """The backend the app was configured with (MySQL if none yet)."""
+    global _active
+    if _active is None:
+        _active = MySQLBackend.__new__(MySQLBackend)   # SQL builders only, no driver needed
+    return _active
+
+
+def make_backend(kind: str = "mysql", **opts):
+    """Build the backend for `kind` and make it current()."""
+    global _active
+    backends = {"mysql": MySQLBackend, "sqlite": SQLiteBackend}
+    if kind not in backends:
+        raise ValueError(f"unknown DB_BACKEND {kind!r}")
+    _active = backends[kind](**opts)
+    return _active
+
+
+class _Backend:
+    name = ""
+
+    def excluded(self, column: str) -> str:
+        """The incoming value of `column` inside an upsert's UPDATE part."""
+        raise NotImplementedError
+
+    def _on_conflict(self, keys) -> str:
+        raise NotImplementedError
+
+    def upsert(self, table: str, columns, keys, update, rows: int = 1) -> str:
+        """INSERT of `rows` rows that updates on a `keys` conflict instead.
+
+        `update` is a list of columns to overwrite with the incoming value,
+        or {column: expression} where "{new}" stands for that value, e.g.
+        {"refcount": "refcount+1", "present": "present+{new}"}.
+        """
+        if not isinstance(update, dict):
+            update = {col: "{new}" for col in update}
+        row = "(" + ",".join(["%s"] * len(columns)) + ")"
+        sets = ", ".join(f"{col}={expr.format(new=self.excluded(col))}" for col, expr in update.items())
+        return (
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES {','.join([row] * rows)}"
+            f"{self._on_conflict(keys)}{sets}"
+        )
+
+
+# ───────── MySQL ─────────
+
+class MySQLBackend(_Backend):
+    name = "mysql"
+
+    def __init__(self, host="127.0.0.1", user="root", password="root", database="student_portal"):
+        import mysql.connector                   # only needed when this backend is used
+        self._driver = mysql.connector
+        self.Error = mysql.connector.Error
+        self.opts = dict(host=host, user=user, password=password)
+        self.database = database
+
+    def connect(self):
+        return self._driver.connect(database=self.database, **self.opts)
+
+    def create_database(self) -> None:
+        conn = self._driver.connect(**self.opts)
+        cur = conn.cursor()
+        cur.execute(f"CREATE DATABASE IF NOT EXISTS {self.database}")
+        cur.close()
+        conn.close()
+
+    # ---- SQL ----
+    def excluded(self, column):
+        return f"VALUES({column})"
+
+    def _on_conflict(self, keys):
+        return " ON DUPLICATE KEY UPDATE "
+
+    def row_in(self, columns, n: int) -> str:
+        row = "(" + ",".join(["%s"] * len(columns)) + ")"
+        return f"({', '.join(columns)}) IN ({','.join([row] * n)})"
+
+    def month_start(self, expr: str) -> str:
+        return f"DATE_FORMAT({expr}, '%Y-%m-01')"
+
+    def days_since(self, expr: str, param: str = "%s") -> str:
+        return f"DATEDIFF({expr}, {param})"
+
+    def seconds_from_now(self, param: str = "%s") -> str:
+        return f"NOW() + INTERVAL {param} SECOND"
+
+    # ---- schema probes ----
+    def has_table(self, cur, table: str) -> bool:
+        cur.execute(
+            "SELECT 1 FROM information_schema.tables "
+            "WHERE table_schema=DATABASE() AND table_name=%s LIMIT 1",
+            (table,),
+        )
+        return bool(cur.fetchall())
+
+    def has_column(self, cur, table: str, column: str) -> bool:
+        cur.execute(
+            "SELECT 1 FROM information_schema.columns "
+            "WHERE table_schema=DATABASE() AND table_name=%s AND column_name=%s LIMIT 1",
+            (table, column),
+        )
+        return bool(cur.fetchall())
+
+    def has_index(self, cur, table: str, name: str) -> bool:
+        cur.execute(
+            "SELECT 1 FROM information_schema.statistics "
+            "WHERE table_schema=DATABASE() AND table_name=%s AND index_name=%s LIMIT 1",
+            (table, name),
+        )
+        return bool(cur.fetchall())
+
+    def advisory_lock(self, cur, name: str, timeout: int = 60) -> None:
+        cur.execute("SELECT GET_LOCK(%s, %s)", (name, timeout))
+        if cur.fetchall()[0][0] != 1:
+            raise TimeoutError(f"could not take lock {name!r} within {timeout}s")
+
+    def advisory_unlock(self, cur, name: str) -> None:
+        cur.execute("SELECT RELEASE_LOCK(%s)", (name,))
+        cur.fetchall()
+
+
+# ───────── SQLite ─────────
+
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, lambda v: v.isoformat(" "))
+sqlite3.register_converter("DATE", lambda b: date.fromisoformat(b.decode()[:10]))
+sqlite3.register_converter("DATETIME", lambda b: datetime.fromisoformat(b.decode()))
+
+_LOCKING = re.compile(r"\s+FOR\s+UPDATE(?:\s+SKIP\s+LOCKED)?\s*$", re.I)
+
+
+@lru_cache(maxsize=1024)
+def _translate(sql: str):
+    """MySQL-flavoured statement → (sqlite statement, wants write lock)."""
+    sql, locks = _LOCKING.subn("", sql)
+    return sql.replace("%s", "?"), bool(locks)
+
+
+def _dict_row(cur, row):
+    return {col[0]: value for col, value in zip(cur.description, row)}
+
+
+class SQLiteCursor:
+    def __init__(self, conn, dictionary: bool = False):
+        self._conn = conn
+        self._cur = conn.cursor()
+        if dictionary:
+            self._cur.row_factory = _dict_row
+
+    def execute(self, sql, params=None):
+        sql, lock = _translate(sql)
+        if lock and not self._conn.in_transaction:
+            self._cur.execute("BEGIN IMMEDIATE")     # take the write lock before reading
+        self._cur.execute(sql, params or ())
+
+    def executemany(self, sql, seq):
+        self._cur.executemany(_translate(sql)[0], seq)
+
+    def __getattr__(self, name):
+        return getattr(self._cur, name)
+
+    def __iter__(self):
+        return iter(self._cur)
+
+
+class SQLiteConnection:
+    def __init__(self, conn):
+        self._conn = conn
+
+    def cursor(self, dictionary: bool = False, buffered: bool = None, **_):
+        return SQLiteCursor(self._conn, dictionary)   # sqlite cursors need no buffering
+
+    def is_connected(self) -> bool:
+        try:
+            self._conn.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+class SQLiteBackend(_Backend):
+    name = "sqlite"
+    Error = sqlite3.Error
+
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",          # readers never wait for the writer
+        "PRAGMA synchronous=NORMAL",        # fsync at checkpoints only; safe with WAL
+        "PRAGMA foreign_keys=ON",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-65536",         # 64 MiB page cache per connection
+        "PRAGMA mmap_size=268435456",
+    )
+
+    def __init__(self, path="student_portal.db", busy_timeout: float = 10.0,
+                 statement_cache: int = 256):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self.statement_cache = statement_cache
+
+    def connect(self):
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.busy_timeout,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            isolation_level="IMMEDIATE",        # implicit BEGINs take the write lock up front
+            check_same_thread=False,            # pooled: one thread at a time, not always the same
+            cached_statements=self.statement_cache,
+        )
+        for pragma in self.PRAGMAS:
+            conn.execute(pragma)
+        return SQLiteConnection(conn)
+
+    def create_database(self) -> None:
+        folder = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(folder, exist_ok=True)
+
+    # ---- SQL ----
+    def excluded(self, column):
+        return f"excluded.{column}"
+
+    def _on_conflict(self, keys):
+        return f" ON CONFLICT ({', '.join(keys)}) DO UPDATE SET "
+
+    def row_in(self, columns, n: int) -> str:
+        # `(a, b) IN (VALUES …)` scans the table; an OR of equalities is
+        # planned as one unique-index probe per row. Nested pairwise so the
+        # expression tree stays under SQLite's depth limit (1000).
+        def any_of(k):
+            if k == 1:
+                return "(" + " AND ".join(f"{col}=%s" for col in columns) + ")"
+            return f"({any_of(k // 2)} OR {any_of(k - k // 2)})"
+        return any_of(n)
+
+    def month_start(self, expr: str) -> str:
+        return f"strftime('%Y-%m-01', {expr})"
+
+    def days_since(self, expr: str, param: str = "%s") -> str:
+        return f"CAST(julianday({expr}) - julianday({param}) AS INTEGER)"
+
+    def seconds_from_now(self, param: str = "%s") -> str:
+        return f"datetime('now', {param} || ' seconds')"
+
+    # ---- schema probes ----
+    def has_table(self, cur, table: str) -> bool:
+        cur.execute("SELECT 1 FROM sqlite_master WHERE type IN ('table','view') AND name=%s", (table,))
+        return bool(cur.fetchall())
+
+    def has_column(self, cur, table: str, column: str) -> bool:
+        cur.execute(f"PRAGMA table_info({table})")
+        return any(row[1] == column for row in cur.fetchall())
+
+    def has_index(self, cur, table: str, name: str) -> bool:
+        cur.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='index' AND tbl_name=%s AND name=%s",
+            (table, name),
+        )
+        return bool(cur.fetchall())
+
+    def advisory_lock(self, cur, name: str, timeout: int = 60) -> None:
+        pass        # DDL is transactional and every step idempotent; busy_timeout serialises
+
+    def advisory_unlock(self, cur, name: str) -> None:
+        pass
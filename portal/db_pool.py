@@ -0,0 +1,156 @@
+# ─────────────────────────────────────────────────────────────
+#  Connection pool for the Student Portal
+#  ------------------------------------------------------------
+#  • fixed core size + bounded overflow (overflow conns are
+#    closed on release instead of kept idle)
+#  • health check on checkout, recycle after `recycle` seconds
+#  • broken connections are discarded, never handed out again
+#  • checkout / wait-time counters via `stats()`
+# ─────────────────────────────────────────────────────────────
+
+import threading
+import time
+
+
+class PoolTimeout(Exception):
+    """No connection became free within the pool timeout."""
+
+
+class ConnectionPool:
+    def __init__(self, connect, size: int = 5, overflow: int = 10,
+                 timeout: float = 30.0, recycle: int = 3600):
+        self._connect = connect          # zero-arg factory → new DB-API connection
+        self.size = size
+        self.overflow = overflow
+        self.timeout = timeout
+        self.recycle = recycle
+
+        self._cond = threading.Condition()
+        self._idle = []                  # LIFO stack → hot connections stay hot
+        self._born = {}                  # id(conn) → creation time
+        self._open = 0                   # idle + checked out
+
+        self._stats = dict(
+            checkouts=0, waits=0, wait_seconds=0.0, max_wait_seconds=0.0,
+            timeouts=0, created=0, discarded=0,
+        )
+
+    # ───────── checkout / return ─────────
+    def acquire(self):
+        """Hand out a healthy connection, waiting up to `timeout` seconds."""
+        start = time.monotonic()
+        deadline = start + self.timeout
+        waited = False
+
+        while True:
+            conn = None
+            with self._cond:
+                while True:
+                    if self._idle:
+                        conn = self._idle.pop()
+                        break
+                    if self._open < self.size + self.overflow:
+                        self._open += 1      # reserve a slot, connect outside the lock
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise PoolTimeout(
+                            f"pool exhausted ({self.size}+{self.overflow}) after {self.timeout}s"
+                        )
+                    waited = True
+                    self._cond.wait(remaining)
+
+            if conn is None:
+                conn = self._create()
+                break
+            if self._healthy(conn):
+                break
+            self.discard(conn)
+
+        elapsed = time.monotonic() - start
+        with self._cond:
+            s = self._stats
+            s["checkouts"] += 1
+            s["wait_seconds"] += elapsed
+            s["max_wait_seconds"] = max(s["max_wait_seconds"], elapsed)
+            if waited:
+                s["waits"] += 1
+        return conn
+
+    def release(self, conn, broken: bool = False) -> None:
+        """Return `conn`; broken or surplus (overflow) connections are closed."""
+        if not broken:
+            try:
+                conn.rollback()              # end any open read snapshot / txn
+            except Exception:
+                broken = True
+        if broken:
+            self.discard(conn)
+            return
+
+        with self._cond:
+            if self._open > self.size:
+                surplus = True
+            else:
+                surplus = False
+                self._idle.append(conn)
+                self._cond.notify()
+        if surplus:
+            self.discard(conn)
+
+    def discard(self, conn) -> None:
+        """Close `conn` and free its slot."""
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._born.pop(id(conn), None)
+            self._open -= 1
+            self._stats["discarded"] += 1
+            self._cond.notify()
+
+    def close_all(self) -> None:
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            self.discard(conn)
+
+    # ───────── internals ─────────
+    def _create(self):
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._born[id(conn)] = time.monotonic()
+            self._stats["created"] += 1
+        return conn
+
+    def _healthy(self, conn) -> bool:
+        born = self._born.get(id(conn), 0)
+        if self.recycle and time.monotonic() - born > self.recycle:
+            return False
+        try:
+            return conn.is_connected()       # cheap ping on mysql.connector
+        except Exception:
+            return False
+
+    # ───────── metrics ─────────
+    def stats(self) -> dict:
+        with self._cond:
+            data = dict(self._stats)
+            data.update(
+                size=self.size,
+                overflow=self.overflow,
+                open=self._open,
+                idle=len(self._idle),
+                in_use=self._open - len(self._idle),
+            )
+        checkouts = data["checkouts"] or 1
+        data["avg_wait_seconds"] = data["wait_seconds"] / checkouts
+        return data
@@ -0,0 +1,63 @@
+# ─────────────────────────────────────────────────────────────
+#  File delivery for stored uploads
+#  ------------------------------------------------------------
+#  FILE_DELIVERY selects who moves the bytes:
+#  • "python"   – Werkzeug streams the file (Range + 304 handled)
+#  • "sendfile" – X-Sendfile header for Apache/lighttpd
+#  • "accel"    – X-Accel-Redirect to an nginx `internal` location:
+#        location /_protected/uploads/ { internal; alias /srv/portal/uploads/; }
+#  Blobs are content-addressed, so their SHA-256 is a strong ETag
+#  and a repeat download costs a 304 instead of the whole file.
+# ─────────────────────────────────────────────────────────────
+
+import mimetypes
+import os
+from urllib.parse import quote
+
+from flask import current_app, request, send_from_directory
+from werkzeug.exceptions import NotFound
+from werkzeug.security import safe_join
+
+
+def content_etag(rel: str):
+    """SHA-256 from a blobs/<xx>/<sha><ext> path; None for other files."""
+    if not rel.startswith("blobs/"):
+        return None
+    return os.path.basename(rel).split(".", 1)[0]
+
+
+def _disposition(as_attachment: bool, name: str) -> str:
+    kind = "attachment" if as_attachment else "inline"
+    return f"{kind}; filename*=UTF-8''{quote(name)}"
+
+
+def send_stored_file(root: str, rel: str, *, as_attachment: bool, download_name: str):
+    cfg = current_app.config
+    mode = cfg.get("FILE_DELIVERY", "python")
+    max_age = cfg.get("FILE_MAX_AGE", 3600)
+    etag = content_etag(rel)
+
+    if mode == "accel":
+        path = safe_join(root, rel)
+        if path is None or not os.path.isfile(path):
+            raise NotFound()
+        resp = current_app.response_class(
+            mimetype=mimetypes.guess_type(download_name)[0] or "application/octet-stream"
+        )
+        resp.headers["X-Accel-Redirect"] = f"{cfg['ACCEL_REDIRECT_PREFIX'].rstrip('/')}/{rel}"
+        resp.headers["Content-Disposition"] = _disposition(as_attachment, download_name)
+        resp.cache_control.private = True
+        resp.cache_control.max_age = max_age
+        if etag:
+            resp.set_etag(etag)
+        return resp.make_conditional(request)   # 304 without touching nginx
+
+    # "python" and "sendfile" (Flask's USE_X_SENDFILE does the header)
+    return send_from_directory(
+        root, rel,
+        as_attachment=as_attachment,
+        download_name=download_name,
+        etag=etag if etag else True,
+        conditional=True,            # If-None-Match → 304, Range → 206
+        max_age=max_age,
+    )
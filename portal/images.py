@@ -0,0 +1,63 @@
+# ─────────────────────────────────────────────────────────────
+#  Gallery image variants (runs in the worker, never in a request)
+#  ------------------------------------------------------------
+#  variants(path) → the original scaled down to each of VARIANTS,
+#  encoded as WebP and as JPEG (for browsers without WebP).
+#  • never upscaled; a size that would repeat a smaller one is
+#    skipped
+#  • named by a hash of their bytes, so the URLs can be cached
+#    forever and change whenever the output does
+#  • needs Pillow; without it (or for animated GIFs) there are no
+#    variants and pages keep showing the original
+#  Pure function of a file path, so it runs in a process pool.
+# ─────────────────────────────────────────────────────────────
+
+import hashlib
+import io
+
+VARIANTS = (("thumb", 320), ("medium", 1024))     # name, max width / height in px
+FORMATS = (("webp", "WEBP", {"quality": 80, "method": 4}),
+           ("jpeg", "JPEG", {"quality": 82, "optimize": True, "progressive": True}))
+
+
+def variant_path(data: bytes, ext: str) -> str:
+    """variants/<xx>/<fingerprint>.<ext>, relative to the gallery folder."""
+    digest = hashlib.sha256(data).hexdigest()[:20]
+    return f"variants/{digest[:2]}/{digest}.{ext}"
+
+
+def variants(path: str) -> list:
+    """[{variant, format, width, height, data, path}, …]; [] if nothing to make."""
+    try:
+        from PIL import Image, ImageOps
+    except ImportError:
+        return []
+
+    with Image.open(path) as im:
+        if getattr(im, "is_animated", False):
+            return []                                # a still would lose the animation
+        im = ImageOps.exif_transpose(im)             # phone photos: apply the EXIF rotation
+        # transparency goes onto white: JPEG has no alpha channel
+        if im.mode in ("RGBA", "LA") or (im.mode == "P" and "transparency" in im.info):
+            rgba = im.convert("RGBA")
+            im = Image.new("RGB", rgba.size, "white")
+            im.paste(rgba, mask=rgba.getchannel("A"))
+        elif im.mode != "RGB":
+            im = im.convert("RGB")
+
+        out, last = [], None
+        for name, box in VARIANTS:
+            scaled = im.copy()
+            scaled.thumbnail((box, box), Image.LANCZOS)
+            if scaled.size == last:
+                continue                             # original smaller than this box too
+            last = scaled.size
+            for ext, fmt, opts in FORMATS:
+                buf = io.BytesIO()
+                scaled.save(buf, fmt, **opts)
+                data = buf.getvalue()
+                out.append({
+                    "variant": name, "format": ext, "width": scaled.width, "height": scaled.height,
+                    "data": data, "path": variant_path(data, ext),
+                })
+        return out
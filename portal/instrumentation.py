@@ -0,0 +1,212 @@
+# ─────────────────────────────────────────────────────────────
+#  Request / SQL instrumentation
+#  ------------------------------------------------------------
+#  Per request: total time, DB time + query count (timed cursor
+#  wrapper), template render time (Flask signals), bytes sent.
+#  • GET /metrics  – Prometheus text format (this process only;
+#                    scrape each worker or use one per host).
+#                    403 unless METRICS_TOKEN is set and sent as
+#                    "Authorization: Bearer <token>"
+#  • Server-Timing – same split on every response, for devtools
+#  • slow-query log – logger "portal.sql", SLOW_QUERY_MS threshold
+# ─────────────────────────────────────────────────────────────
+
+import hmac
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from flask import Response, abort, current_app, g, has_app_context, request
+from flask.signals import before_render_template, template_rendered
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+slow_log = logging.getLogger("portal.sql")
+
+
+class _Histogram:
+    __slots__ = ("counts", "total", "n")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.total = 0.0
+        self.n = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.counts[i] += 1
+        self.total += value
+        self.n += 1
+
+
+def _labels(**kw) -> str:
+    return "{" + ",".join(f'{k}="{str(v).replace(chr(34), "")}"' for k, v in kw.items()) + "}"
+
+
+# ───────── DB wrappers ─────────
+
+class TimedCursor:
+    def __init__(self, cursor, inst):
+        self._cur = cursor
+        self._inst = inst
+
+    def execute(self, sql, params=None, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._cur.execute(sql, params, *args, **kwargs)
+        finally:
+            self._inst.record_query(sql, time.perf_counter() - start)
+
+    def executemany(self, sql, seq, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return self._cur.executemany(sql, seq, *args, **kwargs)
+        finally:
+            self._inst.record_query(sql, time.perf_counter() - start)
+
+    def __getattr__(self, name):
+        return getattr(self._cur, name)
+
+    def __iter__(self):
+        return iter(self._cur)
+
+
+class TimedConnection:
+    def __init__(self, conn, inst):
+        self._conn = conn
+        self._inst = inst
+
+    def cursor(self, *args, **kwargs):
+        return TimedCursor(self._conn.cursor(*args, **kwargs), self._inst)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+# ───────── Registry + Flask hooks ─────────
+
+class Instrumentation:
+    def __init__(self, app=None):
+        self._lock = threading.Lock()
+        self.request_hist = defaultdict(_Histogram)     # endpoint → seconds
+        self.db_hist = defaultdict(_Histogram)
+        self.template_hist = defaultdict(_Histogram)
+        self.requests = defaultdict(int)                 # (endpoint, method, status)
+        self.queries = defaultdict(int)                  # endpoint
+        self.bytes_sent = defaultdict(int)               # endpoint
+        self.slow_queries = 0
+        self.slow_query_ms = 200.0
+        self.gauges = {}                                 # prefix → callable → dict
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        self.slow_query_ms = float(app.config.setdefault("SLOW_QUERY_MS", 200))
+        app.config.setdefault("METRICS_TOKEN", None)
+        app.before_request(self._before)
+        app.after_request(self._after)
+        before_render_template.connect(self._tpl_start, app)
+        template_rendered.connect(self._tpl_end, app)
+        app.add_url_rule("/metrics", "metrics", self._metrics_view)
+
+    def wrap_connection(self, conn):
+        return TimedConnection(conn, self)
+
+    def add_gauges(self, prefix: str, collect) -> None:
+        """Expose numeric values of `collect()` as portal_<prefix>_<key> gauges."""
+        self.gauges[prefix] = collect
+
+    # ---- recording ----
+    def record_query(self, sql, seconds: float) -> None:
+        perf = g.get("_perf") if has_app_context() else None
+        if perf is not None:
+            perf["db"] += seconds
+            perf["queries"] += 1
+        if seconds * 1000 >= self.slow_query_ms:
+            with self._lock:
+                self.slow_queries += 1
+            endpoint = request.endpoint if perf is not None else "-"
+            slow_log.warning("slow query %.1fms [%s] %s", seconds * 1000, endpoint,
+                             " ".join(str(sql).split())[:500])
+
+    def _before(self):
+        g._perf = {"start": time.perf_counter(), "db": 0.0, "queries": 0, "tpl": 0.0}
+
+    def _tpl_start(self, sender, template, context, **extra):
+        perf = g.get("_perf")
+        if perf is not None:
+            perf["tpl_start"] = time.perf_counter()
+
+    def _tpl_end(self, sender, template, context, **extra):
+        perf = g.get("_perf")
+        if perf is not None and "tpl_start" in perf:
+            perf["tpl"] += time.perf_counter() - perf.pop("tpl_start")
+
+    def _after(self, response):
+        perf = g.get("_perf")
+        if perf is None:
+            return response
+        total = time.perf_counter() - perf["start"]
+        endpoint = request.endpoint or "404"
+        size = response.content_length or 0
+        with self._lock:
+            self.request_hist[endpoint].observe(total)
+            self.db_hist[endpoint].observe(perf["db"])
+            self.template_hist[endpoint].observe(perf["tpl"])
+            self.requests[(endpoint, request.method, response.status_code)] += 1
+            self.queries[endpoint] += perf["queries"]
+            self.bytes_sent[endpoint] += size
+        response.headers["Server-Timing"] = (
+            f"db;dur={perf['db'] * 1000:.1f};desc=\"{perf['queries']} queries\", "
+            f"tpl;dur={perf['tpl'] * 1000:.1f}, total;dur={total * 1000:.1f}"
+        )
+        return response
+
+    # ---- exposition ----
+    def render(self) -> str:
+        out = []
+
+        def hist(name, help_, data):
+            out.append(f"# HELP {name} {help_}")
+            out.append(f"# TYPE {name} histogram")
+            for endpoint, h in sorted(data.items()):
+                for bound, c in zip(BUCKETS, h.counts):
+                    out.append(f"{name}_bucket{_labels(endpoint=endpoint, le=bound)} {c}")
+                out.append(f"{name}_bucket{_labels(endpoint=endpoint, le='+Inf')} {h.n}")
+                out.append(f"{name}_sum{_labels(endpoint=endpoint)} {h.total:.6f}")
+                out.append(f"{name}_count{_labels(endpoint=endpoint)} {h.n}")
+
+        def counter(name, help_, rows):
+            out.append(f"# HELP {name} {help_}")
+            out.append(f"# TYPE {name} counter")
+            out.extend(f"{name}{labels} {value}" for labels, value in rows)
+
+        with self._lock:
+            hist("portal_request_duration_seconds", "Wall time per request.", self.request_hist)
+            hist("portal_db_duration_seconds", "SQL time per request.", self.db_hist)
+            hist("portal_template_duration_seconds", "Template render time per request.", self.template_hist)
+            counter("portal_requests_total", "Requests by endpoint, method and status.",
+                    [(_labels(endpoint=e, method=m, status=s), v)
+                     for (e, m, s), v in sorted(self.requests.items())])
+            counter("portal_db_queries_total", "SQL statements executed.",
+                    [(_labels(endpoint=e), v) for e, v in sorted(self.queries.items())])
+            counter("portal_response_bytes_total", "Response bytes with a known length.",
+                    [(_labels(endpoint=e), v) for e, v in sorted(self.bytes_sent.items())])
+            counter("portal_slow_queries_total", "Queries over SLOW_QUERY_MS.",
+                    [("", self.slow_queries)])
+
+        for prefix, collect in self.gauges.items():
+            for key, value in sorted(collect().items()):
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    out.append(f"# TYPE portal_{prefix}_{key} gauge")
+                    out.append(f"portal_{prefix}_{key} {value}")
+        return "\n".join(out) + "\n"
+
+    def _metrics_view(self):
+        token = current_app.config.get("METRICS_TOKEN")
+        # closed by default: traffic and limiter numbers are nobody else's business
+        if not token or not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+            abort(403)
+        return Response(self.render(), mimetype="text/plain; version=0.0.4")
@@ -0,0 +1,133 @@
+# ─────────────────────────────────────────────────────────────
+#  Background jobs on a MySQL-backed queue
+#  ------------------------------------------------------------
+#  • enqueue() inserts into `jobs` inside the caller's transaction,
+#    so a job exists iff the row that needs it was committed.
+#  • `flask run-worker` claims jobs with FOR UPDATE SKIP LOCKED
+#    (MySQL 8+), so several workers can share one queue; on SQLite
+#    claims simply take turns on the write lock.
+#  • A handler is (prepare, work, store): prepare/store run in the
+#    worker with a DB connection, `work` runs in a process pool.
+#  • Failures retry with backoff; jobs stuck in 'running' longer
+#    than the lease (crashed worker) go back to 'queued'.
+# ─────────────────────────────────────────────────────────────
+
+import json
+import os
+import socket
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from .db_backend import current
+
+
+def enqueue(cur, kind: str, payload: dict, delay: int = 0) -> None:
+    cur.execute(
+        "INSERT INTO jobs (kind, payload, run_after) "
+        f"VALUES (%s, %s, {current().seconds_from_now()})",
+        (kind, json.dumps(payload), delay),
+    )
+
+
+def claim(conn, worker_id: str, kinds):
+    cur = conn.cursor(dictionary=True)
+    try:
+        cur.execute(
+            f"""
+            SELECT id, kind, payload, attempts FROM jobs
+            WHERE status='queued' AND run_after <= CURRENT_TIMESTAMP
+              AND kind IN ({",".join(["%s"] * len(kinds))})
+            ORDER BY run_after, id
+            LIMIT 1
+            FOR UPDATE SKIP LOCKED
+            """,
+            list(kinds),
+        )
+        job = cur.fetchone()
+        if job:
+            cur.execute(
+                "UPDATE jobs SET status='running', attempts=attempts+1, locked_by=%s, started_at=CURRENT_TIMESTAMP "
+                "WHERE id=%s",
+                (worker_id, job["id"]),
+            )
+            job["payload"] = json.loads(job["payload"])
+            job["attempts"] += 1
+        conn.commit()
+        return job
+    finally:
+        cur.close()
+
+
+def finish(conn, job_id: int) -> None:
+    cur = conn.cursor()
+    cur.execute("DELETE FROM jobs WHERE id=%s", (job_id,))
+    conn.commit()
+    cur.close()
+
+
+def fail(conn, job: dict, error: Exception, max_attempts: int) -> None:
+    conn.rollback()
+    retry = job["attempts"] < max_attempts
+    cur = conn.cursor()
+    cur.execute(
+        "UPDATE jobs SET status=%s, error=%s, locked_by=NULL, "
+        f"run_after={current().seconds_from_now()} WHERE id=%s",
+        ("queued" if retry else "failed", repr(error)[:2000], 30 * 2 ** job["attempts"], job["id"]),
+    )
+    conn.commit()
+    cur.close()
+
+
+def requeue_stale(conn, lease: int) -> None:
+    cur = conn.cursor()
+    cur.execute(
+        "UPDATE jobs SET status='queued', locked_by=NULL "
+        f"WHERE status='running' AND started_at < {current().seconds_from_now()}",
+        (-lease,),
+    )
+    conn.commit()
+    cur.close()
+
+
+def run_worker(app, get_db, handlers: dict, processes: int = 2, poll: float = 1.0,
+               lease: int = 600, max_attempts: int = 3, once: bool = False) -> None:
+    """Process jobs until interrupted (or, with once=True, until the queue is empty)."""
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    inflight = {}                                   # future → job
+    last_sweep = 0.0
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        while True:
+            with app.app_context():                 # one pooled connection per pass
+                conn = get_db()
+                if time.monotonic() - last_sweep > lease / 4:
+                    requeue_stale(conn, lease)
+                    last_sweep = time.monotonic()
+
+                while len(inflight) < processes:
+                    job = claim(conn, worker_id, handlers)
+                    if job is None:
+                        break
+                    prepare, work, _store = handlers[job["kind"]]
+                    try:
+                        args = prepare(conn, job["payload"])
+                    except Exception as exc:
+                        fail(conn, job, exc, max_attempts)
+                        continue
+                    inflight[pool.submit(work, *args)] = job
+
+                if not inflight:
+                    if once:
+                        return
+                    time.sleep(poll)
+                    continue
+
+                done, _pending = wait(inflight, timeout=poll, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    job = inflight.pop(fut)
+                    _prepare, _work, store = handlers[job["kind"]]
+                    try:
+                        store(conn, job["payload"], fut.result())
+                        finish(conn, job["id"])
+                    except Exception as exc:
+                        fail(conn, job, exc, max_attempts)
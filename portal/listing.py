@@ -0,0 +1,68 @@
+# ─────────────────────────────────────────────────────────────
+#  Newest-first keyset pages and per-standard summaries
+#  ------------------------------------------------------------
+#  • newest_first() pages on (stamp, id) DESC and resumes at an
+#    opaque ?before= token, so page 50 costs what page 1 does
+#  • standard_summary() → {standard: (count, latest)} from one
+#    GROUP BY over the (standard, stamp) index, cached per table
+# ─────────────────────────────────────────────────────────────
+
+from datetime import datetime
+
+from flask import abort, request
+
+from .cache import MISS
+
+
+def cursor_token(when, row_id) -> str:
+    """`before` token for the row after which the next newest-first page starts.
+
+    Keeps microseconds: a SQLite DATETIME stores them, and a token cut to
+    the second would skip the older rows of that second.
+    """
+    return f"{when:%Y%m%d%H%M%S%f}-{row_id}"
+
+
+def parse_cursor(token: str):
+    """(timestamp, id) from a `before` token; 400 if it is mangled."""
+    try:
+        stamp, _, row_id = token.partition("-")
+        fmt = "%Y%m%d%H%M%S" if len(stamp) == 14 else "%Y%m%d%H%M%S%f"   # 14: older tokens
+        return datetime.strptime(stamp, fmt), int(row_id)
+    except ValueError:
+        abort(400)
+
+
+def newest_first(db, sql: str, params: tuple, stamp_col: str, size: int, arg: str = "before"):
+    """One page of `sql` ordered by (stamp_col, id) DESC, resuming at ?before=
+    (or the query parameter named by `arg`).
+
+    `sql` must select id and stamp_col. Returns (rows, next token or None);
+    reads at most size + 1 rows.
+    """
+    before = request.args.get(arg)
+    if before:
+        when, row_id = parse_cursor(before)
+        sql += " AND " if " WHERE " in sql else " WHERE "
+        sql += f"({stamp_col} < %s OR ({stamp_col} = %s AND id < %s))"
+        params += (when, when, row_id)
+    rows = db.query(sql + f" ORDER BY {stamp_col} DESC, id DESC LIMIT %s", params + (size + 1,))
+    if len(rows) <= size:
+        return rows, None
+    rows = rows[:size]
+    return rows, cursor_token(rows[-1][stamp_col], rows[-1]["id"])
+
+
+def standard_summary(db, cache, table: str, stamp_col: str) -> dict:
+    """{standard: (count, latest upload)}; cached under the table's tag."""
+    summary = cache.get(table, "summary")
+    if summary is MISS:
+        summary = {}
+        for row in db.query(f"SELECT standard, COUNT(*) AS n, MAX({stamp_col}) AS latest "
+                            f"FROM {table} WHERE standard IS NOT NULL GROUP BY standard"):
+            latest = row["latest"]
+            if isinstance(latest, str):          # SQLite: aggregates lose the column type
+                latest = datetime.fromisoformat(latest)
+            summary[row["standard"]] = (row["n"], latest)
+        cache.set(table, "summary", summary)
+    return summary
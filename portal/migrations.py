@@ -0,0 +1,495 @@
+# ─────────────────────────────────────────────────────────────
+#  Schema migrations
+#  ------------------------------------------------------------
+#  `flask migrate` applies every step in MIGRATIONS that is not
+#  yet recorded in `schema_version`, in order, under an advisory
+#  lock (one runner at a time). Nothing runs on import, so web
+#  and worker processes start without touching the schema.
+#  • steps are (version, name, fn(backend, conn, cur)) and must be
+#    idempotent: version 1 also adopts databases created by the
+#    old DDL-on-import code and the bundled legacy SQLite file;
+#    versions 4 and 6 adopt the former `project` app's schema
+#  • add a step to change the schema; never edit an applied one
+# ─────────────────────────────────────────────────────────────
+
+import os
+
+from .attendance_store import rebuild_rollups
+
+LOCK_NAME = "student_portal.migrate"
+
+VERSION_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INT PRIMARY KEY,
+        name VARCHAR(100) NOT NULL,
+        applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+SQLITE_SCHEMA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "student_portal_sqlite.sql")
+
+
+def ensure_column(backend, cur, table: str, column: str, ddl: str) -> None:
+    """ALTER TABLE … ADD COLUMN unless the column already exists."""
+    if not backend.has_column(cur, table, column):
+        cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+
+
+def ensure_index(backend, cur, table: str, name: str, columns: str, unique: bool = False) -> None:
+    """CREATE INDEX unless it already exists (MySQL has no IF NOT EXISTS)."""
+    if not backend.has_index(cur, table, name):
+        cur.execute(f"CREATE {'UNIQUE ' if unique else ''}INDEX {name} ON {table} {columns}")
+
+
+# ───────── 0001 baseline ─────────
+
+MYSQL_BASELINE = (
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(100) NOT NULL,
+        email VARCHAR(100) UNIQUE NOT NULL,
+        password VARCHAR(255) NOT NULL,
+        student_identifier VARCHAR(30) UNIQUE NULL,
+        role ENUM('admin','teacher','student') NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS subjects (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(100) UNIQUE NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS materials (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        subject_id INT,
+        title VARCHAR(200),
+        description TEXT,
+        filename VARCHAR(300),
+        original_name VARCHAR(300),
+        uploaded_by INT,
+        uploaded_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (subject_id) REFERENCES subjects(id) ON DELETE SET NULL,
+        FOREIGN KEY (uploaded_by) REFERENCES users(id) ON DELETE SET NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS attendance (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        student_id INT NOT NULL,
+        date DATE NOT NULL,
+        status ENUM('present','absent') NOT NULL,
+        marked_by INT,
+        UNIQUE KEY uniq_student_date (student_id, date),
+        KEY idx_att_date_student (date, student_id),
+        FOREIGN KEY (student_id) REFERENCES users(id) ON DELETE CASCADE,
+        FOREIGN KEY (marked_by) REFERENCES users(id) ON DELETE SET NULL
+    )
+    """,
+    # Content-addressed uploads: one row per stored file, shared by duplicates
+    """
+    CREATE TABLE IF NOT EXISTS blobs (
+        store VARCHAR(20) NOT NULL,
+        path VARCHAR(300) NOT NULL,
+        sha256 CHAR(64) NOT NULL,
+        size BIGINT NOT NULL,
+        refcount INT NOT NULL DEFAULT 1,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (store, path)
+    )
+    """,
+    # Background jobs (see jobs.py) and what material processing produces
+    """
+    CREATE TABLE IF NOT EXISTS jobs (
+        id BIGINT AUTO_INCREMENT PRIMARY KEY,
+        kind VARCHAR(50) NOT NULL,
+        payload TEXT NOT NULL,
+        status ENUM('queued','running','failed') NOT NULL DEFAULT 'queued',
+        attempts INT NOT NULL DEFAULT 0,
+        run_after DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+        locked_by VARCHAR(100),
+        started_at DATETIME,
+        error TEXT,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        KEY idx_jobs_claim (status, run_after)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS material_meta (
+        material_id INT PRIMARY KEY,
+        page_count INT,
+        thumbnail VARCHAR(300),
+        text MEDIUMTEXT,
+        processed_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (material_id) REFERENCES materials(id) ON DELETE CASCADE
+    )
+    """,
+    # Full-text index over materials (+ extracted text), see search.py
+    """
+    CREATE TABLE IF NOT EXISTS search_docs (
+        doc_type VARCHAR(20) NOT NULL,
+        doc_id INT NOT NULL,
+        title VARCHAR(300) NOT NULL DEFAULT '',
+        body MEDIUMTEXT,
+        PRIMARY KEY (doc_type, doc_id),
+        FULLTEXT KEY ft_title (title),
+        FULLTEXT KEY ft_title_body (title, body)
+    ) ENGINE=InnoDB
+    """,
+    # Rollups kept in step with attendance by upsert_attendance()
+    """
+    CREATE TABLE IF NOT EXISTS attendance_monthly (
+        student_id INT NOT NULL,
+        month DATE NOT NULL,
+        present INT NOT NULL DEFAULT 0,
+        absent INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (student_id, month),
+        KEY idx_month (month),
+        FOREIGN KEY (student_id) REFERENCES users(id) ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS attendance_daily (
+        date DATE PRIMARY KEY,
+        present INT NOT NULL DEFAULT 0,
+        absent INT NOT NULL DEFAULT 0
+    )
+    """,
+)
+
+
+def _baseline(backend, conn, cur) -> None:
+    if backend.name == "sqlite":
+        _baseline_sqlite(backend, conn, cur)
+        return
+    for ddl in MYSQL_BASELINE:
+        cur.execute(ddl)
+    # Tables created before the column / index existed
+    ensure_column(backend, cur, "materials", "original_name", "VARCHAR(300) AFTER filename")
+    ensure_index(backend, cur, "attendance", "idx_att_date_student", "(date, student_id)")
+
+
+def _baseline_sqlite(backend, conn, cur) -> None:
+    # The bundled student_portal.db predates this schema: users/materials
+    # lack newer columns and attendance was keyed by e-mail.
+    legacy_attendance = backend.has_column(cur, "attendance", "student_email")
+    if legacy_attendance:
+        cur.execute("ALTER TABLE attendance RENAME TO attendance_legacy")
+    for table, column, ddl in (
+        ("users", "student_identifier", "TEXT"),
+        ("materials", "subject_id", "INTEGER"),
+        ("materials", "original_name", "TEXT"),
+    ):
+        if backend.has_table(cur, table):
+            ensure_column(backend, cur, table, column, ddl)
+    conn.commit()
+
+    with open(SQLITE_SCHEMA) as fh:
+        conn.executescript(fh.read())
+
+    if legacy_attendance:
+        cur.execute(
+            """
+            INSERT OR IGNORE INTO attendance (student_id, date, status)
+            SELECT u.id, l.date, lower(l.status)
+            FROM attendance_legacy l JOIN users u ON u.email = l.student_email
+            """
+        )
+        conn.commit()
+        rebuild_rollups(conn)
+
+
+# ───────── 0002 hot-path indexes ─────────
+
+def _hot_path_indexes(backend, conn, cur) -> None:
+    # roster: WHERE role='student' ORDER BY name (mark / edit attendance)
+    ensure_index(backend, cur, "users", "idx_users_role_name", "(role, name)")
+    # /materials: ORDER BY uploaded_at DESC
+    ensure_index(backend, cur, "materials", "idx_materials_uploaded_at", "(uploaded_at)")
+
+
+# ───────── 0003 server-side sessions ─────────
+
+def _sessions(backend, conn, cur) -> None:
+    # sessions.py DBSessionStore; expires_at is epoch seconds
+    if backend.name == "sqlite":
+        cur.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "sid TEXT PRIMARY KEY, data TEXT NOT NULL, expires_at INTEGER NOT NULL) WITHOUT ROWID"
+        )
+    else:
+        cur.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "sid CHAR(43) PRIMARY KEY, data TEXT NOT NULL, expires_at BIGINT NOT NULL)"
+        )
+    ensure_index(backend, cur, "sessions", "idx_sessions_expires", "(expires_at)")
+
+
+# ───────── 0004 tables from the project app ─────────
+#  usernames and classes (standards) for users and materials, plus
+#  assignments, announcements, gallery, FAQs and counsellor chat
+
+MYSQL_PROJECT_TABLES = (
+    """
+    CREATE TABLE IF NOT EXISTS assignments (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        title VARCHAR(255),
+        filename VARCHAR(300),
+        uploaded_by VARCHAR(50),
+        uploaded_on DATETIME DEFAULT CURRENT_TIMESTAMP,
+        standard INT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS announcements (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        title VARCHAR(255),
+        content TEXT,
+        date_posted DATE DEFAULT (CURRENT_DATE)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS gallery (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        image_path VARCHAR(300),
+        caption VARCHAR(255),
+        uploaded_on DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS faqs (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        question TEXT,
+        answer TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS counselor_messages (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(100),
+        message TEXT,
+        submitted_on DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+)
+
+SQLITE_PROJECT_TABLES = (
+    """
+    CREATE TABLE IF NOT EXISTS assignments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT,
+        filename TEXT,
+        uploaded_by TEXT,
+        uploaded_on DATETIME DEFAULT CURRENT_TIMESTAMP,
+        standard INTEGER
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS announcements (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT,
+        content TEXT,
+        date_posted DATE DEFAULT CURRENT_DATE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS gallery (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        image_path TEXT,
+        caption TEXT,
+        uploaded_on DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS faqs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        question TEXT,
+        answer TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS counselor_messages (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT,
+        message TEXT,
+        submitted_on DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """,
+)
+
+
+def _project_tables(backend, conn, cur) -> None:
+    sqlite = backend.name == "sqlite"
+    for ddl in SQLITE_PROJECT_TABLES if sqlite else MYSQL_PROJECT_TABLES:
+        cur.execute(ddl)
+    ensure_column(backend, cur, "users", "username", "TEXT" if sqlite else "VARCHAR(50) NULL")
+    ensure_column(backend, cur, "users", "standard", "INTEGER" if sqlite else "INT NULL")   # students only
+    ensure_column(backend, cur, "materials", "standard", "INTEGER" if sqlite else "INT NULL")
+    # login by username (accounts from before this step sign in by e-mail)
+    ensure_index(backend, cur, "users", "uniq_username", "(username)", unique=True)
+    # per-standard newest-first pages + counts
+    ensure_index(backend, cur, "materials", "idx_materials_standard_uploaded_at", "(standard, uploaded_at)")
+    ensure_index(backend, cur, "assignments", "idx_assignments_standard_uploaded", "(standard, uploaded_on)")
+    # /admin/chat paging
+    ensure_index(backend, cur, "counselor_messages", "idx_counselor_submitted", "(submitted_on, id)")
+    # the project app's own session and version tables; its users log in again
+    cur.execute("DROP TABLE IF EXISTS project_sessions")
+    cur.execute("DROP TABLE IF EXISTS project_schema_version")
+
+
+# ───────── 0005 gallery image variants ─────────
+#  resized WebP / JPEG copies of each gallery image (images.py)
+
+MYSQL_GALLERY_VARIANTS = """
+    CREATE TABLE IF NOT EXISTS gallery_variants (
+        gallery_id INT NOT NULL,
+        variant VARCHAR(20) NOT NULL,
+        format VARCHAR(10) NOT NULL,
+        path VARCHAR(300) NOT NULL,
+        width INT NOT NULL,
+        height INT NOT NULL,
+        PRIMARY KEY (gallery_id, variant, format),
+        FOREIGN KEY (gallery_id) REFERENCES gallery(id) ON DELETE CASCADE
+    )
+"""
+
+SQLITE_GALLERY_VARIANTS = """
+    CREATE TABLE IF NOT EXISTS gallery_variants (
+        gallery_id INTEGER NOT NULL REFERENCES gallery(id) ON DELETE CASCADE,
+        variant TEXT NOT NULL,
+        format TEXT NOT NULL,
+        path TEXT NOT NULL,
+        width INTEGER NOT NULL,
+        height INTEGER NOT NULL,
+        PRIMARY KEY (gallery_id, variant, format)
+    )
+"""
+
+
+def _gallery_variants(backend, conn, cur) -> None:
+    cur.execute(SQLITE_GALLERY_VARIANTS if backend.name == "sqlite" else MYSQL_GALLERY_VARIANTS)
+
+
+# ───────── 0006 columns from the project app ─────────
+#  its users / materials have no student ids, uploaded_on instead of
+#  uploaded_at and no description or uploader. A database it created
+#  gets these before any step runs (see migrate()); this step covers
+#  databases that were already versioned here.
+
+def _project_columns(backend, conn, cur) -> None:
+    if backend.name == "sqlite":
+        return                                   # the project app only ran on MySQL
+    for table, column, ddl in (
+        ("users", "email", "VARCHAR(100) NULL"),
+        ("users", "student_identifier", "VARCHAR(30) UNIQUE NULL"),
+        ("materials", "subject_id", "INT NULL"),
+        ("materials", "description", "TEXT"),
+        ("materials", "original_name", "VARCHAR(300)"),
+        ("materials", "uploaded_by", "INT NULL"),
+    ):
+        if backend.has_table(cur, table):
+            ensure_column(backend, cur, table, column, ddl)
+    if backend.has_table(cur, "materials") and not backend.has_column(cur, "materials", "uploaded_at"):
+        cur.execute("ALTER TABLE materials ADD COLUMN uploaded_at DATETIME DEFAULT CURRENT_TIMESTAMP")
+        if backend.has_column(cur, "materials", "uploaded_on"):
+            cur.execute("UPDATE materials SET uploaded_at = uploaded_on")
+
+
+# ───────── 0007 search document keys (SQLite) ─────────
+#  FTS5 cannot index doc_type / doc_id, so deleting or re-indexing one
+#  document scanned all of search_docs; this maps them to its rowid.
+#  MySQL's search_docs already has (doc_type, doc_id) as primary key.
+
+SQLITE_SEARCH_KEYS = """
+    CREATE TABLE IF NOT EXISTS search_doc_keys (
+        doc_type TEXT NOT NULL,
+        doc_id INTEGER NOT NULL,
+        fts_rowid INTEGER NOT NULL,
+        PRIMARY KEY (doc_type, doc_id)
+    ) WITHOUT ROWID
+"""
+
+
+def _search_keys(backend, conn, cur) -> None:
+    if backend.name != "sqlite":
+        return
+    cur.execute(SQLITE_SEARCH_KEYS)
+    cur.execute("INSERT OR IGNORE INTO search_doc_keys SELECT doc_type, doc_id, rowid FROM search_docs")
+
+
+MIGRATIONS = (
+    (1, "baseline", _baseline),
+    (2, "hot-path indexes", _hot_path_indexes),
+    (3, "sessions", _sessions),
+    (4, "project tables", _project_tables),
+    (5, "gallery variants", _gallery_variants),
+    (6, "project columns", _project_columns),
+    (7, "search keys", _search_keys),
+)
+
+
+# ───────── Runner ─────────
+
+def _applied(cur) -> set:
+    cur.execute("SELECT version FROM schema_version")
+    return {row[0] for row in cur.fetchall()}
+
+
+def _is_project_schema(backend, cur) -> bool:
+    """Was this database created by the former project app?
+
+    Its schema.sql had no version table; it is known by its chat table
+    or by materials keyed on uploaded_on instead of uploaded_at.
+    """
+    if backend.has_table(cur, "counselor_messages"):
+        return True
+    return (backend.has_table(cur, "materials")
+            and backend.has_column(cur, "materials", "uploaded_on")
+            and not backend.has_column(cur, "materials", "uploaded_at"))
+
+
+def migrate(backend, log=print) -> list:
+    """Apply pending migrations; returns the versions that ran."""
+    backend.create_database()
+    conn = backend.connect()
+    cur = conn.cursor()
+    ran = []
+    try:
+        backend.advisory_lock(cur, LOCK_NAME)
+        try:
+            cur.execute(VERSION_TABLE)
+            done = _applied(cur)
+            if 6 not in done and _is_project_schema(backend, cur):
+                # a database from the former project app: steps 1-5 index
+                # materials.uploaded_at, so bring its columns in line first
+                _project_columns(backend, conn, cur)
+            for version, name, step in MIGRATIONS:
+                if version in done:
+                    continue
+                log(f"applying {version:04d} {name}")
+                step(backend, conn, cur)
+                cur.execute("INSERT INTO schema_version (version, name) VALUES (%s,%s)", (version, name))
+                conn.commit()
+                ran.append(version)
+        finally:
+            backend.advisory_unlock(cur, LOCK_NAME)
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+        conn.close()
+    return ran
+
+
+def status(backend):
+    """(applied versions, pending (version, name) pairs)."""
+    conn = backend.connect()
+    cur = conn.cursor()
+    try:
+        done = _applied(cur) if backend.has_table(cur, "schema_version") else set()
+    finally:
+        cur.close()
+        conn.close()
+    return sorted(done), [(v, name) for v, name, _step in MIGRATIONS if v not in done]
@@ -0,0 +1,120 @@
+# ─────────────────────────────────────────────────────────────
+#  Page and fragment caching
+#  ------------------------------------------------------------
+#  Pages whose HTML depends only on the viewer's role are rendered
+#  once per (endpoint, role) and then served from the cache.
+#  • per-user bits are holes: templates call user_slot("name"),
+#    which renders a placeholder that is filled in on the way out,
+#    so one cached copy serves every user of that role
+#  • fragment("x.html") renders a shared partial once per role
+#  • cached pages carry ETag / Last-Modified / Cache-Control, and a
+#    matching revalidation gets a bodiless 304
+#  • warm_templates() compiles every template at startup; with a
+#    bytecode dir the compiled code also survives restarts
+# ─────────────────────────────────────────────────────────────
+
+import hashlib
+import os
+import time
+from functools import wraps
+
+from flask import make_response, render_template, request, session
+from jinja2 import FileSystemBytecodeCache
+from markupsafe import Markup, escape
+
+from .cache import MISS
+
+_SLOT = "<!--slot:{}-->"
+
+
+class PageCache:
+    def __init__(self, cache, app=None, max_age: int = 300, slots=("name",)):
+        self.cache = cache
+        self.max_age = max_age               # browser max-age for anonymous visitors
+        self.slots = slots                   # session keys user_slot() may name
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app) -> None:
+        app.jinja_env.globals.update(user_slot=self.user_slot, fragment=self.fragment)
+        app.after_request(self._fill_slots)
+
+    # ---- holes ----
+    def user_slot(self, key: str) -> Markup:
+        return Markup(_SLOT.format(key))
+
+    def _slot_values(self):
+        return [str(escape(session.get(key) or "")) for key in self.slots]
+
+    def _fill_slots(self, response):
+        if response.mimetype != "text/html" or response.direct_passthrough or response.is_streamed:
+            return response
+        body = response.get_data()
+        if b"<!--slot:" in body:
+            for key, value in zip(self.slots, self._slot_values()):
+                body = body.replace(_SLOT.format(key).encode(), value.encode())
+            response.set_data(body)
+        return response
+
+    # ---- fragments ----
+    def fragment(self, template: str, **context) -> Markup:
+        """`template` rendered once per (role, context); must use user_slot() for per-user text."""
+        key = (template, session.get("role"), tuple(sorted(context.items())))
+        html = self.cache.get("fragments", key)
+        if html is MISS:
+            html = render_template(template, **context)
+            self.cache.set("fragments", key, html)
+        return Markup(html)
+
+    # ---- pages ----
+    def cached(self, view):
+        """Serve GETs of `view` from the cache, keyed by endpoint, role and view kwargs.
+
+        The query string is not part of the key (stray ?utm=… params would
+        only split the cache), so do not decorate views that read request.args.
+        """
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method != "GET" or "_flashes" in session:   # flashes are per-user
+                return view(*args, **kwargs)
+            key = (request.endpoint, session.get("role"), tuple(sorted(kwargs.items())))
+            entry = self.cache.get("pages", key)
+            if entry is MISS:
+                resp = make_response(view(*args, **kwargs))
+                if resp.status_code != 200 or resp.mimetype != "text/html":
+                    return resp              # redirects, errors: not cached
+                body = resp.get_data()
+                entry = (body, hashlib.sha1(body).hexdigest(), int(time.time()))
+                self.cache.set("pages", key, entry)
+
+            body, digest, modified = entry
+            resp = make_response(body)
+            # the slots are part of what the user sees, so part of the validator
+            resp.set_etag(hashlib.sha1("|".join([digest] + self._slot_values()).encode()).hexdigest()[:20])
+            resp.last_modified = modified
+            # the navbar differs by login state: never shared, and keyed on the session cookie,
+            # so logging in or out fetches a fresh copy instead of reusing this one
+            resp.cache_control.private = True
+            resp.vary.add("Cookie")
+            if session.get("role"):
+                resp.cache_control.no_cache = True     # revalidate: logout / role change show at once
+            else:
+                resp.cache_control.max_age = self.max_age
+            return resp.make_conditional(request)
+        return wrapper
+
+    def invalidate(self) -> None:
+        """Drop every cached page and fragment (after editing what they show)."""
+        self.cache.invalidate("pages")
+        self.cache.invalidate("fragments")
+
+
+def warm_templates(app, bytecode_dir: str = None) -> int:
+    """Compile every template now instead of on its first request."""
+    if bytecode_dir:
+        os.makedirs(bytecode_dir, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(bytecode_dir)
+    names = app.jinja_env.list_templates(extensions=("html",))
+    for name in names:
+        app.jinja_env.get_template(name)
+    return len(names)
@@ -0,0 +1,46 @@
+# ─────────────────────────────────────────────────────────────
+#  Password hashing
+#  ------------------------------------------------------------
+#  PASSWORD_HASH_METHOD picks the algorithm and work factor in
+#  werkzeug's notation ("scrypt:32768:8:1", "pbkdf2:sha256:600000").
+#  • verify() also says whether the stored hash was made with other
+#    settings, so login can rehash it: retuning the factor never
+#    needs a password reset
+#  • at most PASSWORD_HASH_CONCURRENCY hashes run at once per
+#    process; a login storm queues here instead of starving every
+#    other request of CPU
+# ─────────────────────────────────────────────────────────────
+
+import hmac
+import os
+import threading
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+HASH_PREFIXES = ("scrypt:", "pbkdf2:")
+
+
+class PasswordHasher:
+    def __init__(self, method: str = "scrypt:32768:8:1", concurrency: int = 0,
+                 allow_plaintext: bool = False):
+        self.method = method
+        # werkzeug spells defaults out ("scrypt" → "scrypt:32768:8:1"); compare against that
+        self._prefix = generate_password_hash("", method).split("$", 1)[0]
+        self._slots = threading.BoundedSemaphore(concurrency or os.cpu_count() or 1)
+        self.allow_plaintext = allow_plaintext     # legacy rows stored before hashing
+
+    def hash(self, password: str) -> str:
+        with self._slots:
+            return generate_password_hash(password, self.method)
+
+    def verify(self, stored: str, password: str):
+        """(matches, needs_rehash) for a stored hash and a login attempt."""
+        if not stored:
+            return False, False
+        if not stored.startswith(HASH_PREFIXES):
+            if not self.allow_plaintext:
+                return False, False
+            return hmac.compare_digest(stored.encode(), password.encode()), True
+        with self._slots:
+            ok = check_password_hash(stored, password)
+        return ok, ok and stored.split("$", 1)[0] != self._prefix
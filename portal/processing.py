@@ -0,0 +1,115 @@
+# ─────────────────────────────────────────────────────────────
+#  Material processing (runs in the worker, never in a request)
+#  ------------------------------------------------------------
+#  extract(path) → page count, first-page thumbnail, plain text.
+#  • PDF   : PyMuPDF if installed (pages + thumbnail + text),
+#            else pypdf (pages + text), else nothing
+#  • DOCX / PPTX / XLSX : stdlib zipfile — text from the XML parts,
+#            page/slide/sheet count from docProps, and the
+#            thumbnail Office already embeds (docProps/thumbnail.*)
+#  • CSV   : the text itself
+#  Pure functions of a file path, so they run in a process pool.
+# ─────────────────────────────────────────────────────────────
+
+import html
+import os
+import re
+import zipfile
+
+MAX_TEXT = 2_000_000                 # chars kept per document
+THUMB_ZOOM = 0.4                     # first page at 40 % ≈ 240 px wide for A4
+
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+def _result(page_count=None, thumbnail=None, thumb_ext=None, text=""):
+    return {
+        "page_count": page_count,
+        "thumbnail": thumbnail,      # bytes or None
+        "thumb_ext": thumb_ext,      # ".png" / ".jpeg"
+        "text": text[:MAX_TEXT],
+    }
+
+
+def _xml_text(raw: bytes, para_tag: bytes) -> str:
+    raw = raw.replace(para_tag, b"\n" + para_tag)
+    return html.unescape(_TAG_RE.sub("", raw.decode("utf-8", "replace")))
+
+
+def _pdf(path: str) -> dict:
+    try:
+        import fitz                  # PyMuPDF
+    except ImportError:
+        fitz = None
+    if fitz is not None:
+        with fitz.open(path) as doc:
+            thumb = None
+            if doc.page_count:
+                pix = doc[0].get_pixmap(matrix=fitz.Matrix(THUMB_ZOOM, THUMB_ZOOM))
+                thumb = pix.tobytes("png")
+            text, size = [], 0
+            for page in doc:
+                chunk = page.get_text()
+                text.append(chunk)
+                size += len(chunk)
+                if size >= MAX_TEXT:
+                    break
+            return _result(doc.page_count, thumb, ".png", "".join(text))
+
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return _result()
+    reader = PdfReader(path)
+    text, size = [], 0
+    for page in reader.pages:
+        chunk = page.extract_text() or ""
+        text.append(chunk)
+        size += len(chunk)
+        if size >= MAX_TEXT:
+            break
+    return _result(len(reader.pages), text="\n".join(text))
+
+
+def _office(path: str, ext: str) -> dict:
+    with zipfile.ZipFile(path) as zf:
+        names = set(zf.namelist())
+
+        thumb, thumb_ext = None, None
+        for name in ("docProps/thumbnail.jpeg", "docProps/thumbnail.png"):
+            if name in names:
+                thumb, thumb_ext = zf.read(name), os.path.splitext(name)[1]
+                break
+
+        pages = None
+        if "docProps/app.xml" in names:
+            app_xml = zf.read("docProps/app.xml").decode("utf-8", "replace")
+            m = re.search(r"<(Pages|Slides)>(\d+)</", app_xml)
+            pages = int(m.group(2)) if m else None
+
+        if ext == ".docx":
+            text = _xml_text(zf.read("word/document.xml"), b"<w:p") if "word/document.xml" in names else ""
+        elif ext == ".pptx":
+            slides = sorted(
+                (n for n in names if re.match(r"ppt/slides/slide\d+\.xml$", n)),
+                key=lambda n: int(re.search(r"(\d+)", n.rsplit("/", 1)[1]).group(1)),
+            )
+            pages = pages or len(slides)
+            text = "\n".join(_xml_text(zf.read(n), b"<a:p") for n in slides)
+        else:  # .xlsx
+            if "xl/workbook.xml" in names:
+                pages = zf.read("xl/workbook.xml").count(b"<sheet ")
+            text = _xml_text(zf.read("xl/sharedStrings.xml"), b"<si") if "xl/sharedStrings.xml" in names else ""
+    return _result(pages, thumb, thumb_ext, text)
+
+
+def extract(path: str) -> dict:
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".pdf":
+        return _pdf(path)
+    if ext in (".docx", ".pptx", ".xlsx"):
+        return _office(path, ext)
+    if ext == ".csv":
+        with open(path, encoding="utf-8", errors="replace") as fh:
+            return _result(text=fh.read(MAX_TEXT))
+    return _result()
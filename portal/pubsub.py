@@ -0,0 +1,185 @@
+# ─────────────────────────────────────────────────────────────
+#  Pub/sub for live page updates (server-sent events)
+#  ------------------------------------------------------------
+#  Write routes publish small JSON diffs ("these students are now
+#  present on 2024-05-02") to a channel; every open page subscribed
+#  to it receives them over SSE and patches itself in place.
+#  • LocalBroker – fan-out inside this process (single worker)
+#  • RedisBroker – PUBLISH through any Redis-compatible server; one
+#                  listener thread per process fans out locally, so
+#                  every worker and the push server see every event
+#  The last `replay` events are kept: a client reconnecting with
+#  Last-Event-ID gets what it missed, or a "resync" event when that
+#  is no longer known (and reloads instead).
+# ─────────────────────────────────────────────────────────────
+
+import json
+import logging
+import os
+import queue
+import secrets
+import threading
+import time
+from collections import deque
+
+log = logging.getLogger("portal.pubsub")
+
+RESYNC = "resync"                        # event name: missed events, reload the page
+_RESYNC = (None, RESYNC, {})
+
+
+class Subscription:
+    """Messages (id, channel, event) for `channels` (None: all of them).
+
+    Either queued for get(), or handed to `callback` from the
+    publishing / listener thread (which must not block).
+    """
+
+    def __init__(self, broker, channels, callback=None, maxsize: int = 256):
+        self.broker = broker
+        self.channels = None if channels is None else frozenset(channels)
+        self.callback = callback
+        self._queue = queue.Queue(maxsize)
+
+    def wants(self, channel: str) -> bool:
+        return self.channels is None or channel in self.channels or channel == RESYNC
+
+    def put(self, message) -> None:
+        if self.callback is not None:
+            self.callback(message)
+            return
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:               # consumer stalled: drop the backlog, tell it to reload
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._queue.put_nowait(_RESYNC)
+
+    def get(self, timeout: float = None):
+        """The next message, or None after `timeout` seconds without one."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self)
+
+
+class LocalBroker:
+    def __init__(self, replay: int = 256):
+        self._subs = set()
+        self._recent = deque(maxlen=replay)
+        self._lock = threading.Lock()
+        self.counts = dict(published=0, delivered=0)
+
+    def publish(self, channel: str, event: dict) -> None:
+        self._deliver((secrets.token_hex(8), channel, event))
+
+    def _deliver(self, message) -> None:
+        with self._lock:
+            self.counts["published"] += 1
+            self._recent.append(message)
+            for sub in self._subs:
+                if sub.wants(message[1]):
+                    sub.put(message)
+                    self.counts["delivered"] += 1
+
+    def _broadcast(self, message) -> None:
+        with self._lock:
+            for sub in self._subs:
+                sub.put(message)
+
+    def _missed(self, last_id: str, channels) -> list:
+        ids = [m[0] for m in self._recent]
+        if last_id not in ids:
+            return [_RESYNC]
+        return [m for m in list(self._recent)[ids.index(last_id) + 1:]
+                if channels is None or m[1] in channels]
+
+    def backlog(self, last_id: str, channels=None) -> list:
+        """Messages after `last_id` (a RESYNC if it has already been dropped)."""
+        with self._lock:
+            return self._missed(last_id, channels)
+
+    def subscribe(self, channels=None, last_id: str = None, callback=None) -> Subscription:
+        sub = Subscription(self, channels, callback)
+        with self._lock:                 # nothing published between replay and live
+            for message in self._missed(last_id, sub.channels) if last_id else ():
+                sub.put(message)
+            self._subs.add(sub)
+        return sub
+
+    def unsubscribe(self, sub) -> None:
+        with self._lock:
+            self._subs.discard(sub)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self.counts, subscribers=len(self._subs), backend="local")
+
+
+class RedisBroker(LocalBroker):
+    def __init__(self, url: str, channel: str = "portal:events", replay: int = 256):
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("PUSH_BACKEND=redis needs the 'redis' package") from exc
+        super().__init__(replay)
+        self._r = redis.Redis.from_url(url)
+        self.channel = channel
+        self._pid = None
+
+    def publish(self, channel: str, event: dict) -> None:
+        self._r.publish(self.channel, json.dumps([secrets.token_hex(8), channel, event]))
+
+    def subscribe(self, channels=None, last_id: str = None, callback=None) -> Subscription:
+        with self._lock:
+            if self._pid != os.getpid():     # first use, or first use after fork
+                self._pid = os.getpid()
+                threading.Thread(target=self._listen, name="pubsub-listen", daemon=True).start()
+        return super().subscribe(channels, last_id, callback)
+
+    def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = self._r.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                for msg in pubsub.listen():
+                    self._deliver(tuple(json.loads(msg["data"])))
+            except Exception:
+                log.exception("pubsub listener lost its connection, reconnecting")
+                self._broadcast(_RESYNC)     # whatever was published meanwhile is gone
+                time.sleep(1)
+
+    def stats(self) -> dict:
+        return dict(super().stats(), backend="redis")
+
+
+def make_broker(backend: str = "local", url: str = None):
+    if backend == "redis":
+        return RedisBroker(url or "redis://127.0.0.1:6379/0")
+    return LocalBroker()
+
+
+# ───────── SSE framing ─────────
+
+def sse_format(message) -> str:
+    mid, channel, event = message
+    head = f"id: {mid}\n" if mid else ""
+    return f"{head}event: {channel}\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
+
+
+def sse_stream(sub, heartbeat: float = 15.0):
+    """SSE text for a WSGI response; unsubscribes when the client goes away
+    (noticed at the latest by the next heartbeat write)."""
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            message = sub.get(heartbeat)
+            yield sse_format(message) if message else ": ping\n\n"
+    finally:
+        sub.close()
@@ -0,0 +1,136 @@
+# ─────────────────────────────────────────────────────────────
+#  Push server: the SSE stream on one asyncio event loop
+#  ------------------------------------------------------------
+#  The app's own /events route holds a WSGI thread per open page.
+#  `flask push-server` serves the same stream from one event loop,
+#  so a thousand open pages cost sockets, not threads.
+#  • route /events to it on the app's host (the proxy must not
+#    buffer), so the session cookie reaches it
+#  • it needs PUSH_BACKEND=redis to see what app workers publish
+#  • `authorize(cookies)` → channels the caller may read, or None;
+#    it runs in a thread (it may hit the session store / DB)
+# ─────────────────────────────────────────────────────────────
+
+import asyncio
+import logging
+import signal
+from http.cookies import SimpleCookie
+from urllib.parse import parse_qs, urlsplit
+
+from .pubsub import RESYNC, sse_format
+
+log = logging.getLogger("portal.push")
+
+_HEADERS = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: text/event-stream\r\n"
+    b"Cache-Control: no-cache\r\n"
+    b"X-Accel-Buffering: no\r\n"
+    b"Connection: close\r\n\r\n"
+    b"retry: 3000\n\n"
+)
+
+
+class _Client:
+    def __init__(self, channels):
+        self.channels = channels
+        self.task = asyncio.current_task()
+        self.queue = asyncio.Queue(256)
+
+    def offer(self, message) -> None:
+        if message[1] != RESYNC and message[1] not in self.channels:
+            return
+        if self.queue.full():            # stalled reader: let it reload instead
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            message = (None, RESYNC, {})
+        self.queue.put_nowait(message)
+
+
+class PushServer:
+    def __init__(self, broker, authorize, path: str = "/events", heartbeat: float = 15.0):
+        self.broker = broker
+        self.authorize = authorize
+        self.path = path
+        self.heartbeat = heartbeat
+        self._clients = set()
+
+    def _fan_out(self, message) -> None:
+        for client in self._clients:
+            client.offer(message)
+
+    async def _read_head(self, reader):
+        request_line = await reader.readline()
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        method, target, _version = request_line.decode("latin-1").split(" ", 2)
+        return method, urlsplit(target), headers
+
+    async def _handle(self, reader, writer):
+        try:
+            method, url, headers = await asyncio.wait_for(self._read_head(reader), 10)
+            if method != "GET" or url.path != self.path:
+                writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+                return
+            cookies = {k: m.value for k, m in SimpleCookie(headers.get("cookie", "")).items()}
+            allowed = await asyncio.get_running_loop().run_in_executor(None, self.authorize, cookies)
+            wanted = set(",".join(parse_qs(url.query).get("channels", [])).split(",")) - {""}
+            channels = set(allowed or ()) & wanted if wanted else set(allowed or ())
+            if not channels:
+                writer.write(b"HTTP/1.1 403 Forbidden\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+                return
+
+            client = _Client(channels)
+            last_id = headers.get("last-event-id")
+            for message in self.broker.backlog(last_id, channels) if last_id else ():
+                client.offer(message)
+            self._clients.add(client)
+            try:
+                writer.write(_HEADERS)
+                while True:
+                    try:
+                        chunk = sse_format(await asyncio.wait_for(client.queue.get(), self.heartbeat))
+                    except asyncio.TimeoutError:
+                        chunk = ": ping\n\n"
+                    writer.write(chunk.encode())
+                    await writer.drain()
+            finally:
+                self._clients.discard(client)
+        except (ConnectionError, asyncio.TimeoutError, ValueError):
+            pass                             # client went away / sent garbage
+        except asyncio.CancelledError:
+            pass                             # shutting down (re-raising only makes asyncio log it)
+        except Exception:
+            log.exception("push client failed")
+        finally:
+            writer.close()
+
+    async def serve(self, host: str, port: int) -> None:
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, stop.set)
+        sub = self.broker.subscribe(callback=lambda m: loop.call_soon_threadsafe(self._fan_out, m))
+        server = await asyncio.start_server(self._handle, host, port)
+        log.info("push server on %s:%d%s", host, port, self.path)
+        try:
+            await stop.wait()
+        finally:
+            server.close()
+            sub.close()
+            tasks = [client.task for client in self._clients]
+            for task in tasks:               # EventSource reconnects to another instance
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return dict(clients=len(self._clients))
+
+
+def run(broker, authorize, host: str = "0.0.0.0", port: int = 5001, heartbeat: float = 15.0) -> None:
+    asyncio.run(PushServer(broker, authorize, heartbeat=heartbeat).serve(host, port))
@@ -0,0 +1,49 @@
+# ─────────────────────────────────────────────────────────────
+#  Token-bucket rate limiting
+#  ------------------------------------------------------------
+#  Every key (client IP, session id, …) owns a bucket holding up
+#  to `burst` tokens, refilled at `rate` tokens per second; each
+#  request spends one token from every key it is charged to.
+#  • buckets live in this process, so the limit is per worker
+#  • past `max_keys` the least recently used buckets are dropped:
+#    a flood of fresh keys cannot grow memory without bound
+# ─────────────────────────────────────────────────────────────
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class TokenBucketLimiter:
+    def __init__(self, rate: float, burst: int, max_keys: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()        # key → (tokens, monotonic time of last refill)
+        self._lock = threading.Lock()
+        self.counts = dict(allowed=0, limited=0)
+
+    def hit(self, *keys) -> float:
+        """Charge one request to `keys`: 0 if allowed, else seconds to wait.
+
+        A limited request spends nothing, so retrying after the wait works.
+        """
+        now = time.monotonic()
+        with self._lock:
+            levels, wait = [], 0.0
+            for key in keys:
+                tokens, last = self._buckets.pop(key, (self.burst, now))
+                tokens = min(self.burst, tokens + (now - last) * self.rate)
+                levels.append((key, tokens))
+                if tokens < 1:
+                    wait = max(wait, (1 - tokens) / self.rate)
+            for key, tokens in levels:
+                self._buckets[key] = (tokens if wait else tokens - 1, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            self.counts["limited" if wait else "allowed"] += 1
+        return wait
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self.counts, keys=len(self._buckets))
@@ -0,0 +1,125 @@
+# ─────────────────────────────────────────────────────────────
+#  Full-text search over uploaded documents
+#  ------------------------------------------------------------
+#  One `search_docs` row per searchable thing (doc_type =
+#  "material", "assignment", …) with InnoDB FULLTEXT indexes on
+#  (title) and (title, body). Rows are written in the same
+#  transaction as the upload / delete / processing result, so
+#  the index is maintained incrementally.
+#  Ranking: title matches weigh 3×, then title+body relevance.
+#  On SQLite the table is an FTS5 virtual table instead, ranked
+#  by bm25() with the same 3:1 title weight; FTS5 cannot index
+#  doc_type / doc_id, so search_doc_keys maps them to its rowid.
+# ─────────────────────────────────────────────────────────────
+
+import re
+
+from .db_backend import current
+
+SNIPPET_CHARS = 240
+MAX_PAGE = 50                      # deep offsets on ranked results are not worth it
+
+
+def _fts_rowid(cur, doc_type: str, doc_id: int):
+    cur.execute("SELECT fts_rowid FROM search_doc_keys WHERE doc_type=%s AND doc_id=%s", (doc_type, doc_id))
+    row = cur.fetchone()
+    return row[0] if row else None
+
+
+def index_document(cur, doc_type: str, doc_id: int, title: str, body: str = "") -> None:
+    if current().name == "sqlite":
+        # FTS5 tables have no unique keys to upsert on: find the row by rowid
+        rowid = _fts_rowid(cur, doc_type, doc_id)
+        if rowid is not None:
+            cur.execute("UPDATE search_docs SET title=%s, body=%s WHERE rowid=%s",
+                        (title or "", body or "", rowid))
+            return
+        cur.execute(
+            "INSERT INTO search_docs (doc_type, doc_id, title, body) VALUES (%s,%s,%s,%s)",
+            (doc_type, doc_id, title or "", body or ""),
+        )
+        cur.execute("INSERT INTO search_doc_keys (doc_type, doc_id, fts_rowid) VALUES (%s,%s,%s)",
+                    (doc_type, doc_id, cur.lastrowid))
+        return
+    cur.execute(
+        """
+        INSERT INTO search_docs (doc_type, doc_id, title, body) VALUES (%s,%s,%s,%s)
+        ON DUPLICATE KEY UPDATE title=VALUES(title), body=VALUES(body)
+        """,
+        (doc_type, doc_id, title or "", body or ""),
+    )
+
+
+def remove_document(cur, doc_type: str, doc_id: int) -> None:
+    if current().name == "sqlite":
+        rowid = _fts_rowid(cur, doc_type, doc_id)
+        if rowid is not None:
+            cur.execute("DELETE FROM search_docs WHERE rowid=%s", (rowid,))
+            cur.execute("DELETE FROM search_doc_keys WHERE doc_type=%s AND doc_id=%s", (doc_type, doc_id))
+        return
+    cur.execute("DELETE FROM search_docs WHERE doc_type=%s AND doc_id=%s", (doc_type, doc_id))
+
+
+def clear_index(cur) -> None:
+    """Drop every document (before a full re-index)."""
+    cur.execute("DELETE FROM search_docs")
+    if current().name == "sqlite":
+        cur.execute("DELETE FROM search_doc_keys")
+
+
+def search(cur, q: str, doc_types=None, page: int = 1, per_page: int = 20):
+    """Ranked hits for `q` → (rows, has_more).
+
+    Each row: {doc_type, doc_id, title, snippet, score}.
+    """
+    q = (q or "").strip()
+    if not q:
+        return [], False
+    page = min(max(1, page), MAX_PAGE)
+    if current().name == "sqlite":
+        return _search_fts5(cur, q, doc_types, page, per_page)
+    where, params = ["MATCH(title, body) AGAINST (%s IN NATURAL LANGUAGE MODE)"], [q]
+    if doc_types:
+        where.append(f"doc_type IN ({','.join(['%s'] * len(doc_types))})")
+        params += list(doc_types)
+    cur.execute(
+        f"""
+        SELECT doc_type, doc_id, title, SUBSTRING(body, 1, {SNIPPET_CHARS}) AS snippet,
+               3 * MATCH(title) AGAINST (%s IN NATURAL LANGUAGE MODE)
+                 + MATCH(title, body) AGAINST (%s IN NATURAL LANGUAGE MODE) AS score
+        FROM search_docs
+        WHERE {" AND ".join(where)}
+        ORDER BY score DESC, doc_id DESC
+        LIMIT %s OFFSET %s
+        """,
+        [q, q] + params + [per_page + 1, (page - 1) * per_page],
+    )
+    cols = ("doc_type", "doc_id", "title", "snippet", "score")
+    rows = [dict(zip(cols, r)) for r in cur.fetchall()]   # plain (tuple) cursor expected
+    return rows[:per_page], len(rows) > per_page
+
+
+def _search_fts5(cur, q, doc_types, page, per_page):
+    # natural-language mode equivalent: any of the words, quoted so that
+    # FTS5 operators typed by users are taken literally
+    terms = re.findall(r"\w+", q)
+    if not terms:
+        return [], False
+    where, params = ["search_docs MATCH %s"], [" OR ".join(f'"{t}"' for t in terms)]
+    if doc_types:
+        where.append(f"doc_type IN ({','.join(['%s'] * len(doc_types))})")
+        params += list(doc_types)
+    cur.execute(
+        f"""
+        SELECT doc_type, doc_id, title, substr(body, 1, {SNIPPET_CHARS}) AS snippet,
+               -bm25(search_docs, 0, 0, 3, 1) AS score
+        FROM search_docs
+        WHERE {" AND ".join(where)}
+        ORDER BY score DESC, doc_id DESC
+        LIMIT %s OFFSET %s
+        """,
+        params + [per_page + 1, (page - 1) * per_page],
+    )
+    cols = ("doc_type", "doc_id", "title", "snippet", "score")
+    rows = [dict(zip(cols, r)) for r in cur.fetchall()]
+    return rows[:per_page], len(rows) > per_page
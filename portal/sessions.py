@@ -0,0 +1,190 @@
+# ─────────────────────────────────────────────────────────────
+#  Server-side sessions
+#  ------------------------------------------------------------
+#  The cookie carries only a random session id; the data lives in
+#  a store and expires after SESSION_LIFETIME seconds without a
+#  request (sliding). Expiry is pushed forward at most once per
+#  SESSION_REFRESH, so most requests only read the store.
+#  • RedisSessionStore – one key per session, needs `redis`
+#  • DBSessionStore    – `sessions` table (see migrations.py);
+#                        `flask purge-sessions` drops expired rows
+#  Profile fields (name, role, …) are not stored per session: they
+#  come from `profile_loader(user id)`, which the app backs with a
+#  cache, so role checks skip the DB and a changed role reaches
+#  every open session at once.
+# ─────────────────────────────────────────────────────────────
+
+import json
+import secrets
+import time
+
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+
+def _new_sid() -> str:
+    return secrets.token_urlsafe(32)     # 43 chars
+
+
+class ServerSession(CallbackDict, SessionMixin):
+    def __init__(self, initial=None, sid=None, expires=0, new=False):
+        def on_update(self):
+            self.modified = True
+        super().__init__(initial, on_update)
+        self.sid = sid or _new_sid()
+        self.expires = expires           # epoch seconds the store drops it at
+        self.new = new
+        self.modified = False
+        self.stale_sid = None
+
+    def regenerate(self) -> None:
+        """Move the data to a fresh id (call on login: defeats fixation)."""
+        if not self.new and self.stale_sid is None:
+            self.stale_sid = self.sid
+        self.sid = _new_sid()
+        self.modified = True
+
+
+# ───────── Stores: load → (data, expires) | None ─────────
+
+class RedisSessionStore:
+    def __init__(self, url: str, prefix: str = "portal:session"):
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("SESSION_BACKEND=redis needs the 'redis' package") from exc
+        self._r = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def _key(self, sid: str) -> str:
+        return f"{self.prefix}:{sid}"
+
+    def load(self, sid: str):
+        pipe = self._r.pipeline()
+        pipe.get(self._key(sid))
+        pipe.ttl(self._key(sid))
+        raw, ttl = pipe.execute()
+        if raw is None:
+            return None
+        return json.loads(raw), time.time() + max(ttl, 0)
+
+    def save(self, sid: str, data: dict, expires: int) -> None:
+        self._r.set(self._key(sid), json.dumps(data), exat=expires)
+
+    def touch(self, sid: str, expires: int) -> None:
+        self._r.expireat(self._key(sid), expires)
+
+    def delete(self, sid: str) -> None:
+        self._r.delete(self._key(sid))
+
+    def purge(self) -> int:
+        return 0                         # keys expire on their own
+
+
+class DBSessionStore:
+    """Rows in `table`; every call checks a connection out and back in."""
+
+    def __init__(self, acquire, release=None, table: str = "sessions"):
+        self._acquire = acquire
+        self._release = release
+        self.table = table
+
+    def _run(self, statements, fetch=False):
+        conn = self._acquire()
+        broken = True
+        try:
+            cur = conn.cursor()
+            for sql, params in statements:
+                cur.execute(sql, params)
+            rows = cur.fetchall() if fetch else cur.rowcount
+            cur.close()
+            conn.commit()
+            broken = False
+            return rows
+        finally:
+            if self._release:
+                self._release(conn, broken=broken)
+
+    def load(self, sid: str):
+        rows = self._run([(f"SELECT data, expires_at FROM {self.table} WHERE sid=%s", (sid,))], fetch=True)
+        if not rows:
+            return None
+        return json.loads(rows[0][0]), rows[0][1]
+
+    def save(self, sid: str, data: dict, expires: int) -> None:
+        # DELETE + INSERT is an upsert in any dialect, and safe when two
+        # requests of one session save at once (the row lock orders them)
+        self._run([
+            (f"DELETE FROM {self.table} WHERE sid=%s", (sid,)),
+            (f"INSERT INTO {self.table} (sid, data, expires_at) VALUES (%s,%s,%s)",
+             (sid, json.dumps(data), expires)),
+        ])
+
+    def touch(self, sid: str, expires: int) -> None:
+        self._run([(f"UPDATE {self.table} SET expires_at=%s WHERE sid=%s", (expires, sid))])
+
+    def delete(self, sid: str) -> None:
+        self._run([(f"DELETE FROM {self.table} WHERE sid=%s", (sid,))])
+
+    def purge(self) -> int:
+        return self._run([(f"DELETE FROM {self.table} WHERE expires_at < %s", (int(time.time()),))])
+
+
+# ───────── Flask glue ─────────
+
+class ServerSessionInterface(SessionInterface):
+    def __init__(self, store, lifetime: int = 8 * 3600, refresh: int = 60,
+                 user_key: str = "id", profile_loader=None, profile_keys=()):
+        self.store = store
+        self.lifetime = lifetime
+        self.refresh = refresh
+        self.user_key = user_key
+        self.profile_loader = profile_loader
+        self.profile_keys = frozenset(profile_keys)
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        record = self.store.load(sid) if sid else None
+        if record is None or record[1] <= time.time():
+            return ServerSession(new=True)
+        data, expires = record
+        uid = data.get(self.user_key)
+        if uid is not None and self.profile_loader is not None:
+            profile = self.profile_loader(uid)
+            if profile is None:          # account gone: log the session out
+                session = ServerSession(sid=sid, expires=expires)
+                session.clear()
+                return session
+            data.update({k: profile[k] for k in self.profile_keys if k in profile})
+        return ServerSession(data, sid=sid, expires=expires)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        if session.stale_sid:
+            self.store.delete(session.stale_sid)
+
+        data = {k: v for k, v in session.items() if k not in self.profile_keys}
+        if not data:
+            if not session.new:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        response.vary.add("Cookie")
+        now = int(time.time())
+        if session.modified or session.new:
+            self.store.save(session.sid, data, now + self.lifetime)
+        elif session.expires - now < self.lifetime - self.refresh:
+            self.store.touch(session.sid, now + self.lifetime)
+        else:
+            return                       # refreshed recently; cookie still valid
+        response.set_cookie(
+            name, session.sid,
+            expires=now + self.lifetime,
+            httponly=self.get_cookie_httponly(app),
+            domain=domain, path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+        )
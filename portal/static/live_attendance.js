@@ -0,0 +1,31 @@
+// Attendance pages stay current without reloading: saves go through
+// fetch(), and marks saved by anyone else arrive from /events as
+// small {date, marks: {student id: status}} diffs.
+(() => {
+  const form = document.querySelector('form[data-live-date]');
+  if (!form) return;
+  const day = form.dataset.liveDate;
+  const notice = document.getElementById('live-notice');
+
+  form.addEventListener('submit', async (e) => {
+    e.preventDefault();
+    const r = await fetch(form.action, {
+      method: 'POST', body: new FormData(form), headers: {Accept: 'application/json'}
+    });
+    if (!r.ok) { form.submit(); return; }      // plain post shows the error page
+    const c = await r.json();
+    notice.className = 'alert alert-success py-2';
+    notice.textContent = `Saved (${c.inserted} new, ${c.updated} updated)`;
+  });
+
+  const events = new EventSource('/events?channels=attendance');
+  events.addEventListener('attendance', (e) => {
+    const diff = JSON.parse(e.data);
+    if (diff.date !== day) return;
+    for (const [sid, status] of Object.entries(diff.marks)) {
+      const radio = form.querySelector(`input[name="attendance_${sid}"][value="${status}"]`);
+      if (radio) radio.checked = true;
+    }
+  });
+  events.addEventListener('resync', () => location.reload());   // missed diffs
+})();
@@ -0,0 +1,194 @@
+-- Create database
+-- Reference copy of the schema; `flask migrate` (migrations.py) creates
+-- and upgrades it, recording applied steps in schema_version.
+CREATE DATABASE IF NOT EXISTS student_portal;
+USE student_portal;
+
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INT PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+DROP TABLE users;
+-- Users table (students, teachers, admins)
+CREATE TABLE IF NOT EXISTS users (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    email VARCHAR(100) NOT NULL UNIQUE,
+    password VARCHAR(255) NOT NULL,
+    student_identifier VARCHAR(30) UNIQUE,
+    role ENUM('admin', 'teacher', 'student') NOT NULL,
+    username VARCHAR(50) NULL, -- login name; accounts without one sign in by e-mail
+    standard INT NULL, -- students only
+    KEY idx_users_role_name (role, name), -- student roster
+    UNIQUE KEY uniq_username (username)
+);
+
+-- Subjects table (optional, can be linked with materials)
+CREATE TABLE IF NOT EXISTS subjects (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(100) UNIQUE NOT NULL
+);
+
+-- Materials table (uploaded files like PDFs)
+CREATE TABLE IF NOT EXISTS materials (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    subject_id INT,
+    title VARCHAR(200),
+    description TEXT,
+    filename VARCHAR(300), -- blobs/<sha[:2]>/<sha256>.<ext>, relative to uploads/
+    original_name VARCHAR(300),
+    uploaded_by INT,
+    uploaded_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    standard INT NULL,
+    KEY idx_materials_uploaded_at (uploaded_at),
+    KEY idx_materials_standard_uploaded_at (standard, uploaded_at), -- per-standard pages + counts
+    FOREIGN KEY (subject_id) REFERENCES subjects(id) ON DELETE SET NULL,
+    FOREIGN KEY (uploaded_by) REFERENCES users(id) ON DELETE SET NULL
+);
+
+-- Content-addressed files: duplicates share one blob, deleted with the last reference
+CREATE TABLE IF NOT EXISTS blobs (
+    store VARCHAR(20) NOT NULL,
+    path VARCHAR(300) NOT NULL,
+    sha256 CHAR(64) NOT NULL,
+    size BIGINT NOT NULL,
+    refcount INT NOT NULL DEFAULT 1,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (store, path)
+);
+
+-- Background jobs (flask run-worker) and material processing output
+CREATE TABLE IF NOT EXISTS jobs (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    kind VARCHAR(50) NOT NULL,
+    payload TEXT NOT NULL,
+    status ENUM('queued', 'running', 'failed') NOT NULL DEFAULT 'queued',
+    attempts INT NOT NULL DEFAULT 0,
+    run_after DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    locked_by VARCHAR(100),
+    started_at DATETIME,
+    error TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    KEY idx_jobs_claim (status, run_after)
+);
+
+CREATE TABLE IF NOT EXISTS material_meta (
+    material_id INT PRIMARY KEY,
+    page_count INT,
+    thumbnail VARCHAR(300), -- thumbs/<material_id>.<ext>, relative to uploads/
+    text MEDIUMTEXT,
+    processed_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (material_id) REFERENCES materials(id) ON DELETE CASCADE
+);
+
+-- Full-text search documents (materials + their extracted text)
+CREATE TABLE IF NOT EXISTS search_docs (
+    doc_type VARCHAR(20) NOT NULL,
+    doc_id INT NOT NULL,
+    title VARCHAR(300) NOT NULL DEFAULT '',
+    body MEDIUMTEXT,
+    PRIMARY KEY (doc_type, doc_id),
+    FULLTEXT KEY ft_title (title),
+    FULLTEXT KEY ft_title_body (title, body)
+) ENGINE=InnoDB;
+
+-- Attendance table
+CREATE TABLE IF NOT EXISTS attendance (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    student_id INT NOT NULL,
+    date DATE NOT NULL,
+    status ENUM('present', 'absent') NOT NULL,
+    marked_by INT,
+    FOREIGN KEY (student_id) REFERENCES users(id) ON DELETE CASCADE,
+    FOREIGN KEY (marked_by) REFERENCES users(id) ON DELETE SET NULL,
+    UNIQUE (student_id, date), -- Only one record per student per day
+    KEY idx_att_date_student (date, student_id) -- keyset paging of history
+);
+
+-- Rollups (maintained by the app; `flask rebuild-rollups` recomputes them)
+CREATE TABLE IF NOT EXISTS attendance_monthly (
+    student_id INT NOT NULL,
+    month DATE NOT NULL, -- first day of the month
+    present INT NOT NULL DEFAULT 0,
+    absent INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (student_id, month),
+    KEY idx_month (month),
+    FOREIGN KEY (student_id) REFERENCES users(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS attendance_daily (
+    date DATE PRIMARY KEY,
+    present INT NOT NULL DEFAULT 0,
+    absent INT NOT NULL DEFAULT 0
+);
+
+-- Server-side sessions (sessions.py, SESSION_BACKEND=db); `flask purge-sessions` clears expired rows
+CREATE TABLE IF NOT EXISTS sessions (
+    sid CHAR(43) PRIMARY KEY,
+    data TEXT NOT NULL,
+    expires_at BIGINT NOT NULL, -- epoch seconds, pushed forward while the session is in use
+    KEY idx_sessions_expires (expires_at)
+);
+
+-- Assignments: plain static files under static/uploads/assignments
+CREATE TABLE IF NOT EXISTS assignments (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    title VARCHAR(255),
+    filename VARCHAR(300), -- blobs/…, relative to static/uploads/assignments
+    uploaded_by VARCHAR(50), -- uploader's username
+    uploaded_on DATETIME DEFAULT CURRENT_TIMESTAMP,
+    standard INT,
+    KEY idx_assignments_standard_uploaded (standard, uploaded_on) -- per-standard pages + counts
+);
+
+CREATE TABLE IF NOT EXISTS announcements (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    title VARCHAR(255),
+    content TEXT,
+    date_posted DATE DEFAULT (CURRENT_DATE)
+);
+
+CREATE TABLE IF NOT EXISTS gallery (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    image_path VARCHAR(300), -- blobs/…, relative to static/uploads/gallery
+    caption VARCHAR(255),
+    uploaded_on DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Resized WebP / JPEG copies made by `flask run-worker` (images.py)
+CREATE TABLE IF NOT EXISTS gallery_variants (
+    gallery_id INT NOT NULL,
+    variant VARCHAR(20) NOT NULL, -- thumb | medium
+    format VARCHAR(10) NOT NULL, -- webp | jpeg
+    path VARCHAR(300) NOT NULL, -- variants/…, relative to static/uploads/gallery
+    width INT NOT NULL,
+    height INT NOT NULL,
+    PRIMARY KEY (gallery_id, variant, format),
+    FOREIGN KEY (gallery_id) REFERENCES gallery(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS faqs (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    question TEXT,
+    answer TEXT
+);
+
+CREATE TABLE IF NOT EXISTS counselor_messages (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    name VARCHAR(100),
+    message TEXT,
+    submitted_on DATETIME DEFAULT CURRENT_TIMESTAMP,
+    KEY idx_counselor_submitted (submitted_on, id) -- /admin/chat paging
+);
+
+CREATE TABLE attendance (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    student_name VARCHAR(100),
+    status ENUM('Present', 'Absent'),
+    date DATE,
+    marked_by VARCHAR(100)
+);
+
+
+select * from  users;
\ No newline at end of file
@@ -0,0 +1,102 @@
+-- SQLite schema (DB_BACKEND=sqlite); same tables as student_portal.sql.
+-- Applied by migration 0001 (migrations.py), every statement is idempotent.
+-- Later schema changes are migration steps, not edits to this file.
+
+-- Users table (students, teachers, admins)
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL UNIQUE,
+    password TEXT NOT NULL,
+    student_identifier TEXT,
+    role TEXT NOT NULL CHECK (role IN ('admin', 'teacher', 'student'))
+);
+CREATE UNIQUE INDEX IF NOT EXISTS uniq_student_identifier ON users (student_identifier);
+
+-- Subjects table (optional, can be linked with materials)
+CREATE TABLE IF NOT EXISTS subjects (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT UNIQUE NOT NULL
+);
+
+-- Materials table (uploaded files like PDFs)
+CREATE TABLE IF NOT EXISTS materials (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    subject_id INTEGER REFERENCES subjects(id) ON DELETE SET NULL,
+    title TEXT,
+    description TEXT,
+    filename TEXT, -- blobs/<sha[:2]>/<sha256>.<ext>, relative to uploads/
+    original_name TEXT,
+    uploaded_by INTEGER REFERENCES users(id) ON DELETE SET NULL,
+    uploaded_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Content-addressed files: duplicates share one blob, deleted with the last reference
+CREATE TABLE IF NOT EXISTS blobs (
+    store TEXT NOT NULL,
+    path TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    refcount INTEGER NOT NULL DEFAULT 1,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (store, path)
+);
+
+-- Background jobs (flask run-worker) and material processing output
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued' CHECK (status IN ('queued', 'running', 'failed')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    run_after DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    locked_by TEXT,
+    started_at DATETIME,
+    error TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (status, run_after);
+
+CREATE TABLE IF NOT EXISTS material_meta (
+    material_id INTEGER PRIMARY KEY REFERENCES materials(id) ON DELETE CASCADE,
+    page_count INTEGER,
+    thumbnail TEXT, -- thumbs/<material_id>.<ext>, relative to uploads/
+    text TEXT,
+    processed_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Full-text search documents (materials + their extracted text), see search.py
+CREATE VIRTUAL TABLE IF NOT EXISTS search_docs USING fts5(
+    doc_type UNINDEXED,
+    doc_id UNINDEXED,
+    title,
+    body,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+
+-- Attendance table
+CREATE TABLE IF NOT EXISTS attendance (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    student_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    date DATE NOT NULL,
+    status TEXT NOT NULL CHECK (status IN ('present', 'absent')),
+    marked_by INTEGER REFERENCES users(id) ON DELETE SET NULL,
+    UNIQUE (student_id, date) -- Only one record per student per day
+);
+CREATE INDEX IF NOT EXISTS idx_att_date_student ON attendance (date, student_id);
+
+-- Rollups (maintained by the app; `flask rebuild-rollups` recomputes them)
+CREATE TABLE IF NOT EXISTS attendance_monthly (
+    student_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    month DATE NOT NULL, -- first day of the month
+    present INTEGER NOT NULL DEFAULT 0,
+    absent INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (student_id, month)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_month ON attendance_monthly (month);
+
+CREATE TABLE IF NOT EXISTS attendance_daily (
+    date DATE PRIMARY KEY,
+    present INTEGER NOT NULL DEFAULT 0,
+    absent INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
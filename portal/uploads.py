@@ -0,0 +1,220 @@
+# ─────────────────────────────────────────────────────────────
+#  Streaming upload pipeline
+#  ------------------------------------------------------------
+#  • StreamingRequest makes Werkzeug's multipart parser write each
+#    file part straight into a staging file (same filesystem as the
+#    upload folder) in fixed-size chunks, hashing SHA-256 and
+#    enforcing the size limit as bytes arrive.
+#  • save_upload() then just fsyncs + os.replace()s it into place:
+#    one write, atomic, memory flat regardless of file size.
+#  • ChunkedUploads keeps resumable .part files for very large
+#    files sent as a series of raw PUTs; uploads left idle longer
+#    than their TTL are swept away as new ones start.
+# ─────────────────────────────────────────────────────────────
+
+import hashlib
+import json
+import os
+import re
+import secrets
+import tempfile
+import time
+
+from flask import Request, current_app
+from werkzeug.exceptions import RequestEntityTooLarge
+
+CHUNK_SIZE = 1024 * 1024
+UPLOAD_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+
+class StagedFile:
+    """Temp file in the staging dir that hashes and counts what is written."""
+
+    def __init__(self, staging_dir: str, max_bytes: int = None):
+        os.makedirs(staging_dir, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(dir=staging_dir, suffix=".part")
+        self._fh = os.fdopen(fd, "w+b")
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+        self.max_bytes = max_bytes
+        self.committed = False
+
+    def write(self, data) -> int:
+        self.size += len(data)
+        if self.max_bytes and self.size > self.max_bytes:
+            raise RequestEntityTooLarge()
+        self.sha256.update(data)
+        return self._fh.write(data)
+
+    def __getattr__(self, name):             # read / seek / tell / flush …
+        return getattr(self._fh, name)
+
+    def commit(self, dest_path: str) -> None:
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._fh.close()
+        os.replace(self.path, dest_path)
+        self.committed = True
+
+    def discard(self) -> None:
+        if self.committed:
+            return
+        self._fh.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class StreamingRequest(Request):
+    """Flask request whose uploaded files land in UPLOAD_STAGING directly."""
+
+    def _get_file_stream(self, total_content_length, content_type,
+                         filename=None, content_length=None):
+        cfg = current_app.config
+        staged = StagedFile(cfg["UPLOAD_STAGING"], cfg.get("MAX_UPLOAD_BYTES"))
+        self.__dict__.setdefault("_staged", []).append(staged)
+        return staged
+
+
+def stage_upload(file) -> StagedFile:
+    """The hashed staging file behind an uploaded FileStorage."""
+    staged = file.stream
+    if not isinstance(staged, StagedFile):
+        # not parsed by StreamingRequest (e.g. a test client stream) → copy once
+        cfg = current_app.config
+        staged = StagedFile(cfg["UPLOAD_STAGING"], cfg.get("MAX_UPLOAD_BYTES"))
+        for chunk in iter(lambda: file.stream.read(CHUNK_SIZE), b""):
+            staged.write(chunk)
+    return staged
+
+
+def save_upload(file, dest_dir: str, name: str):
+    """Move an uploaded FileStorage into `dest_dir/name` atomically.
+
+    Returns (sha256 hex, size in bytes).
+    """
+    staged = stage_upload(file)
+    staged.commit(os.path.join(dest_dir, name))
+    return staged.sha256.hexdigest(), staged.size
+
+
+def discard_unsaved(request) -> None:
+    """Remove staging files a request did not save (rejected, aborted, 413)."""
+    for staged in request.__dict__.get("_staged", ()):
+        staged.discard()
+
+
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ChunkedUploads:
+    """Resumable uploads: start → PUT chunks at an offset → complete.
+
+    A `<id>.part` file holds the bytes so far and `<id>.json` the
+    metadata, so an interrupted client asks for the offset and resumes.
+    Uploads nobody has written to for `ttl` seconds are deleted by
+    expire(), which start() runs at most every `ttl / 4` seconds.
+    """
+
+    def __init__(self, staging_dir: str, max_bytes: int = None, ttl: float = 24 * 3600):
+        self.dir = staging_dir
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._next_sweep = 0.0
+        os.makedirs(staging_dir, exist_ok=True)
+
+    def _paths(self, upload_id: str):
+        if not UPLOAD_ID_RE.match(upload_id or ""):
+            raise KeyError(upload_id)
+        base = os.path.join(self.dir, upload_id)
+        return base + ".part", base + ".json"
+
+    def start(self, filename: str, size: int, owner) -> str:
+        if self.max_bytes and size > self.max_bytes:
+            raise RequestEntityTooLarge()
+        if time.monotonic() >= self._next_sweep:
+            self._next_sweep = time.monotonic() + self.ttl / 4
+            self.expire()
+        upload_id = secrets.token_hex(16)
+        part, meta = self._paths(upload_id)
+        open(part, "wb").close()
+        with open(meta, "w") as fh:
+            json.dump({"filename": filename, "size": size, "owner": owner}, fh)
+        return upload_id
+
+    def info(self, upload_id: str) -> dict:
+        part, meta = self._paths(upload_id)
+        try:
+            with open(meta) as fh:
+                data = json.load(fh)
+        except FileNotFoundError:
+            raise KeyError(upload_id) from None
+        data["offset"] = os.path.getsize(part)
+        return data
+
+    def append(self, upload_id: str, offset: int, stream) -> int:
+        """Write `stream` at `offset`; returns the new offset.
+
+        A mismatched offset raises ValueError carrying the real one, so the
+        client can resume from there.
+        """
+        data = self.info(upload_id)
+        if offset != data["offset"]:
+            raise ValueError(data["offset"])
+        part, _meta = self._paths(upload_id)
+        written = data["offset"]
+        with open(part, "ab") as fh:
+            for chunk in iter(lambda: stream.read(CHUNK_SIZE), b""):
+                written += len(chunk)
+                if written > data["size"]:
+                    raise RequestEntityTooLarge()
+                fh.write(chunk)
+        return written
+
+    def complete(self, upload_id: str):
+        """Finish a fully received upload → (part path, sha256 hex, size).
+
+        The caller moves the returned file into place.
+        """
+        data = self.info(upload_id)
+        if data["offset"] != data["size"]:
+            raise ValueError(data["offset"])
+        part, meta = self._paths(upload_id)
+        digest = file_sha256(part)
+        os.remove(meta)
+        return part, digest, data["size"]
+
+    def abort(self, upload_id: str) -> None:
+        for path in self._paths(upload_id):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def expire(self, now: float = None) -> int:
+        """Abort uploads idle for longer than the TTL; returns how many.
+
+        Also catches a `.part` whose `.json` is gone: complete() ran but
+        the caller never moved the file into place.
+        """
+        cutoff = (time.time() if now is None else now) - self.ttl
+        idle = {}
+        for name in os.listdir(self.dir):
+            upload_id, ext = os.path.splitext(name)
+            if ext not in (".part", ".json") or not UPLOAD_ID_RE.match(upload_id):
+                continue                    # StagedFile temp files are not ours to judge
+            try:
+                mtime = os.path.getmtime(os.path.join(self.dir, name))
+            except FileNotFoundError:
+                continue
+            idle[upload_id] = max(idle.get(upload_id, 0.0), mtime)
+        expired = [upload_id for upload_id, mtime in idle.items() if mtime < cutoff]
+        for upload_id in expired:
+            self.abort(upload_id)
+        return len(expired)
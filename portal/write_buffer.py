@@ -0,0 +1,100 @@
+# ─────────────────────────────────────────────────────────────
+#  Buffered inserts
+#  ------------------------------------------------------------
+#  add() queues a row in memory and returns at once; a background
+#  thread hands the queue to `flush_fn(rows)` as one batch when
+#  `max_rows` are waiting or every `interval` seconds.
+#  • a failed batch stays queued and is retried next interval; past
+#    `max_pending` rows the oldest are dropped (and logged)
+#  • close() runs at interpreter exit and flushes what is left, so
+#    a normal shutdown or worker restart loses nothing
+#  • the thread starts on first use in each process (safe to fork)
+# ─────────────────────────────────────────────────────────────
+
+import atexit
+import logging
+import os
+import threading
+
+log = logging.getLogger("portal.buffer")
+
+
+class WriteBuffer:
+    def __init__(self, flush_fn, max_rows: int = 100, interval: float = 2.0,
+                 max_pending: int = 10000, name: str = "buffer"):
+        self._flush_fn = flush_fn
+        self.max_rows = max_rows
+        self.interval = interval
+        self.max_pending = max_pending
+        self.name = name
+        self._rows = []
+        self._cond = threading.Condition()
+        self._flushing = threading.Lock()    # one batch in flight at a time
+        self._closed = False
+        self._failing = False
+        self._pid = None
+        self.counts = dict(queued=0, flushed=0, batches=0, failures=0, dropped=0)
+        atexit.register(self.close)
+
+    def _start(self) -> None:
+        if self._pid != os.getpid():         # first use, or first use after fork
+            self._pid = os.getpid()
+            threading.Thread(target=self._run, name=f"{self.name}-flush", daemon=True).start()
+
+    def add(self, row) -> None:
+        with self._cond:
+            self._start()
+            self._rows.append(row)
+            self.counts["queued"] += 1
+            overflow = len(self._rows) - self.max_pending
+            if overflow > 0:
+                del self._rows[:overflow]
+                self.counts["dropped"] += overflow
+                log.error("%s: %d queued rows dropped (flushes keep failing)", self.name, overflow)
+            if len(self._rows) >= self.max_rows:
+                self._cond.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._closed and (self._failing or len(self._rows) < self.max_rows):
+                    self._cond.wait(self.interval)
+                if self._closed:
+                    return
+            self.flush()
+
+    def flush(self) -> int:
+        """Write everything queued now; returns the number of rows written."""
+        with self._flushing:
+            with self._cond:
+                rows, self._rows = self._rows, []
+            if not rows:
+                return 0
+            try:
+                self._flush_fn(rows)
+            except Exception:
+                log.exception("%s: flush of %d rows failed, retrying", self.name, len(rows))
+                with self._cond:
+                    self._rows[:0] = rows    # keep arrival order
+                    self._failing = True
+                    self.counts["failures"] += 1
+                return 0
+            with self._cond:
+                self._failing = False
+                self.counts["flushed"] += len(rows)
+                self.counts["batches"] += 1
+            return len(rows)
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._rows)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self.flush()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return dict(self.counts, pending=len(self._rows))
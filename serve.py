@@ -0,0 +1,67 @@
+# ─────────────────────────────────────────────────────────────
+#  Production entry point: `python serve.py`
+#  ------------------------------------------------------------
+#  Runs portal.app:app under gunicorn (`pip install gunicorn`): a master
+#  process forks WEB_WORKERS workers with WEB_THREADS threads each
+#  and replaces any that die. `python -m portal.app` stays the dev server.
+#  • each worker imports the app itself and runs app.warm_up()
+#    (DB connections, templates, caches) before its first request
+#  • kill -HUP <master pid>: zero-downtime reload – new workers
+#    start on the new code, old ones finish their requests and exit
+#  • kill -TERM: graceful stop within WEB_GRACEFUL_TIMEOUT seconds
+#  • GET /healthz is 503 until the worker is warm (readiness probe)
+#  SSE (/events) pins a thread per open page: route it to
+#  `flask push-server` instead of these workers.
+# ─────────────────────────────────────────────────────────────
+
+import multiprocessing
+import os
+
+
+def options() -> dict:
+    return dict(
+        bind=os.environ.get("WEB_BIND", "0.0.0.0:8000"),
+        workers=int(os.environ.get("WEB_WORKERS", 0)) or multiprocessing.cpu_count() * 2 + 1,
+        threads=int(os.environ.get("WEB_THREADS", 4)),
+        worker_class="gthread",
+        timeout=int(os.environ.get("WEB_TIMEOUT", 60)),
+        graceful_timeout=int(os.environ.get("WEB_GRACEFUL_TIMEOUT", 30)),
+        keepalive=int(os.environ.get("WEB_KEEPALIVE", 5)),
+        # recycle a worker after this many requests (0: never) – caps slow leaks
+        max_requests=int(os.environ.get("WEB_MAX_REQUESTS", 0)),
+        max_requests_jitter=int(os.environ.get("WEB_MAX_REQUESTS_JITTER", 50)),
+        # the master never imports the app, so HUP-spawned workers load new code
+        preload_app=False,
+        accesslog=os.environ.get("WEB_ACCESS_LOG", "-"),
+        post_worker_init=_warm_worker,
+    )
+
+
+def _warm_worker(worker) -> None:
+    from portal import app as portal     # already imported by load()
+    try:
+        portal.warm_up()
+    except Exception:                    # /healthz keeps retrying and reports 503
+        worker.log.exception("warm-up failed; worker stays not-ready")
+
+
+def main() -> None:
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError as exc:
+        raise SystemExit("serve.py needs the 'gunicorn' package (pip install gunicorn)") from exc
+
+    class PortalServer(BaseApplication):
+        def load_config(self):
+            for key, value in options().items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from portal.app import app
+            return app
+
+    PortalServer().run()
+
+
+if __name__ == "__main__":
+    main()
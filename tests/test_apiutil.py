@@ -0,0 +1,49 @@
+import base64
+import json
+from datetime import date
+
+import pytest
+
+flask = pytest.importorskip("flask")
+from werkzeug.exceptions import HTTPException                     # noqa: E402
+
+from portal.apiutil import make_cursor, read_cursor               # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def app_context():
+    with flask.Flask(__name__).test_request_context():
+        yield
+
+
+def token(value) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode()
+
+
+def test_cursor_round_trip():
+    assert read_cursor(make_cursor("2025-03-14", 42), 2) == ["2025-03-14", 42]
+
+
+def test_cursor_values_are_json_text():
+    assert read_cursor(make_cursor(date(2025, 3, 14), 7), 2) == ["2025-03-14", 7]
+
+
+def test_cursor_is_url_safe():
+    assert set(make_cursor("?>?>?>" * 10, 10**12)) <= set(
+        "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_=")
+
+
+@pytest.mark.parametrize("bad", [
+    "",
+    "not base64!",
+    base64.urlsafe_b64encode(b"not json").decode(),
+    token([1, 2, 3]),                  # wrong arity
+    token({"a": 1, "b": 2}),           # right length, not a list
+    token(5),
+])
+def test_bad_cursor_is_a_400(bad):
+    with pytest.raises(HTTPException) as exc:
+        read_cursor(bad, 2)
+    resp = exc.value.get_response()
+    assert resp.status_code == 400
+    assert resp.get_json() == {"error": "bad cursor"}
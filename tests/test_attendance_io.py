@@ -0,0 +1,68 @@
+from datetime import date
+
+import pytest
+
+from portal.attendance_io import _batches, _layout, _parse_date, parse_rows
+
+
+def new_report():
+    return dict(rows=0, invalid=0, duplicates=0, inserted=0, updated=0, errors=[], dry_run=False)
+
+
+@pytest.mark.parametrize("text", ["2025-03-14", "14/03/2025", "14-03-2025",
+                                  " 2025-03-14 ", "2025-03-14 00:00:00", "45730", "45730.0"])
+def test_parse_date_formats(text):
+    assert _parse_date(text) == date(2025, 3, 14)
+
+
+@pytest.mark.parametrize("text", ["", "yesterday", "2025-13-01", "31/02/2025", "03/14/2025"])
+def test_parse_date_rejects_garbage(text):
+    with pytest.raises(ValueError):
+        _parse_date(text)
+
+
+def test_layout_reads_header_in_any_order_and_case():
+    assert _layout(["student_identifier", "date", "status"]) == [0, 1, 2]
+    assert _layout([" Status ", "Notes", "DATE", "Student_Identifier"]) == [3, 2, 0]
+
+
+def test_layout_is_none_for_data_rows():
+    assert _layout(["S001", "2025-03-14", "present"]) is None
+    assert _layout(["student_identifier", "date"]) is None
+
+
+def test_batches_keep_last_row_per_student_and_date():
+    report = new_report()
+    rows = [(1, date(2025, 3, 14), "present", 9),
+            (2, date(2025, 3, 14), "present", 9),
+            (1, date(2025, 3, 14), "absent", 9)]
+    assert list(_batches(rows, 10, report)) == [[(1, date(2025, 3, 14), "absent", 9),
+                                                 (2, date(2025, 3, 14), "present", 9)]]
+    assert report["duplicates"] == 1
+
+
+def test_batches_split_at_size():
+    rows = [(sid, date(2025, 3, 14), "present", 9) for sid in range(5)]
+    batches = list(_batches(rows, 2, new_report()))
+    assert [len(b) for b in batches] == [2, 2, 1]
+    assert [row for b in batches for row in b] == rows
+
+
+def test_parse_rows_reports_bad_rows_and_skips_header():
+    sheet = [(1, ["Date", "Status", "Student_Identifier"]),
+             (2, ["2025-03-14", "Present", "S1"]),
+             (3, ["", "", ""]),
+             (4, ["2025-03-14", "late", "S1"]),
+             (5, ["2025-03-14", "absent", "S404"]),
+             (6, ["someday", "absent", "S1"])]
+    report = new_report()
+    rows = list(parse_rows(sheet, {"S1": 1}, 9, report))
+    assert rows == [(1, date(2025, 3, 14), "present", 9)]
+    assert report["rows"] == 4 and report["invalid"] == 3
+    assert [line for line, _msg in report["errors"]] == [4, 5, 6]
+
+
+def test_parse_rows_without_header_uses_default_order():
+    report = new_report()
+    rows = list(parse_rows([(1, ["S1", "14/03/2025", "absent"])], {"S1": 1}, 9, report))
+    assert rows == [(1, date(2025, 3, 14), "absent", 9)]
@@ -0,0 +1,117 @@
+import sqlite3
+from datetime import date
+
+import pytest
+
+from portal import migrations
+from portal.attendance_store import _rollup_deltas, rebuild_rollups, rows_from_form, upsert_attendance
+from portal.db_backend import make_backend
+
+DAY = date(2025, 3, 14)
+MONTH = date(2025, 3, 1)
+
+
+def deltas(batch, existing=None):
+    monthly, daily = _rollup_deltas(batch, existing or {})
+    return {k: tuple(v) for k, v in monthly.items()}, {k: tuple(v) for k, v in daily.items()}
+
+
+def test_new_marks_add_to_their_column():
+    monthly, daily = deltas([(1, DAY, "present", 9), (2, DAY, "absent", 9)])
+    assert monthly == {(1, MONTH): (1, 0), (2, MONTH): (0, 1)}
+    assert daily == {DAY: (1, 1)}
+
+
+def test_remark_with_same_status_changes_nothing():
+    monthly, daily = deltas([(1, DAY, "present", 9)], {(1, DAY): "present"})
+    assert monthly == {} and daily == {}
+
+
+def test_flip_moves_one_count_across():
+    monthly, daily = deltas([(1, DAY, "absent", 9)], {(1, DAY): "present"})
+    assert monthly == {(1, MONTH): (-1, 1)}
+    assert daily == {DAY: (-1, 1)}
+
+
+def test_duplicate_in_one_batch_counts_once_with_last_status():
+    monthly, daily = deltas([(1, DAY, "present", 9), (1, DAY, "absent", 9)])
+    assert monthly == {(1, MONTH): (0, 1)}
+    assert daily == {DAY: (0, 1)}
+
+
+def test_duplicate_that_flips_back_cancels_out():
+    monthly, daily = deltas([(1, DAY, "absent", 9), (1, DAY, "present", 9)], {(1, DAY): "present"})
+    assert monthly == {(1, MONTH): (0, 0)}
+    assert daily == {DAY: (0, 0)}
+
+
+def test_string_dates_are_accepted():
+    monthly, daily = deltas([(1, "2025-03-14", "present", 9)])
+    assert monthly == {(1, MONTH): (1, 0)} and daily == {DAY: (1, 0)}
+
+
+def test_form_rows_keep_only_known_statuses():
+    form = {"attendance_1": "present", "attendance_2": "absent", "attendance_3": "bogus", "attendance_4": ""}
+    assert list(rows_from_form(form, [1, 2, 3, 4, 5], DAY, 9)) == [(1, DAY, "present", 9),
+                                                                 (2, DAY, "absent", 9)]
+
+
+# ───────── against SQLite: rollups must match a rebuild ─────────
+
+@pytest.fixture
+def conn(tmp_path):
+    backend = make_backend("sqlite", path=str(tmp_path / "t.db"))
+    migrations.migrate(backend, log=lambda *_: None)
+    conn = backend.connect()
+    cur = conn.cursor()
+    cur.executemany(
+        "INSERT INTO users (id, name, email, password, role) VALUES (%s,%s,%s,'x',%s)",
+        [(i, f"S{i}", f"s{i}@t", "student") for i in (1, 2, 3)] + [(9, "T", "t@t", "teacher")],
+    )
+    conn.commit()
+    cur.close()
+    yield conn
+    conn.close()
+
+
+def rollups(conn):
+    cur = conn.cursor()
+    cur.execute("SELECT student_id, month, present, absent FROM attendance_monthly "
+                "WHERE present <> 0 OR absent <> 0 ORDER BY student_id, month")
+    monthly = [tuple(r) for r in cur.fetchall()]
+    cur.execute("SELECT date, present, absent FROM attendance_daily "
+                "WHERE present <> 0 OR absent <> 0 ORDER BY date")
+    daily = [tuple(r) for r in cur.fetchall()]
+    cur.close()
+    return monthly, daily
+
+
+def test_incremental_rollups_match_rebuild(conn):
+    counts = upsert_attendance(conn, [(1, DAY, "present", 9), (2, DAY, "absent", 9)])
+    assert counts == {"inserted": 2, "updated": 0}
+    counts = upsert_attendance(conn, [(1, DAY, "present", 9),     # same status again
+                                      (2, DAY, "present", 9),     # absent → present
+                                      (3, DAY, "absent", 9),
+                                      (3, DAY, "present", 9)])    # repeated: last wins
+    assert counts == {"inserted": 1, "updated": 2}
+    incremental = rollups(conn)
+    assert [row[1:] for row in incremental[1]] == [(3, 0)]
+
+    rebuild_rollups(conn)
+    assert rollups(conn) == incremental
+
+
+def test_changes_lists_only_real_changes(conn):
+    upsert_attendance(conn, [(1, DAY, "present", 9)])
+    changes = []
+    upsert_attendance(conn, [(1, DAY, "present", 9), (2, DAY, "absent", 9), (2, DAY, "present", 9)],
+                      changes=changes)
+    assert changes == [(2, DAY, "present")]
+
+
+def test_failed_batch_rolls_back_rollups_too(conn):
+    upsert_attendance(conn, [(1, DAY, "present", 9)])
+    before = rollups(conn)
+    with pytest.raises(sqlite3.Error):
+        upsert_attendance(conn, [(2, DAY, "absent", 9), (1, DAY, None, 9)])    # NOT NULL status
+    assert rollups(conn) == before
@@ -0,0 +1,140 @@
+import threading
+import time
+
+import pytest
+
+from portal.db_pool import ConnectionPool, PoolTimeout
+
+
+class FakeConnection:
+    def __init__(self, n):
+        self.n = n
+        self.connected = True
+        self.closed = False
+        self.rollbacks = 0
+
+    def is_connected(self):
+        return self.connected
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+def make_pool(**opts):
+    made = []
+
+    def connect():
+        made.append(FakeConnection(len(made)))
+        return made[-1]
+
+    return ConnectionPool(connect, **opts), made
+
+
+def test_released_connection_is_reused():
+    pool, made = make_pool(size=2, overflow=0)
+    conn = pool.acquire()
+    pool.release(conn)
+    assert pool.acquire() is conn
+    assert len(made) == 1
+    assert conn.rollbacks == 1          # snapshot ended before going idle
+
+
+def test_idle_connections_are_lifo():
+    pool, _made = make_pool(size=2, overflow=0)
+    a, b = pool.acquire(), pool.acquire()
+    pool.release(a)
+    pool.release(b)
+    assert pool.acquire() is b
+
+
+def test_overflow_connection_is_closed_on_release():
+    pool, made = make_pool(size=1, overflow=1)
+    core, extra = pool.acquire(), pool.acquire()
+    pool.release(extra)
+    assert extra.closed
+    pool.release(core)
+    assert not core.closed
+    stats = pool.stats()
+    assert (stats["open"], stats["idle"], stats["in_use"]) == (1, 1, 0)
+    assert len(made) == 2
+
+
+def test_broken_connection_is_discarded_and_frees_its_slot():
+    pool, made = make_pool(size=1, overflow=0, timeout=0.05)
+    conn = pool.acquire()
+    pool.release(conn, broken=True)
+    assert conn.closed
+    fresh = pool.acquire()
+    assert fresh is not conn and len(made) == 2
+    assert pool.stats()["discarded"] == 1
+
+
+def test_failed_rollback_counts_as_broken():
+    pool, _made = make_pool(size=1, overflow=0)
+    conn = pool.acquire()
+
+    def fail():
+        raise OSError("gone")
+
+    conn.rollback = fail
+    pool.release(conn)
+    assert conn.closed
+    assert pool.stats()["open"] == 0
+
+
+def test_unhealthy_idle_connection_is_replaced():
+    pool, made = make_pool(size=1, overflow=0)
+    conn = pool.acquire()
+    pool.release(conn)
+    conn.connected = False
+    assert pool.acquire() is made[1]
+    assert conn.closed
+
+
+def test_old_connection_is_recycled():
+    pool, made = make_pool(size=1, overflow=0, recycle=0.01)
+    conn = pool.acquire()
+    pool.release(conn)
+    time.sleep(0.02)
+    assert pool.acquire() is not conn
+    assert len(made) == 2
+
+
+def test_exhausted_pool_times_out():
+    pool, _made = make_pool(size=1, overflow=1, timeout=0.05)
+    pool.acquire(), pool.acquire()
+    with pytest.raises(PoolTimeout):
+        pool.acquire()
+    assert pool.stats()["timeouts"] == 1
+
+
+def test_failed_connect_frees_its_slot():
+    calls = []
+
+    def connect():
+        calls.append(1)
+        if len(calls) == 1:
+            raise OSError("refused")
+        return FakeConnection(len(calls))
+
+    pool = ConnectionPool(connect, size=1, overflow=0, timeout=0.05)
+    with pytest.raises(OSError):
+        pool.acquire()
+    assert pool.acquire() is not None
+    assert pool.stats()["open"] == 1
+
+
+def test_waiter_gets_the_released_connection():
+    pool, _made = make_pool(size=1, overflow=0, timeout=2)
+    conn = pool.acquire()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire()))
+    waiter.start()
+    time.sleep(0.05)
+    pool.release(conn)
+    waiter.join(1)
+    assert got == [conn]
+    assert pool.stats()["waits"] == 1
@@ -0,0 +1,66 @@
+from datetime import datetime
+
+import pytest
+
+flask = pytest.importorskip("flask")
+
+from portal import migrations                                     # noqa: E402
+from portal.db import Database                                    # noqa: E402
+from portal.db_backend import make_backend                        # noqa: E402
+from portal.listing import cursor_token, newest_first, parse_cursor   # noqa: E402
+
+SQL = "SELECT id, name, message, submitted_on FROM counselor_messages"
+
+
+@pytest.fixture
+def app():
+    return flask.Flask(__name__)
+
+
+@pytest.fixture
+def db(tmp_path, app):
+    backend = make_backend("sqlite", path=str(tmp_path / "t.db"))
+    migrations.migrate(backend, log=lambda *_: None)
+    db = Database(backend)
+    db.init_app(app)
+    yield db
+    db.pool.close_all()
+
+
+def add_messages(app, db, stamps):
+    with app.app_context():
+        for i, when in enumerate(stamps):
+            db.execute("INSERT INTO counselor_messages (name, message, submitted_on) VALUES (%s,%s,%s)",
+                       ("n", f"m{i}", when))
+
+
+def all_pages(app, db, size):
+    seen, before = [], None
+    while True:
+        with app.test_request_context(query_string={"before": before} if before else {}):
+            rows, before = newest_first(db, SQL, (), "submitted_on", size)
+        seen.append([r["message"] for r in rows])
+        if before is None:
+            return seen
+
+
+def test_pages_through_rows_sharing_one_second(app, db):
+    add_messages(app, db, [datetime(2025, 3, 14, 12, 0, 0)] * 5)
+    assert all_pages(app, db, 2) == [["m4", "m3"], ["m2", "m1"], ["m0"]]
+
+
+def test_pages_through_rows_with_microseconds(app, db):
+    add_messages(app, db, [datetime(2025, 3, 14, 12, 0, 0, 100 * i) for i in range(5)])
+    assert all_pages(app, db, 2) == [["m4", "m3"], ["m2", "m1"], ["m0"]]
+
+
+def test_pages_across_seconds(app, db):
+    add_messages(app, db, [datetime(2025, 3, 14, 12, 0, s // 2) for s in range(5)])
+    assert sum(all_pages(app, db, 2), []) == ["m4", "m3", "m2", "m1", "m0"]
+
+
+def test_cursor_round_trip_and_old_tokens():
+    when = datetime(2025, 3, 14, 12, 0, 0, 100)
+    with flask.Flask(__name__).test_request_context():
+        assert parse_cursor(cursor_token(when, 7)) == (when, 7)
+        assert parse_cursor("20250314120000-7") == (when.replace(microsecond=0), 7)
@@ -0,0 +1,34 @@
+from portal import migrations
+from portal.db_backend import make_backend
+
+
+def cursor(tmp_path, *ddl):
+    backend = make_backend("sqlite", path=str(tmp_path / "t.db"))
+    conn = backend.connect()
+    cur = conn.cursor()
+    for statement in ddl:
+        cur.execute(statement)
+    return backend, cur
+
+
+def test_project_schema_known_by_its_chat_table(tmp_path):
+    backend, cur = cursor(tmp_path, "CREATE TABLE counselor_messages (id INTEGER PRIMARY KEY, name TEXT)")
+    assert migrations._is_project_schema(backend, cur)
+
+
+def test_project_schema_known_by_materials_uploaded_on(tmp_path):
+    backend, cur = cursor(tmp_path, "CREATE TABLE materials (id INTEGER PRIMARY KEY, uploaded_on DATETIME)")
+    assert migrations._is_project_schema(backend, cur)
+
+
+def test_other_databases_are_not_project_schemas(tmp_path):
+    backend, cur = cursor(tmp_path)
+    assert not migrations._is_project_schema(backend, cur)
+    cur.execute("CREATE TABLE materials (id INTEGER PRIMARY KEY, uploaded_at DATETIME)")
+    assert not migrations._is_project_schema(backend, cur)
+
+
+def test_migrate_is_idempotent(tmp_path):
+    backend = make_backend("sqlite", path=str(tmp_path / "t.db"))
+    assert migrations.migrate(backend, log=lambda *_: None) == [v for v, _n, _f in migrations.MIGRATIONS]
+    assert migrations.migrate(backend, log=lambda *_: None) == []
@@ -0,0 +1,67 @@
+import pytest
+
+from portal import ratelimit
+from portal.ratelimit import TokenBucketLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(ratelimit.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_burst_then_limited(clock):
+    limiter = TokenBucketLimiter(rate=1, burst=3)
+    assert [limiter.hit("a") for _ in range(3)] == [0, 0, 0]
+    assert limiter.hit("a") == pytest.approx(1.0)
+    assert limiter.stats() == {"allowed": 3, "limited": 1, "keys": 1}
+
+
+def test_tokens_refill_over_time(clock):
+    limiter = TokenBucketLimiter(rate=2, burst=2)
+    limiter.hit("a"), limiter.hit("a")
+    assert limiter.hit("a") == pytest.approx(0.5)
+    clock[0] += 0.5
+    assert limiter.hit("a") == 0
+
+
+def test_refill_is_capped_at_burst(clock):
+    limiter = TokenBucketLimiter(rate=1, burst=2)
+    clock[0] += 3600
+    assert [limiter.hit("a") for _ in range(3)][-1] > 0
+
+
+def test_limited_request_spends_nothing(clock):
+    limiter = TokenBucketLimiter(rate=1, burst=1)
+    limiter.hit("a")
+    clock[0] += 0.5
+    assert limiter.hit("a") == pytest.approx(0.5)
+    assert limiter.hit("a") == pytest.approx(0.5)     # not pushed further back
+    clock[0] += 0.5
+    assert limiter.hit("a") == 0
+
+
+def test_keys_have_separate_buckets(clock):
+    limiter = TokenBucketLimiter(rate=1, burst=1)
+    assert limiter.hit("a") == 0
+    assert limiter.hit("b") == 0
+    assert limiter.hit("a") > 0
+
+
+def test_request_charged_to_every_key_only_if_all_allow(clock):
+    limiter = TokenBucketLimiter(rate=1, burst=1)
+    limiter.hit("ip")
+    assert limiter.hit("ip", "user") > 0
+    assert limiter.hit("user") == 0                   # the limited hit did not spend it
+
+
+def test_least_recently_used_keys_are_evicted(clock):
+    limiter = TokenBucketLimiter(rate=1, burst=1, max_keys=2)
+    limiter.hit("a")
+    limiter.hit("b")
+    limiter.hit("a")                                  # "a" is now the most recent
+    limiter.hit("c")
+    assert limiter.stats()["keys"] == 2
+    assert limiter.hit("b") == 0                      # evicted, so it starts full again
+    assert limiter.hit("c") > 0
@@ -0,0 +1,85 @@
+import pytest
+
+from portal import migrations
+from portal.db_backend import make_backend
+from portal.search import clear_index, index_document, remove_document, search
+
+
+@pytest.fixture
+def cur(tmp_path):
+    backend = make_backend("sqlite", path=str(tmp_path / "t.db"))
+    migrations.migrate(backend, log=lambda *_: None)
+    conn = backend.connect()
+    cur = conn.cursor()
+    yield cur
+    cur.close()
+    conn.close()
+
+
+def hits(cur, q):
+    return [(r["doc_type"], r["doc_id"]) for r in search(cur, q)[0]]
+
+
+def count(cur, table):
+    cur.execute(f"SELECT COUNT(*) FROM {table}")
+    return cur.fetchone()[0]
+
+
+def test_index_and_search(cur):
+    index_document(cur, "material", 1, "Algebra notes", "linear equations")
+    index_document(cur, "assignment", 1, "Geometry homework")
+    assert hits(cur, "algebra") == [("material", 1)]
+    assert hits(cur, "equations") == [("material", 1)]
+    assert hits(cur, "homework") == [("assignment", 1)]
+
+
+def test_title_outranks_body(cur):
+    index_document(cur, "material", 1, "Notes", "algebra algebra")
+    index_document(cur, "material", 2, "Algebra", "notes")
+    assert hits(cur, "algebra") == [("material", 2), ("material", 1)]
+
+
+def test_reindex_replaces_in_place(cur):
+    index_document(cur, "material", 1, "Algebra")
+    index_document(cur, "material", 1, "Geometry", "processed text")
+    assert hits(cur, "algebra") == []
+    assert hits(cur, "geometry") == [("material", 1)]
+    assert count(cur, "search_docs") == count(cur, "search_doc_keys") == 1
+
+
+def test_remove_only_touches_its_document(cur):
+    index_document(cur, "material", 1, "Algebra")
+    index_document(cur, "assignment", 1, "Algebra homework")
+    remove_document(cur, "material", 1)
+    remove_document(cur, "material", 99)              # never indexed
+    assert hits(cur, "algebra") == [("assignment", 1)]
+    assert count(cur, "search_doc_keys") == 1
+
+
+def test_delete_is_a_rowid_lookup(cur):
+    cur.execute("EXPLAIN QUERY PLAN SELECT fts_rowid FROM search_doc_keys WHERE doc_type=%s AND doc_id=%s",
+                ("material", 1))
+    assert "PRIMARY KEY" in " ".join(str(r[-1]) for r in cur.fetchall())
+    cur.execute("EXPLAIN QUERY PLAN DELETE FROM search_docs WHERE rowid=%s", (1,))
+    assert "INDEX 0:=" in " ".join(str(r[-1]) for r in cur.fetchall())     # rowid equality, no scan
+
+
+def test_clear_index(cur):
+    index_document(cur, "material", 1, "Algebra")
+    clear_index(cur)
+    assert count(cur, "search_docs") == count(cur, "search_doc_keys") == 0
+    index_document(cur, "material", 1, "Algebra")
+    assert hits(cur, "algebra") == [("material", 1)]
+
+
+def test_keys_backfilled_for_existing_documents(tmp_path):
+    backend = make_backend("sqlite", path=str(tmp_path / "t.db"))
+    migrations.migrate(backend, log=lambda *_: None)
+    conn = backend.connect()
+    conn.executescript("DROP TABLE search_doc_keys; DELETE FROM schema_version WHERE version = 7;"
+                       "INSERT INTO search_docs (doc_type, doc_id, title, body) VALUES ('material', 5, 'Algebra', '');")
+    assert migrations.migrate(backend, log=lambda *_: None) == [7]
+    cur = conn.cursor()
+    remove_document(cur, "material", 5)
+    assert hits(cur, "algebra") == []
+    conn.close()
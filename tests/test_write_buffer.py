@@ -0,0 +1,83 @@
+import threading
+
+import pytest
+
+from portal.write_buffer import WriteBuffer
+
+
+@pytest.fixture
+def make_buffer():
+    made = []
+
+    def make(flush_fn, **opts):
+        opts.setdefault("interval", 60)               # keep the background thread idle
+        buf = WriteBuffer(flush_fn, **opts)
+        made.append(buf)
+        return buf
+
+    yield make
+    for buf in made:
+        buf.close()
+
+
+def test_flush_writes_everything_queued(make_buffer):
+    batches = []
+    buf = make_buffer(batches.append)
+    for i in range(5):
+        buf.add(i)
+    assert buf.pending() == 5
+    assert buf.flush() == 5
+    assert batches == [[0, 1, 2, 3, 4]]
+    assert buf.flush() == 0
+    assert buf.stats() == dict(queued=5, flushed=5, batches=1, failures=0, dropped=0, pending=0)
+
+
+def test_failed_flush_keeps_rows_in_order(make_buffer):
+    batches, fail = [], [True]
+
+    def flush_fn(rows):
+        if fail[0]:
+            raise RuntimeError("database down")
+        batches.append(rows)
+
+    buf = make_buffer(flush_fn)
+    buf.add(1), buf.add(2)
+    assert buf.flush() == 0
+    buf.add(3)
+    fail[0] = False
+    assert buf.flush() == 3
+    assert batches == [[1, 2, 3]]
+    assert buf.stats()["failures"] == 1
+
+
+def test_oldest_rows_dropped_past_max_pending(make_buffer):
+    batches = []
+    buf = make_buffer(batches.append, max_pending=3)
+    for i in range(5):
+        buf.add(i)
+    assert buf.stats()["dropped"] == 2
+    buf.flush()
+    assert batches == [[2, 3, 4]]
+
+
+def test_background_flush_at_max_rows(make_buffer):
+    done = threading.Event()
+    batches = []
+
+    def flush_fn(rows):
+        batches.append(rows)
+        done.set()
+
+    buf = make_buffer(flush_fn, max_rows=3)
+    for i in range(3):
+        buf.add(i)
+    assert done.wait(5)
+    assert batches == [[0, 1, 2]]
+
+
+def test_close_flushes_what_is_left(make_buffer):
+    batches = []
+    buf = make_buffer(batches.append)
+    buf.add("x")
+    buf.close()
+    assert batches == [["x"]]